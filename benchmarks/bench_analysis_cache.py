@@ -0,0 +1,93 @@
+"""
+Benchmark for the Document Intelligence result cache.
+
+Compares the legacy pretty-printed JSON files (json.dump indent=4 / json.load)
+with AnalysisCache entries (compact JSON + zstd) on a synthetic analysis result
+shaped like a `prebuilt-document` response.
+
+Usage:
+    python benchmarks/bench_analysis_cache.py [n_pages]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from autosearch.analysis.analysis_cache import AnalysisCache
+
+
+def make_result(n_pages: int) -> dict:
+    rng = random.Random(0)
+    words = "polymer chain representation learning graph network monomer property prediction".split()
+    offset = 0
+    pages, paragraphs = [], []
+    for page_number in range(1, n_pages + 1):
+        page_words = []
+        for _ in range(450):
+            content = rng.choice(words)
+            page_words.append({
+                "content": content,
+                "polygon": [{"x": rng.random() * 8.5, "y": rng.random() * 11} for _ in range(4)],
+                "span": {"offset": offset, "length": len(content)},
+                "confidence": round(rng.random(), 3),
+            })
+            offset += len(content) + 1
+        pages.append({
+            "page_number": page_number, "angle": 0.0, "width": 8.5, "height": 11.0, "unit": "inch",
+            "words": page_words,
+            "lines": [{"content": ' '.join(w["content"] for w in page_words[i:i + 10]),
+                       "polygon": page_words[i]["polygon"], "spans": [page_words[i]["span"]]}
+                      for i in range(0, len(page_words), 10)],
+        })
+        for i in range(0, 450, 45):
+            paragraphs.append({
+                "role": None,
+                "content": ' '.join(w["content"] for w in page_words[i:i + 45]),
+                "bounding_regions": [{"page_number": page_number, "polygon": page_words[i]["polygon"]}],
+                "spans": [{"offset": page_words[i]["span"]["offset"], "length": 300}],
+            })
+    return {"api_version": "2023-07-31", "model_id": "prebuilt-document", "content": "", "pages": pages,
+            "paragraphs": paragraphs, "tables": [], "key_value_pairs": [], "styles": []}
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+
+def main():
+    n_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    result = make_result(n_pages)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "paper.pdf.json")
+        cache = AnalysisCache(os.path.join(tmp, "cache"))
+
+        def save_json():
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=4)
+
+        def load_json():
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        json_save = best_of(save_json)
+        json_load = best_of(load_json)
+        cache_save = best_of(lambda: cache.put("digest", "prebuilt-document", result))
+        cache_load = best_of(lambda: cache.get("digest", "prebuilt-document"))
+        json_size = os.path.getsize(json_path)
+        cache_size = cache.size_bytes
+
+    print(f"Synthetic analysis result with {n_pages} pages")
+    print(f"{'format':<28}{'size MB':>10}{'save ms':>10}{'load ms':>10}")
+    print(f"{'json indent=4':<28}{json_size / 1e6:>10.2f}{json_save:>10.1f}{json_load:>10.1f}")
+    print(f"{'AnalysisCache (orjson+zstd)':<28}{cache_size / 1e6:>10.2f}{cache_save:>10.1f}{cache_load:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
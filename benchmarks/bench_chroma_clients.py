@@ -0,0 +1,68 @@
+"""
+Benchmark for sharing one Chroma client per DB directory between memo stores.
+
+Startup: opens `n_agents` MemoStores on one DB directory, as the teachable agents
+of a group chat do. Ingest: replays chunk_pdf before the memorization pipeline,
+where every chunk built a fresh teachable agent, and with it a MemoStore, which
+then stored a few memos. Both run once with every MemoStore opening its own
+client and embedding function, as before the registry, and once through the
+registry. Reports the times and how many Chroma clients were opened.
+
+Usage:
+    python benchmarks/bench_chroma_clients.py [n_agents] [n_chunks] [memos_per_chunk]
+"""
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from autosearch.agents import chroma_registry
+from autosearch.agents.chroma_registry import ChromaStore, close_chroma_store, get_chroma_store
+from autosearch.agents.memo_store import MemoStore
+
+
+class Counter:
+    def __init__(self, func):
+        self.func = func
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+        return self.func(*args, **kwargs)
+
+
+def run(db_dir: str, n_agents: int, n_chunks: int, memos_per_chunk: int, shared: bool):
+    clients = Counter(chroma_registry._default_client)
+    # Without sharing, every MemoStore builds its own client, as it used to.
+    lookup = get_chroma_store if shared else ChromaStore
+    with patch('autosearch.agents.chroma_registry._default_client', clients), \
+            patch('autosearch.agents.memo_store.get_chroma_store', lookup):
+        start = time.perf_counter()
+        for _ in range(n_agents):
+            MemoStore(verbosity=0, reset=False, path_to_db_dir=db_dir)
+        startup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for chunk in range(n_chunks):
+            store = MemoStore(verbosity=0, reset=False, path_to_db_dir=db_dir)
+            store.add_many([(f"What does chunk {chunk} report about sample {i}?",
+                             f"Chunk {chunk} reports a Tg of {300 + i} K for sample {i}.") for i in range(memos_per_chunk)])
+        ingest = time.perf_counter() - start
+        count = store.vec_db.count()
+    close_chroma_store(db_dir)
+    return startup, ingest, clients.count, count
+
+
+def main():
+    n_agents = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    n_chunks = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    memos_per_chunk = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    for label, shared in (("per-store clients", False), ("shared registry", True)):
+        with tempfile.TemporaryDirectory() as db_dir:
+            startup, ingest, clients, count = run(db_dir, n_agents, n_chunks, memos_per_chunk, shared)
+        print(f"{label}: startup of {n_agents} stores {startup * 1e3:.0f} ms, ingest of {n_chunks} chunks "
+              f"{ingest:.2f} s ({count / ingest:.0f} memos/s), {clients} Chroma clients opened")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark for markdown assembly in DocumentProcessor.
+
+Compares the legacy `create_docs` (string `+=` on the full markdown, the section
+text and every page, with the markdown threaded through `_add_document`) with
+`create_docs` built on `stream_docs`, and with `stream_docs` writing straight to
+a file while the caller drops each document once handled. Checks that the
+outputs are identical and reports time and peak traced memory.
+
+Usage:
+    python benchmarks/bench_create_docs.py [n_pages]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from langchain.schema import Document
+
+from autosearch.analysis.document_processor import DocumentProcessor
+from autosearch.data.paper import Paper
+
+sys.path.insert(0, os.path.dirname(__file__))
+from synthetic_layout import make_layout  # noqa: E402
+
+
+def legacy_add_document(docs, text, pages, source_name, max_token_size, full_md_text, largest_doc):
+    tokens = DocumentProcessor.count_tokens(text)
+    if tokens <= max_token_size:
+        docs.append(Document(page_content=text, metadata={"source": source_name, "pages": pages, "tokens": tokens}))
+        full_md_text += text
+        largest_doc = max(largest_doc, tokens)
+    else:
+        for part in DocumentProcessor._split_text(text, max_token_size):
+            part_tokens = DocumentProcessor.count_tokens(part)
+            docs.append(Document(page_content=part, metadata={"source": source_name, "pages": pages, "tokens": part_tokens}))
+            full_md_text += part
+            largest_doc = max(largest_doc, part_tokens)
+    return docs, full_md_text, largest_doc
+
+
+def legacy_create_docs(data, max_token_size, paper, reference=False):
+    docs = []
+    page_content = {str(i): "" for i in range(1, len(data['pages']) + 1)}
+    title = next((p['content'] for p in data['paragraphs'] if p.get('role') == 'title'), "Untitled Document")
+    full_md_text = f"# {title}\n\n"
+    largest_doc = 0
+    table_spans = DocumentProcessor._collect_table_spans(data['tables'])
+    paragraphs = DocumentProcessor._process_paragraphs(data['paragraphs'], table_spans, data['tables'])
+    current_section = ""
+    current_text = ""
+    current_pages = []
+    reference_section_found = False
+    for para in paragraphs:
+        if para['type'] == 'section_heading' or para['type'] == 'title':
+            if current_section:
+                if not reference_section_found or reference:
+                    docs, full_md_text, largest_doc = legacy_add_document(
+                        docs, current_text, list(np.unique(current_pages)), paper.source, max_token_size, full_md_text, largest_doc
+                    )
+            current_section = para['content']
+            current_text = f"## {current_section}\n\n"
+            current_pages = []
+            if not reference and current_section.lower().strip() in ['references', 'bibliography', 'works cited']:
+                reference_section_found = True
+        else:
+            if not reference_section_found or reference:
+                current_text += para['content']
+                current_pages.append(para['page'])
+        if not reference_section_found or reference:
+            page_content[str(para['page'])] += para['content']
+    if current_section and (not reference_section_found or reference):
+        docs, full_md_text, largest_doc = legacy_add_document(
+            docs, current_text, list(np.unique(current_pages)), paper.source, max_token_size, full_md_text, largest_doc
+        )
+    return docs, page_content, full_md_text
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = (time.perf_counter() - start) * 1e3
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    n_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    data = make_layout(n_pages)
+    paper = Paper(title="Synthetic", authors=[], url="synthetic", source="synthetic")
+    DocumentProcessor.count_tokens("warm up the encoder")
+
+    legacy, legacy_ms, legacy_mb = measure(lambda: legacy_create_docs(data, 3000, paper))
+    current, current_ms, current_mb = measure(lambda: DocumentProcessor.create_docs(data, 3000, paper))
+    assert [d.page_content for d in legacy[0]] == [d.page_content for d in current[0]]
+    assert [d.metadata for d in legacy[0]] == [d.metadata for d in current[0]]
+    assert legacy[1] == current[1] and legacy[2] == current[2], "outputs differ"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        md_path = os.path.join(tmp, "paper.md")
+
+        def stream_to_file():
+            n_docs = 0
+            with open(md_path, "w", encoding="utf-8") as md_out:
+                for _ in DocumentProcessor.stream_docs(data, 3000, paper, md_out=md_out):
+                    n_docs += 1
+            return n_docs
+
+        n_docs, stream_ms, stream_mb = measure(stream_to_file)
+        with open(md_path, encoding="utf-8") as f:
+            assert f.read() == legacy[2], "streamed markdown differs"
+
+    print(f"{n_pages} pages, {len(legacy[2]) / 1e6:.1f} MB of markdown, {n_docs} docs")
+    print(f"{'variant':<26}{'ms':>10}{'peak MB':>10}")
+    print(f"{'legacy create_docs':<26}{legacy_ms:>10.1f}{legacy_mb:>10.1f}")
+    print(f"{'create_docs':<26}{current_ms:>10.1f}{current_mb:>10.1f}")
+    print(f"{'stream_docs to file':<26}{stream_ms:>10.1f}{stream_mb:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark for DocumentProcessor chunking.
+
+Extracts the text of a PDF in tests/files with PyPDF2, treats it as one long
+section and splits it with the legacy chunker (an encoder lookup plus a re-encode
+of the growing part for every line and word) and with the current incremental
+chunker (each line encoded once, running token totals).
+
+Usage:
+    python benchmarks/bench_document_chunking.py [pdf_path] [max_token_size]
+"""
+import glob
+import os
+import sys
+import time
+
+import tiktoken
+from PyPDF2 import PdfReader
+
+from autosearch.analysis.document_processor import DocumentProcessor
+
+FILES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "files")
+
+
+def legacy_count_tokens(text: str) -> int:
+    enc = tiktoken.encoding_for_model("gpt-3.5-turbo")
+    return len(enc.encode(text))
+
+
+def legacy_split_text(text: str, max_token_size: int):
+    parts = []
+    current_part = ""
+    for line in text.split('\n'):
+        if legacy_count_tokens(current_part + line + '\n') > max_token_size:
+            if current_part:
+                parts.append(current_part.strip())
+                current_part = ""
+            if legacy_count_tokens(line + '\n') > max_token_size:
+                words = line.split()
+                for word in words:
+                    if legacy_count_tokens(current_part + word + ' ') > max_token_size:
+                        parts.append(current_part.strip())
+                        current_part = ""
+                    current_part += word + ' '
+            else:
+                current_part = line + '\n'
+        else:
+            current_part += line + '\n'
+    if current_part:
+        parts.append(current_part.strip())
+    return parts
+
+
+def extract_text(pdf_path: str) -> str:
+    reader = PdfReader(pdf_path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1e3
+
+
+def main():
+    pdf_path = sys.argv[1] if len(sys.argv) > 1 else max(glob.glob(os.path.join(FILES_DIR, "*.pdf")), key=os.path.getsize)
+    max_token_size = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    text = extract_text(pdf_path)
+    # A single paragraph without line breaks exercises the long-line path.
+    flat_text = ' '.join(text.split())
+
+    print(f"{os.path.basename(pdf_path)}: {len(text)} characters, "
+          f"{DocumentProcessor.count_tokens(text)} tokens, max_token_size={max_token_size}")
+    print(f"{'input':<12}{'chunker':<14}{'parts':>8}{'ms':>12}")
+    for name, sample in (("lines", text), ("one line", flat_text)):
+        legacy_parts, legacy_ms = timed(lambda: legacy_split_text(sample, max_token_size))
+        parts, ms = timed(lambda: DocumentProcessor._split_text(sample, max_token_size))
+        largest = max(DocumentProcessor.count_tokens(part) for part in parts)
+        print(f"{name:<12}{'legacy':<14}{len(legacy_parts):>8}{legacy_ms:>12.1f}")
+        print(f"{name:<12}{'incremental':<14}{len(parts):>8}{ms:>12.1f}   "
+              f"speedup {legacy_ms / ms:.0f}x, largest part {largest} tokens")
+
+
+if __name__ == '__main__':
+    main()
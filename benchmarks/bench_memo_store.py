@@ -0,0 +1,82 @@
+"""
+Benchmark for bulk memo ingestion in MemoStore.
+
+Ingests the same synthetic question-answer memos into a fresh MemoStore twice:
+once one memo at a time, rewriting the memo file after every memo as the
+teachability agent did, and once with a single `add_many` call, which embeds
+in batches, writes Chroma once and appends to the journal. Reports the time of
+each and the memos per second. The one-at-a-time pass is capped (second
+argument) as it grows quadratically; its rate is what to compare.
+
+Pass `hash` as the third argument to embed with a local hashing function
+instead of Chroma's default model, which has to be downloaded on first use.
+
+Usage:
+    python benchmarks/bench_memo_store.py [n_memos] [n_memos_one_at_a_time] [default|hash]
+"""
+import hashlib
+import sys
+import tempfile
+import time
+
+from autosearch.agents.chroma_registry import close_chroma_store, get_chroma_store
+from autosearch.agents.memo_store import MemoStore
+
+
+class HashEmbeddingFunction:
+    """Embeds texts as normalized bag-of-hashed-words vectors, without a model."""
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+
+    def __call__(self, input):
+        embeddings = []
+        for text in input:
+            vector = [0.0] * self.dimensions
+            for word in text.lower().split():
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dimensions] += 1.0
+            norm = sum(value * value for value in vector) ** 0.5 or 1.0
+            embeddings.append([value / norm for value in vector])
+        return embeddings
+
+
+def open_store(db_dir: str, embedding: str) -> MemoStore:
+    if embedding == "hash":
+        get_chroma_store(db_dir, embedding_function_factory=HashEmbeddingFunction)
+    return MemoStore(verbosity=0, reset=True, path_to_db_dir=db_dir)
+
+
+def make_memos(n: int):
+    return [(f"What is the glass transition temperature of polymer sample {i}?",
+             f"Sample {i} has a Tg of {300 + i % 200} K, measured by DSC at 10 K/min.") for i in range(n)]
+
+
+def main():
+    n_memos = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    n_single = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    embedding = sys.argv[3] if len(sys.argv) > 3 else "default"
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        store = open_store(db_dir, embedding)
+        memos = make_memos(n_single)
+        start = time.perf_counter()
+        for input_text, output_text in memos:
+            store.add_input_output_pair(input_text, output_text)
+            store._save_memos()
+        elapsed = time.perf_counter() - start
+        print(f"one at a time: {n_single} memos in {elapsed:.2f} s ({n_single / elapsed:.0f} memos/s)")
+        close_chroma_store(db_dir)
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        store = open_store(db_dir, embedding)
+        memos = make_memos(n_memos)
+        start = time.perf_counter()
+        store.add_many(memos)
+        elapsed = time.perf_counter() - start
+        print(f"add_many: {n_memos} memos in {elapsed:.2f} s ({n_memos / elapsed:.0f} memos/s), "
+              f"{store.vec_db.count()} in the collection")
+        close_chroma_store(db_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Micro-benchmark for PaperDatabase per-call cost.
+
+Compares the previous connect-per-call access pattern against the pooled,
+WAL-mode PaperDatabase, single-threaded and from a ThreadPoolExecutor, and
+the per-row calls against the bulk add_papers/filter_unseen APIs.
+
+Usage:
+    python benchmarks/bench_paper_database.py [n_calls]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from autosearch.data.paper import Paper
+from autosearch.database.paper_database import PaperDatabase
+
+
+def make_paper(i: int) -> Paper:
+    return Paper(
+        title=f"Paper {i}",
+        authors=["Author A", "Author B"],
+        url=f"http://arxiv.org/abs/2401.{i:05d}",
+        source="arxiv",
+        published_date=datetime(2024, 1, 1),
+    )
+
+
+class ConnectPerCallDatabase:
+    """The pre-pool access pattern: open, execute, commit and close on every call."""
+
+    def __init__(self, project_dir: str):
+        self.db_path = os.path.join(project_dir, 'papers.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS read_abstracts (
+                url TEXT PRIMARY KEY, title TEXT, authors TEXT,
+                published_date TEXT, last_updated_date TEXT, source TEXT
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def add_paper(self, table_name: str, paper: Paper):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table_name} (url, title, authors, published_date, last_updated_date, source) VALUES (?, ?, ?, ?, ?, ?)",
+            (paper.url, paper.title, ', '.join(paper.authors), paper.published_date.isoformat(), '', paper.source),
+        )
+        conn.commit()
+        conn.close()
+
+    def check_paper(self, url: str, table_name: str) -> bool:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        result = conn.execute(f"SELECT url FROM {table_name} WHERE url = ?", (url,)).fetchone()
+        conn.close()
+        return result is not None
+
+    def close(self):
+        pass
+
+
+def run(db, n_calls: int, workers: int):
+    papers = [make_paper(i) for i in range(n_calls)]
+
+    def write(paper):
+        db.add_paper("read_abstracts", paper)
+
+    def read(paper):
+        db.check_paper(paper.url, "read_abstracts")
+
+    timings = {}
+    for name, op in (("add_paper", write), ("check_paper", read)):
+        start = time.perf_counter()
+        if workers == 1:
+            for paper in papers:
+                op(paper)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(op, papers))
+        timings[name] = (time.perf_counter() - start) / n_calls * 1e6
+    return timings
+
+
+def main():
+    n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'implementation':<18}{'workers':>8}{'add_paper us/call':>20}{'check_paper us/call':>22}")
+    for workers in (1, 8):
+        for label, factory in (("connect-per-call", ConnectPerCallDatabase), ("pooled", PaperDatabase)):
+            with tempfile.TemporaryDirectory() as tmp:
+                db = factory(tmp)
+                timings = run(db, n_calls, workers)
+                db.close()
+            print(f"{label:<18}{workers:>8}{timings['add_paper']:>20.1f}{timings['check_paper']:>22.1f}")
+
+
+    print()
+    print(f"{'bulk operation':<34}{'per-row ms':>12}{'bulk ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = PaperDatabase(tmp)
+        papers = [make_paper(i) for i in range(n_calls)]
+        start = time.perf_counter()
+        for paper in papers:
+            db.add_paper("read_papers", paper)
+        per_row = time.perf_counter() - start
+        start = time.perf_counter()
+        db.add_papers("read_abstracts", papers)
+        bulk = time.perf_counter() - start
+        print(f"{f'insert {n_calls} papers':<34}{per_row * 1e3:>12.1f}{bulk * 1e3:>10.1f}")
+
+        urls = [paper.url for paper in papers] + [f"http://example.com/{i}" for i in range(n_calls)]
+        start = time.perf_counter()
+        [url for url in urls if not db.check_paper(url, "read_abstracts")]
+        per_row = time.perf_counter() - start
+        start = time.perf_counter()
+        db.filter_unseen(urls, "read_abstracts")
+        bulk = time.perf_counter() - start
+        print(f"{f'membership of {len(urls)} urls':<34}{per_row * 1e3:>12.1f}{bulk * 1e3:>10.1f}")
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
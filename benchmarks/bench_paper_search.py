@@ -0,0 +1,74 @@
+"""
+Benchmark for PaperDatabase.search_papers: LIKE scan versus the FTS5 index.
+
+Fills read_abstracts with synthetic abstracts and times a handful of queries
+in both modes.
+
+Usage:
+    python benchmarks/bench_paper_search.py [n_papers]
+"""
+import itertools
+import random
+import sys
+import tempfile
+import time
+
+from autosearch.data.paper import Paper
+from autosearch.database.paper_database import PaperDatabase
+
+# A Zipf-distributed synthetic vocabulary, so that like real abstracts most
+# terms are rare and a few are very common.
+RNG = random.Random(0)
+VOCABULARY = [''.join(RNG.choices('abcdefghijklmnopqrstuvwxyz', k=RNG.randint(4, 10))) for _ in range(20000)]
+CUM_WEIGHTS = list(itertools.accumulate(1.0 / rank for rank in range(1, len(VOCABULARY) + 1)))
+
+# Common, mid-frequency and rare terms, single and combined.
+QUERIES = [VOCABULARY[0], VOCABULARY[50], VOCABULARY[500], VOCABULARY[5000], f"{VOCABULARY[20]} {VOCABULARY[300]}"]
+
+
+def make_papers(n_papers: int):
+    rng = random.Random(1)
+    return [
+        Paper(
+            title=' '.join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=10)),
+            authors=[f"Author {rng.randint(0, 5000)}" for _ in range(3)],
+            url=f"http://arxiv.org/abs/{i}",
+            source="arxiv",
+            abstract=' '.join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=200)),
+        )
+        for i in range(n_papers)
+    ]
+
+
+def main():
+    n_papers = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp:
+        paper_db = PaperDatabase(tmp)
+        papers = make_papers(n_papers)
+        start = time.perf_counter()
+        paper_db.add_papers("read_abstracts", papers)
+        print(f"Inserted {n_papers} abstracts in {time.perf_counter() - start:.2f}s")
+
+        print(f"{'query':<24}{'like ms':>10}{'like+abstract ms':>18}{'fts ms (top 20)':>17}{'fts hits':>10}")
+        for query in QUERIES:
+            start = time.perf_counter()
+            paper_db.search_papers("read_abstracts", query, mode="like")
+            like_ms = (time.perf_counter() - start) * 1e3
+            # What LIKE would cost if it also covered abstracts, as the FTS index does.
+            start = time.perf_counter()
+            paper_db.pool.connection().execute(
+                "SELECT * FROM read_abstracts WHERE title LIKE ?1 OR authors LIKE ?1 OR abstract LIKE ?1", (f"%{query}%",)
+            ).fetchall()
+            like_abstract_ms = (time.perf_counter() - start) * 1e3
+            start = time.perf_counter()
+            paper_db.search_papers("read_abstracts", query, mode="fts", limit=20)
+            fts_ms = (time.perf_counter() - start) * 1e3
+            fts_hits = paper_db.pool.connection().execute(
+                "SELECT COUNT(*) FROM read_abstracts_fts WHERE read_abstracts_fts MATCH ?", (PaperDatabase._fts_query(query),)
+            ).fetchone()[0]
+            print(f"{query:<24}{like_ms:>10.1f}{like_abstract_ms:>18.1f}{fts_ms:>17.1f}{fts_hits:>10}")
+        paper_db.close()
+
+
+if __name__ == '__main__':
+    main()
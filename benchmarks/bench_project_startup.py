@@ -0,0 +1,78 @@
+"""
+Benchmark for project startup with the shared project services.
+
+Replays the service construction of `ResearchProject.__init__` (its PaperDatabase
+and DocumentAnalyzer, which builds a PDFManager and a MetadataExtractor) followed
+by a number of agent tool calls that each need the project's SearchManager, once
+with every component building its own SearchManager and PaperDatabase, as before
+the service registry, and once through the registry. The rest of
+`ResearchProject.__init__` (autogen config, logging and agents) needs an LLM
+configuration and is the same in both modes, so it is left out. Reports the
+startup time, the time of the tool calls and how many SearchManagers and
+PaperDatabases were built.
+
+Usage:
+    python benchmarks/bench_project_startup.py [tool_calls] [repetitions]
+"""
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from autosearch.analysis.document_analyzer import DocumentAnalyzer
+from autosearch.api.search_manager import SearchManager
+from autosearch.config_types import ProjectConfig
+from autosearch.database.paper_database import PaperDatabase
+from autosearch.services import ProjectServices, close_project_services, get_project_services
+
+
+class Counter:
+    def __init__(self, cls):
+        self.cls = cls
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+        return self.cls(*args, **kwargs)
+
+
+def run(project_dir: str, tool_calls: int, shared: bool):
+    managers, databases = Counter(SearchManager), Counter(PaperDatabase)
+    # Without sharing, every lookup builds fresh services, as each component used to.
+    lookup = get_project_services if shared else ProjectServices
+    with patch('autosearch.services.SearchManager', managers), \
+            patch('autosearch.services.PaperDatabase', databases), \
+            patch('autosearch.api.search_manager.PaperDatabase', databases), \
+            patch('autosearch.analysis.document_analyzer.get_project_services', lookup), \
+            patch('autosearch.analysis.pdf_manager.get_project_services', lookup):
+        start = time.perf_counter()
+        paper_db = lookup(project_dir).paper_db
+        analyzer = DocumentAnalyzer("bench-key", "https://example.invalid", project_dir, lambda paper, config: None)
+        startup = time.perf_counter() - start
+
+        config = ProjectConfig(paper_db=paper_db, doc_analyzer=analyzer, project_dir=project_dir,
+                               db_dir=f"{project_dir}/db", config_list=[], initiate_db=False)
+        start = time.perf_counter()
+        for _ in range(tool_calls):
+            (config.services if shared else ProjectServices(project_dir)).search_manager
+        calls = time.perf_counter() - start
+    close_project_services(project_dir)
+    return startup, calls, managers.count, databases.count
+
+
+def main():
+    tool_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    for label, shared in (("per-component", False), ("shared registry", True)):
+        startups, call_times = [], []
+        for _ in range(repetitions):
+            with tempfile.TemporaryDirectory() as project_dir:
+                startup, calls, managers, databases = run(project_dir, tool_calls, shared)
+            startups.append(startup)
+            call_times.append(calls)
+        print(f"{label}: startup {min(startups) * 1e3:.1f} ms, {tool_calls} tool calls {min(call_times) * 1e3:.1f} ms, "
+              f"{managers} SearchManagers and {databases} PaperDatabases built")
+
+
+if __name__ == '__main__':
+    main()
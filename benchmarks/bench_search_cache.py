@@ -0,0 +1,59 @@
+"""
+Benchmark for the search cache in SearchManager.
+
+Runs the same agent-style queries through `search_all` and `get_paper_metadata`
+twice against providers that take a fixed time to answer, first with a cold
+cache and then with a warm one, and reports the latency of each pass and the
+cache counters.
+
+Usage:
+    python benchmarks/bench_search_cache.py [provider_delay_seconds]
+"""
+import sys
+import tempfile
+import time
+
+from autosearch.api.search_api_base import SearchAPIBase
+from autosearch.api.search_manager import SearchManager
+from autosearch.data.paper import Paper
+
+
+class SlowAPI(SearchAPIBase):
+    def __init__(self, name: str, delay: float):
+        self.name = name
+        self.delay = delay
+
+    def search(self, query, n_results=10):
+        time.sleep(self.delay)
+        return [Paper(title=f"{query} {i}", authors=["A. Author"], url=f"http://{self.name}/{query}/{i}",
+                      source=self.name, abstract="An abstract. " * 40) for i in range(n_results)]
+
+    def get_paper_metadata(self, identifier):
+        time.sleep(self.delay)
+        return Paper(title=identifier, authors=["A. Author"], url=identifier, source=self.name)
+
+    def download_pdf(self, identifier, output_path):
+        raise NotImplementedError
+
+
+def main():
+    delay = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    queries = [f"polymer property prediction {i}" for i in range(10)]
+    with tempfile.TemporaryDirectory() as project_dir:
+        for label in ("cold", "warm"):
+            # A new manager per pass, as the agent functions create one per call.
+            manager = SearchManager(project_dir)
+            manager.apis = {'arxiv': SlowAPI('arxiv', delay), 'google_scholar': SlowAPI('google_scholar', delay)}
+            start = time.perf_counter()
+            for query in queries:
+                manager.search_all(query.upper() if label == "warm" else query, n_results=5)
+                manager.get_paper_metadata(f"http://arxiv.org/abs/{query}", 'arxiv')
+            elapsed = time.perf_counter() - start
+            print(f"{label}: {len(queries)} searches + lookups in {elapsed * 1e3:.1f} ms "
+                  f"({elapsed / len(queries) * 1e3:.2f} ms each), {manager.cache_stats()}")
+            manager.paper_db.close()
+            manager.search_cache.close()
+
+
+if __name__ == '__main__':
+    main()
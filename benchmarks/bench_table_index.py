@@ -0,0 +1,105 @@
+"""
+Benchmark for merging tables into the paragraph stream in DocumentProcessor.
+
+Compares the legacy lookup (a dict keyed by the stringified table start, probed at
+`paragraph end + 1`) with the TableSpanIndex merge on synthetic layouts with
+thousands of paragraphs. The second layout starts some tables after a gap and
+splits some over several spans, which the legacy lookup drops or mis-skips.
+Table markdown conversion is stubbed out so only the merge itself is timed.
+
+Usage:
+    python benchmarks/bench_table_index.py [n_pages]
+"""
+import os
+import random
+import sys
+import time
+
+from autosearch.analysis import document_processor
+from autosearch.analysis.document_processor import DocumentProcessor
+
+sys.path.insert(0, os.path.dirname(__file__))
+from synthetic_layout import make_layout  # noqa: E402
+
+
+def legacy_collect_table_spans(tables):
+    spans = {}
+    for idx, tab in enumerate(tables):
+        if len(tab['spans']) == 1:
+            key = str(tab['spans'][0]['offset'])
+        else:
+            key = str(min(sp['offset'] for sp in tab['spans']))
+        spans[key] = idx
+    return spans
+
+
+def legacy_calculate_end_of_table(table):
+    if len(table['spans']) > 1:
+        return min(sp['offset'] for sp in table['spans']) + sum(sp['length'] for sp in table['spans']) + 1
+    return table['spans'][0]['offset'] + table['spans'][0]['length'] + 1
+
+
+def legacy_process_paragraphs(paragraphs, table_spans, tables):
+    processed = []
+    end_of_table = 0
+    for para in paragraphs:
+        if para['spans'][0]['offset'] >= end_of_table:
+            if para.get('role') == 'sectionHeading':
+                processed.append({'type': 'section_heading', 'content': para['content'] + "\n\n",
+                                  'page': para['bounding_regions'][0]['page_number']})
+            elif para.get('role') == 'title':
+                processed.append({'type': 'title', 'content': para['content'] + "\n\n",
+                                  'page': para['bounding_regions'][0]['page_number']})
+            elif para.get('role') != 'pageNumber':
+                processed.append({'type': 'paragraph', 'content': para['content'] + "\n\n",
+                                  'page': para['bounding_regions'][0]['page_number']})
+            search_key = str(para['spans'][0]['offset'] + para['spans'][0]['length'] + 1)
+            if search_key in table_spans:
+                table_idx = table_spans[search_key]
+                processed.append({'type': 'table', 'content': "\n\n" + document_processor.tb.tabletomd(tables[table_idx]) + "\n\n",
+                                  'page': tables[table_idx]['bounding_regions'][0]['page_number']})
+                end_of_table = legacy_calculate_end_of_table(tables[table_idx])
+    return processed
+
+
+def shift_tables(data, seed: int = 1):
+    """Move every other table a few characters later and split every third one in two."""
+    rng = random.Random(seed)
+    for i, table in enumerate(data['tables']):
+        if i % 2:
+            table['spans'][0]['offset'] += 2
+            table['spans'][0]['length'] -= 2
+        if i % 3 == 0 and table['spans'][0]['length'] > 20:
+            span = table['spans'][0]
+            first = rng.randint(5, span['length'] - 10)
+            table['spans'] = [{'offset': span['offset'], 'length': first},
+                              {'offset': span['offset'] + first + 5, 'length': span['length'] - first - 5}]
+    return data
+
+
+def best_of(func, repeat: int = 5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings) * 1e3
+
+
+def main():
+    n_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    document_processor.tb.tabletomd = lambda table: "table"
+
+    print(f"{'layout':<18}{'method':<16}{'paragraphs':>12}{'tables':>8}{'kept':>8}{'ms':>10}")
+    for name, data in (("aligned tables", make_layout(n_pages)), ("shifted tables", shift_tables(make_layout(n_pages)))):
+        paragraphs, tables = data['paragraphs'], data['tables']
+        legacy, legacy_ms = best_of(lambda: legacy_process_paragraphs(paragraphs, legacy_collect_table_spans(tables), tables))
+        current, current_ms = best_of(lambda: DocumentProcessor._process_paragraphs(
+            paragraphs, DocumentProcessor._collect_table_spans(tables), tables))
+        for method, result, ms in (("legacy", legacy, legacy_ms), ("TableSpanIndex", current, current_ms)):
+            kept = sum(item['type'] == 'table' for item in result)
+            print(f"{name:<18}{method:<16}{len(paragraphs):>12}{len(tables):>8}{kept:>8}{ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark for the table converters in tablehelper.
+
+Compares the legacy `tabletomd` ("row-col" string keys and `+=` for every grid
+position) with the current converters on large synthetic tables, and the legacy
+linear `gettablesfrompage` with the page-indexed one when every page of a long
+document is queried.
+
+Usage:
+    python benchmarks/bench_tablehelper.py
+"""
+import random
+import time
+
+from autosearch.analysis import tablehelper as tb
+
+
+def legacy_tabletomd(table):
+    celldict = {}
+    lastcolumn = table['column_count'] - 1
+    for cell in table['cells']:
+        key = str(cell['row_index']) + "-" + str(cell['column_index'])
+        celldict[key] = cell['content']
+    tsvtable = ""
+    for row in range(table['row_count']):
+        for col in range(table['column_count']):
+            key = str(row) + "-" + str(col)
+            if col == 0:
+                tsvtable += '|'
+            if key in celldict:
+                tsvtable += celldict[key] + '|'
+            else:
+                tsvtable += '|'
+            if col == lastcolumn:
+                tsvtable += '\n'
+                if row == 0:
+                    tsvtable += '|'
+                    for col in range(table['column_count']):
+                        tsvtable += '---|'
+                    tsvtable += '\n'
+    return tsvtable
+
+
+def legacy_gettablesfrompage(tables, page):
+    return [legacy_tabletomd(table) for table in tables if table['bounding_regions'][0]['page_number'] == page]
+
+
+def make_table(rows: int, cols: int, page: int = 1, seed: int = 0):
+    rng = random.Random(seed)
+    return {
+        "row_count": rows, "column_count": cols,
+        "bounding_regions": [{"page_number": page}],
+        "cells": [{"row_index": row, "column_index": col, "row_span": 1, "column_span": 1,
+                   "content": f"{rng.random() * 100:.{rng.randint(0, 4)}f}"}
+                  for row in range(rows) for col in range(cols)],
+    }
+
+
+def best_of(func, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+
+def main():
+    print(f"{'table':<12}{'legacy md':>12}{'md':>10}{'csv':>10}{'tsv':>10}{'speedup':>10}")
+    for rows, cols in ((50, 8), (1000, 20), (5000, 20), (2000, 50)):
+        table = make_table(rows, cols)
+        assert tb.tabletomd(table) == legacy_tabletomd(table)
+        legacy_ms = best_of(lambda: legacy_tabletomd(table))
+        md_ms = best_of(lambda: tb.tabletomd(table))
+        csv_ms = best_of(lambda: tb.tabletocsv(table))
+        tsv_ms = best_of(lambda: tb.tabletotsv(table))
+        print(f"{f'{rows}x{cols}':<12}{legacy_ms:>12.2f}{md_ms:>10.2f}{csv_ms:>10.2f}{tsv_ms:>10.2f}{legacy_ms / md_ms:>9.1f}x")
+
+    n_pages = 300
+    tables = [make_table(20, 6, page=1 + i // 2, seed=i) for i in range(2 * n_pages)]
+    legacy_ms = best_of(lambda: [legacy_gettablesfrompage(tables, page) for page in range(1, n_pages + 1)], 3)
+
+    def indexed():
+        page_index = tb.indextablesbypage(tables)
+        return [tb.gettablesfrompage(tables, page, page_index) for page in range(1, n_pages + 1)]
+
+    current_ms = best_of(indexed, 3)
+    print(f"gettablesfrompage over {n_pages} pages, {len(tables)} tables: "
+          f"legacy {legacy_ms:.1f} ms, indexed {current_ms:.1f} ms ({legacy_ms / current_ms:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Synthetic Document Intelligence layouts for the DocumentProcessor benchmarks.
+
+`make_layout` returns a dict shaped like a `prebuilt-document` analysis result:
+a title, section headings, body paragraphs, page numbers, tables placed right
+after a paragraph (one character later, as in the service's `content`) with
+their cells repeated as paragraphs, and a closing References section.
+"""
+import random
+from typing import Any, Dict, List
+
+WORDS = ("polymer chain representation learning graph network monomer property prediction "
+         "glass transition temperature dataset model accuracy molecular descriptor").split()
+
+
+def make_table(rng: random.Random, offset: int, page_number: int, rows: int, cols: int) -> Dict[str, Any]:
+    cells = []
+    cell_offset = offset
+    for row in range(rows):
+        for col in range(cols):
+            content = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+            cells.append({
+                "kind": "columnHeader" if row == 0 else "content",
+                "row_index": row, "column_index": col, "row_span": 1, "column_span": 1,
+                "content": content,
+                "spans": [{"offset": cell_offset, "length": len(content)}],
+            })
+            cell_offset += len(content) + 1
+    return {
+        "row_count": rows, "column_count": cols, "cells": cells,
+        "bounding_regions": [{"page_number": page_number, "polygon": []}],
+        "spans": [{"offset": offset, "length": cell_offset - offset}],
+    }
+
+
+def make_layout(n_pages: int, paragraphs_per_page: int = 12, table_every: int = 2, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    paragraphs: List[Dict[str, Any]] = []
+    tables: List[Dict[str, Any]] = []
+    offset = 0
+
+    def add_paragraph(content: str, page_number: int, role=None):
+        nonlocal offset
+        paragraph = {
+            "content": content,
+            "bounding_regions": [{"page_number": page_number, "polygon": []}],
+            "spans": [{"offset": offset, "length": len(content)}],
+        }
+        if role is not None:
+            paragraph["role"] = role
+        paragraphs.append(paragraph)
+        offset += len(content) + 1
+
+    add_paragraph("A Synthetic Study of Polymer Representation Learning", 1, "title")
+    for page_number in range(1, n_pages + 1):
+        if page_number == n_pages:
+            add_paragraph("References", page_number, "sectionHeading")
+        elif page_number % 3 == 1:
+            add_paragraph(f"{page_number // 3 + 1} {rng.choice(WORDS).title()} {rng.choice(WORDS)}", page_number, "sectionHeading")
+        for i in range(paragraphs_per_page):
+            add_paragraph(' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, 80))) + '.', page_number)
+            if table_every and i == paragraphs_per_page // 2 and page_number % table_every == 0:
+                table = make_table(rng, offset, page_number, rng.randint(3, 8), rng.randint(2, 6))
+                tables.append(table)
+                # The service also reports every cell as a paragraph inside the table's span.
+                for cell in table["cells"]:
+                    paragraphs.append({
+                        "content": cell["content"],
+                        "bounding_regions": [{"page_number": page_number, "polygon": []}],
+                        "spans": cell["spans"],
+                    })
+                offset += table["spans"][0]["length"] + 1
+        add_paragraph(str(page_number), page_number, "pageNumber")
+
+    return {
+        "api_version": "2023-07-31", "model_id": "prebuilt-document", "content": "",
+        "pages": [{"page_number": page_number} for page_number in range(1, n_pages + 1)],
+        "paragraphs": paragraphs, "tables": tables,
+    }
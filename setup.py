@@ -19,6 +19,9 @@ setup(
         "azure-identity",
         "tiktoken",
         "langchain",
+        "orjson",
+        "zstandard",
+        "aiohttp",
         # Add other dependencies here
     ],
     python_requires=">=3.9",
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from autosearch.database.connection_pool import ConnectionPool
+from autosearch.path_registry import PathRegistry
+
+# Recency is only rewritten when an entry was last touched longer ago than this, so
+# most hits are pure reads.
+TOUCH_INTERVAL = 60.0
+
+
+def analysis_key(text: str, instruction: str, model: str) -> str:
+    """Returns the cache key of an analysis: the SHA-256 of the model, the instruction and the text."""
+    return hashlib.sha256(json.dumps([model, instruction, text], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class AnalyzerCache:
+    """
+    A persistent cache of TextAnalyzerAgent responses.
+
+    Entries are keyed by a content hash of the analyzed text, the instruction and the
+    model, so an identical passage (a rerun of chunk_pdf, or an abstract reaching
+    several teachable agents) is analyzed once. Once the cache holds more than
+    `max_entries`, the least recently used entries are evicted. Each entry keeps the
+    token count of its prompt and response, so hits add up the tokens saved.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 20000):
+        """
+        Args:
+            db_path (str): The path to the SQLite file holding the cache.
+            max_entries (int): The number of entries the cache is trimmed to.
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.pool = ConnectionPool(db_path)
+        self.pool.execute_write(self._create_table)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _create_table(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS analyzer_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                tokens INTEGER NOT NULL,
+                accessed REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_analyzer_cache_accessed ON analyzer_cache(accessed)')
+
+    def get(self, text: str, instruction: str, model: str) -> Optional[str]:
+        """
+        Looks an analysis up in the cache.
+
+        Args:
+            text (str): The analyzed text.
+            instruction (str): The analysis instruction.
+            model (str): The model doing the analysis.
+
+        Returns:
+            Optional[str]: The cached response, or None on a miss.
+        """
+        key = analysis_key(text, instruction, model)
+        try:
+            row = self.pool.connection().execute(
+                'SELECT response, tokens, accessed FROM analyzer_cache WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            # A broken cache must not break the agent; treat it as a miss.
+            print(f"Error reading the analyzer cache: {str(e)}")
+            row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_tokens += row['tokens']
+
+        now = time.time()
+        if now - row['accessed'] > TOUCH_INTERVAL:
+            try:
+                self.pool.execute_write(
+                    lambda conn: conn.execute('UPDATE analyzer_cache SET accessed = ? WHERE key = ?', (now, key)))
+            except sqlite3.Error as e:
+                print(f"Error writing to the analyzer cache: {str(e)}")
+        return row['response']
+
+    def put(self, text: str, instruction: str, model: str, response: str, tokens: int = 0):
+        """
+        Stores a response.
+
+        Args:
+            text (str): The analyzed text.
+            instruction (str): The analysis instruction.
+            model (str): The model doing the analysis.
+            response (str): The analyzer's response.
+            tokens (int): The tokens the prompt and response took, counted as saved on every hit.
+        """
+        key = analysis_key(text, instruction, model)
+        now = time.time()
+
+        def write(conn: sqlite3.Connection) -> int:
+            conn.execute('INSERT OR REPLACE INTO analyzer_cache (key, response, tokens, accessed) VALUES (?, ?, ?, ?)',
+                         (key, response, tokens, now))
+            excess = conn.execute('SELECT COUNT(*) FROM analyzer_cache').fetchone()[0] - self.max_entries
+            if excess <= 0:
+                return 0
+            return conn.execute('DELETE FROM analyzer_cache WHERE key IN '
+                                '(SELECT key FROM analyzer_cache ORDER BY accessed LIMIT ?)', (excess,)).rowcount
+
+        try:
+            evicted = self.pool.execute_write(write)
+        except sqlite3.Error as e:
+            print(f"Error writing to the analyzer cache: {str(e)}")
+            return
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hit, miss and eviction counters, the hit rate and the tokens saved by hits."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'saved_tokens': self.saved_tokens,
+            }
+
+    def clear(self):
+        """Removes every entry."""
+        self.pool.execute_write(lambda conn: conn.execute('DELETE FROM analyzer_cache'))
+
+    def close(self):
+        self.pool.close()
+
+
+_caches: PathRegistry[AnalyzerCache] = PathRegistry(AnalyzerCache)
+
+
+def get_analyzer_cache(db_path: str, **kwargs) -> AnalyzerCache:
+    """
+    Returns the process-wide cache stored at `db_path`, creating it with `kwargs` on first use,
+    so the teachable agents sharing a DB directory share their cache and its counters.
+
+    Args:
+        db_path (str): The path to the SQLite file holding the cache.
+        **kwargs: AnalyzerCache arguments, used only when the cache is created.
+
+    Returns:
+        AnalyzerCache: The cache.
+    """
+    return _caches.get(db_path, **kwargs)
@@ -71,7 +71,11 @@ class BaseAgent(autogen.AssistantAgent):
                 reset_db=getattr(self.agent_config, 'reset_db', getattr(self.project_config, 'reset_db', False)),
                 path_to_db_dir=getattr(self.agent_config, 'db_dir', getattr(self.project_config, 'db_dir', self.project_config.project_dir + '/db')),
                 recall_threshold=getattr(self.agent_config, 'recall_threshold', getattr(self.project_config, 'recall_threshold', 1.5)),
-                learnable=getattr(self.agent_config, 'learnable', True)
+                learnable=getattr(self.agent_config, 'learnable', True),
+                pre_classifier=getattr(self.agent_config, 'memo_pre_classifier', getattr(self.project_config, 'memo_pre_classifier', None)),
+                structured_analysis=getattr(self.agent_config, 'structured_memo_analysis', getattr(self.project_config, 'structured_memo_analysis', False)),
+                log_decisions=getattr(self.agent_config, 'log_memo_decisions', getattr(self.project_config, 'log_memo_decisions', False)),
+                cache_analysis=getattr(self.agent_config, 'cache_memo_analysis', getattr(self.project_config, 'cache_memo_analysis', True))
             )
             teachability.add_to_agent(self)
 
@@ -0,0 +1,113 @@
+import threading
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import chromadb
+    from chromadb.config import Settings
+    from chromadb.utils import embedding_functions
+except ImportError:
+    chromadb = None
+
+from autosearch.path_registry import PathRegistry
+
+
+def _default_client(path: str) -> Any:
+    settings = Settings(anonymized_telemetry=False, allow_reset=True, is_persistent=True, persist_directory=path)
+    return chromadb.Client(settings)
+
+
+def _default_embedding_function() -> Any:
+    return embedding_functions.DefaultEmbeddingFunction()
+
+
+class ChromaStore:
+    """
+    The Chroma client of one DB directory, with its embedding function and open collections.
+
+    Every teachable agent used to open its own client on the directory it shares with the
+    others, and load its own embedding model. The store opens the client once, and hands
+    out one collection object per name, so all the agents read and write the same one.
+    """
+
+    def __init__(self, path: str, client_factory: Optional[Callable[[str], Any]] = None,
+                 embedding_function_factory: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            path (str): The directory holding the Chroma DB.
+            client_factory (Optional[Callable[[str], Any]]): Builds the client for a directory.
+                Defaults to a persistent chromadb client.
+            embedding_function_factory (Optional[Callable[[], Any]]): Builds the embedding function.
+                Defaults to Chroma's default Sentence Transformers.
+        """
+        if client_factory is None and chromadb is None:
+            raise ImportError("chromadb is required for the memo store. Install it with `pip install chromadb`.")
+        self.path = path
+        self.client = (client_factory or _default_client)(path)
+        self.embedding_function = (embedding_function_factory or _default_embedding_function)()
+        self._collections: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def collection(self, name: str) -> Any:
+        """
+        Returns the collection called `name`, creating it on first use.
+
+        Args:
+            name (str): The collection name.
+
+        Returns:
+            Any: The Chroma collection, using the store's embedding function.
+        """
+        collection = self._collections.get(name)
+        if collection is None:
+            with self._lock:
+                collection = self._collections.get(name)
+                if collection is None:
+                    collection = self.client.create_collection(
+                        name, embedding_function=self.embedding_function, get_or_create=True)
+                    self._collections[name] = collection
+        return collection
+
+    def reset_collection(self, name: str) -> Any:
+        """
+        Drops the collection called `name` and creates it again, empty.
+
+        Later calls to `collection` return the new collection, so callers sharing the
+        store should look it up again rather than keep the old one.
+
+        Args:
+            name (str): The collection name.
+
+        Returns:
+            Any: The new, empty collection.
+        """
+        with self._lock:
+            self._collections.pop(name, None)
+            # Create it first if needed, so the delete finds it whichever Chroma version is installed.
+            self.client.create_collection(name, embedding_function=self.embedding_function, get_or_create=True)
+            self.client.delete_collection(name)
+            collection = self.client.create_collection(name, embedding_function=self.embedding_function)
+            self._collections[name] = collection
+        return collection
+
+
+_stores: PathRegistry[ChromaStore] = PathRegistry(ChromaStore)
+
+
+def get_chroma_store(path: str, **kwargs) -> ChromaStore:
+    """
+    Returns the process-wide Chroma store of the DB directory `path`, creating it with
+    `kwargs` on first use, so the teachable agents sharing a directory share one client.
+
+    Args:
+        path (str): The directory holding the Chroma DB. Different spellings of the same directory share a store.
+        **kwargs: ChromaStore arguments, used only when the store is created.
+
+    Returns:
+        ChromaStore: The store.
+    """
+    return _stores.get(path, **kwargs)
+
+
+def close_chroma_store(path: str):
+    """Removes the Chroma store of a DB directory from the registry; the next lookup opens a new client."""
+    _stores.pop(path)
@@ -0,0 +1,272 @@
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+except ImportError:
+    make_pipeline = None
+
+from autosearch.path_registry import PathRegistry
+
+# The size past which MemoDecisionLog stops recording, as every logged message is kept in full.
+MAX_DECISION_LOG_BYTES = 20 * 1024 * 1024
+
+# Instructions for the structured analysis mode of Teachability: every decision and
+# extraction of the sequential TextAnalyzerAgent rounds, answered in one JSON object.
+STRUCTURED_ANALYSIS_INSTRUCTIONS = """Analyze the TEXT and answer with a single JSON object, and nothing else, with these fields:
+"is_task": true if any part of the TEXT asks the agent to perform a task or solve a problem, otherwise false.
+"task": if is_task, just the task copied from the TEXT, without solving it or including any advice; otherwise "".
+"general_task": if is_task, a very brief summary, in general terms, of the type of task described in the TEXT, leaving out details that might not appear in a similar problem; otherwise "".
+"advice": any advice from the TEXT that may be useful for a similar but different task in the future, or "none" if no advice is present.
+"has_information": true if the TEXT contains information that could be committed to memory, otherwise false.
+"question": if has_information, how the user would ask for this information if they forgot it; otherwise "".
+"answer": if has_information, the information from the TEXT that should be committed to memory, with no explanation; otherwise ""."""
+
+_ANALYSIS_FLAGS = ("is_task", "has_information")
+_ANALYSIS_TEXTS = ("task", "general_task", "advice", "question", "answer")
+
+
+def parse_structured_analysis(response: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses the reply to STRUCTURED_ANALYSIS_INSTRUCTIONS.
+
+    Args:
+        response (str): The reply, possibly wrapped in a code fence or surrounded by other text.
+
+    Returns:
+        Optional[Dict[str, Any]]: The two flags as booleans and the extracted texts as strings,
+        or None if the reply holds no usable JSON object.
+    """
+    start, end = response.find("{"), response.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        data = json.loads(response[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or not all(flag in data for flag in _ANALYSIS_FLAGS):
+        return None
+
+    analysis = {}
+    for flag in _ANALYSIS_FLAGS:
+        value = data[flag]
+        analysis[flag] = value.strip().lower() in ("yes", "true") if isinstance(value, str) else bool(value)
+    for field in _ANALYSIS_TEXTS:
+        value = data.get(field)
+        analysis[field] = "" if value is None else str(value).strip()
+    return analysis
+
+
+class MemoPreClassifier:
+    """
+    Decides locally whether a message is worth a round of TextAnalyzerAgent calls.
+
+    A pre-classifier answers False only when it is confident the message holds no task
+    (or no information to remember); True means the LLM is asked as before. The base
+    class always answers True.
+    """
+
+    def may_contain_task(self, text: str) -> bool:
+        """Returns False if `text` certainly asks for no task, so the task analysis can be skipped."""
+        return True
+
+    def may_contain_information(self, text: str) -> bool:
+        """Returns False if `text` certainly holds nothing to remember, so the information analysis can be skipped."""
+        return True
+
+
+class KeywordPreClassifier(MemoPreClassifier):
+    """
+    A keyword and regular expression pre-classifier.
+
+    Messages with fewer than `min_words` words outside code blocks, such as
+    acknowledgements, termination messages and bare code, hold neither a task nor
+    information. Otherwise a task needs a question or a request cue (a question word,
+    "please", an imperative verb), and information needs a statement cue (a verb of
+    being or having, a number, a link, "remember", ...). The patterns err towards
+    asking the LLM.
+    """
+
+    DEFAULT_TASK_PATTERNS = (
+        r"\?",
+        r"\b(?:please|pls|can you|could you|would you|will you|i need|i want|we need|let's|lets|help)\b",
+        r"\b(?:how|what|why|which|when|where|who|whom|whose)\b",
+        r"(?:^|[.!:;\n]\s*)(?:write|find|search|look|summari[sz]e|compare|list|explain|create|generate|make|draw|plot|"
+        r"calculate|compute|analy[sz]e|review|check|verify|retrieve|read|give|show|tell|describe|draft|outline|"
+        r"prepare|provide|identify|extract|translate|implement|fix|update|add|remove|use|run|collect|rank|select)\b",
+    )
+    DEFAULT_INFORMATION_PATTERNS = (
+        r"\b(?:is|are|was|were|be|been|has|have|had|means|mean|refers?|called|defined|known|shows?|showed|found|"
+        r"reports?|reported|remember|note|always|never|prefer|should|must|uses?|used)\b",
+        r"\d",
+        r"https?://",
+    )
+
+    def __init__(self, min_words: int = 4, task_patterns: Optional[Sequence[str]] = None,
+                 information_patterns: Optional[Sequence[str]] = None):
+        """
+        Args:
+            min_words (int): Messages with fewer words outside code blocks are skipped. Default 4.
+            task_patterns (Optional[Sequence[str]]): Regular expressions of task cues. Defaults to DEFAULT_TASK_PATTERNS.
+            information_patterns (Optional[Sequence[str]]): Regular expressions of information cues.
+                Defaults to DEFAULT_INFORMATION_PATTERNS.
+        """
+        self.min_words = min_words
+        self.task_pattern = re.compile("|".join(task_patterns or self.DEFAULT_TASK_PATTERNS), re.IGNORECASE)
+        self.information_pattern = re.compile(
+            "|".join(information_patterns or self.DEFAULT_INFORMATION_PATTERNS), re.IGNORECASE)
+
+    def _prose(self, text: str) -> Optional[str]:
+        """Returns the text outside code blocks, or None if it is too short to matter."""
+        prose = re.sub(r"```.*?(?:```|$)", " ", text or "", flags=re.DOTALL)
+        if prose.strip().upper() == "TERMINATE" or len(prose.split()) < self.min_words:
+            return None
+        return prose
+
+    def may_contain_task(self, text: str) -> bool:
+        prose = self._prose(text)
+        return prose is not None and self.task_pattern.search(prose) is not None
+
+    def may_contain_information(self, text: str) -> bool:
+        prose = self._prose(text)
+        return prose is not None and self.information_pattern.search(prose) is not None
+
+
+class SklearnPreClassifier(MemoPreClassifier):
+    """
+    A pre-classifier learned from logged TextAnalyzerAgent decisions (see MemoDecisionLog).
+
+    Each decision gets a TF-IDF and logistic regression model. A round is skipped only
+    when the model gives it a probability below `min_probability`; a decision without
+    a model (no training data of both kinds yet) is always left to the LLM. Requires
+    scikit-learn.
+    """
+
+    def __init__(self, min_probability: float = 0.2):
+        """
+        Args:
+            min_probability (float): The probability of a task (or of information) below which the round is skipped.
+        """
+        if make_pipeline is None:
+            raise ImportError("SklearnPreClassifier requires scikit-learn: pip install scikit-learn")
+        self.min_probability = min_probability
+        self.models = {}
+
+    @classmethod
+    def from_decision_log(cls, log: "MemoDecisionLog", **kwargs) -> "SklearnPreClassifier":
+        """Returns a pre-classifier trained on the decisions in `log`."""
+        classifier = cls(**kwargs)
+        classifier.fit(log.load())
+        return classifier
+
+    def fit(self, decisions: List[Dict[str, Any]]) -> "SklearnPreClassifier":
+        """
+        Trains the models.
+
+        Args:
+            decisions (List[Dict[str, Any]]): Records with a "text" and the "is_task" and
+                "has_information" decisions, either of which may be missing or None.
+
+        Returns:
+            SklearnPreClassifier: self.
+        """
+        self.models = {}
+        for flag in _ANALYSIS_FLAGS:
+            labelled = [(record["text"], bool(record[flag])) for record in decisions if record.get(flag) is not None]
+            if len({label for _, label in labelled}) < 2:
+                continue
+            texts, labels = zip(*labelled)
+            model = make_pipeline(TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True),
+                                  LogisticRegression(class_weight="balanced", max_iter=1000))
+            self.models[flag] = model.fit(list(texts), list(labels))
+        return self
+
+    def _probability(self, flag: str, text: str) -> float:
+        model = self.models.get(flag)
+        if model is None:
+            return 1.0
+        return float(model.predict_proba([text])[0][list(model.classes_).index(True)])
+
+    def may_contain_task(self, text: str) -> bool:
+        return self._probability("is_task", text) >= self.min_probability
+
+    def may_contain_information(self, text: str) -> bool:
+        return self._probability("has_information", text) >= self.min_probability
+
+
+class MemoDecisionLog:
+    """
+    An append-only JSON lines log of the decisions TextAnalyzerAgent made about messages,
+    used as training data for a SklearnPreClassifier.
+
+    Recording stops once the file reaches `max_bytes`. Writers of one file must share a
+    log, which `get_memo_decision_log` hands out, so that its lock orders their appends.
+    """
+
+    def __init__(self, path: str, max_bytes: int = MAX_DECISION_LOG_BYTES):
+        """
+        Args:
+            path (str): The path to the log file.
+            max_bytes (int): The size past which no more decisions are recorded.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None  # read from disk on the first record
+        self._lock = threading.Lock()
+
+    def record(self, text: str, is_task: Optional[bool] = None, has_information: Optional[bool] = None):
+        """
+        Appends the decisions about one message. Nothing is written if neither was made.
+
+        Args:
+            text (str): The message.
+            is_task (Optional[bool]): Whether the message asks for a task, if the LLM decided it.
+            has_information (Optional[bool]): Whether the message holds information to remember, if the LLM decided it.
+        """
+        if is_task is None and has_information is None:
+            return
+        line = json.dumps({"text": text, "is_task": is_task, "has_information": has_information}, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._size is None:
+                self._size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if self._size >= self.max_bytes:
+                return
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._size += len(line.encode("utf-8"))
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Returns the logged decisions, skipping a line cut short by a crash."""
+        records = []
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
+
+
+_decision_logs: PathRegistry[MemoDecisionLog] = PathRegistry(MemoDecisionLog)
+
+
+def get_memo_decision_log(path: str, **kwargs) -> MemoDecisionLog:
+    """
+    Returns the process-wide decision log stored at `path`, creating it with `kwargs` on first use,
+    so the teachable agents sharing a DB directory share its lock and size count.
+
+    Args:
+        path (str): The path to the log file.
+        **kwargs: MemoDecisionLog arguments, used only when the log is created.
+
+    Returns:
+        MemoDecisionLog: The log.
+    """
+    return _decision_logs.get(path, **kwargs)
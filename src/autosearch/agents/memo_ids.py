@@ -0,0 +1,85 @@
+import os
+import sqlite3
+
+from autosearch.database.connection_pool import ConnectionPool
+from autosearch.path_registry import PathRegistry
+
+
+class MemoIdSequence:
+    """
+    Allocates memo ids from a counter stored in a SQLite file next to the memo DB.
+
+    Every reservation is a single transaction that advances the counter, so ids are
+    unique and increasing across threads and processes sharing the DB, and a batch
+    of memos costs one reservation however large it is. Ids are never reused, even
+    after the DB is reset.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path (str): The path to the SQLite file holding the counter.
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.pool = ConnectionPool(db_path)
+        self.pool.execute_write(self._create_table)
+
+    @staticmethod
+    def _create_table(conn: sqlite3.Connection):
+        conn.execute("CREATE TABLE IF NOT EXISTS memo_id_sequence (id INTEGER PRIMARY KEY CHECK (id = 0), value INTEGER NOT NULL)")
+        conn.execute("INSERT OR IGNORE INTO memo_id_sequence (id, value) VALUES (0, 0)")
+
+    def reserve(self, n: int = 1) -> range:
+        """
+        Reserves `n` consecutive ids.
+
+        Args:
+            n (int): The number of ids.
+
+        Returns:
+            range: The reserved ids.
+        """
+        def write(conn: sqlite3.Connection) -> int:
+            # The UPDATE takes the database's write lock, so no other process can reserve in between.
+            conn.execute("UPDATE memo_id_sequence SET value = value + ? WHERE id = 0", (n,))
+            return conn.execute("SELECT value FROM memo_id_sequence WHERE id = 0").fetchone()[0]
+
+        last = self.pool.execute_write(write)
+        return range(last - n + 1, last + 1)
+
+    def current(self) -> int:
+        """Returns the last id reserved so far, or 0 if none was."""
+        return self.pool.connection().execute("SELECT value FROM memo_id_sequence WHERE id = 0").fetchone()[0]
+
+    def advance_to(self, value: int):
+        """Makes sure later reservations start after `value`, e.g. for ids assigned before the counter existed."""
+        self.pool.execute_write(
+            lambda conn: conn.execute("UPDATE memo_id_sequence SET value = MAX(value, ?) WHERE id = 0", (value,)))
+
+    def close(self):
+        self.pool.close()
+
+
+_sequences: PathRegistry[MemoIdSequence] = PathRegistry(MemoIdSequence)
+
+
+def get_memo_id_sequence(db_path: str) -> MemoIdSequence:
+    """
+    Returns the process-wide id sequence stored at `db_path`, so the MemoStores of a DB
+    share one connection pool and its writer thread.
+
+    Args:
+        db_path (str): The path to the SQLite file holding the counter. Different spellings of the same path share a sequence.
+
+    Returns:
+        MemoIdSequence: The sequence.
+    """
+    return _sequences.get(db_path)
+
+
+def close_memo_id_sequence(db_path: str):
+    """Closes the id sequence stored at `db_path` and removes it from the registry."""
+    sequence = _sequences.pop(db_path)
+    if sequence is not None:
+        sequence.close()
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, Tuple
+
+from autosearch.path_registry import PathRegistry
+
+
+class MemoJournal:
+    """
+    An append-only record on disk of the memos in a MemoStore.
+
+    Each memo is one JSON line holding its id, input text and output text, so adding
+    memos appends only the new lines instead of rewriting every memo. When an id
+    appears more than once, its last line wins. `rewrite` compacts the journal to
+    exactly the given memos. A line cut short by a crash is skipped when loading.
+
+    Writers of one file must share a journal, which `get_memo_journal` hands out, so
+    that its lock keeps an append from landing in a journal being rewritten.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The path to the journal file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def append(self, memos: Iterable[Tuple[str, str, str]]):
+        """
+        Appends memos to the journal in a single write.
+
+        Args:
+            memos (Iterable[Tuple[str, str, str]]): (id, input text, output text) triples.
+        """
+        lines = "".join(self._line(uid, input_text, output_text) for uid, input_text, output_text in memos)
+        if not lines:
+            return
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def load(self) -> Dict[str, Tuple[str, str]]:
+        """
+        Reads the memos in the journal.
+
+        Returns:
+            Dict[str, Tuple[str, str]]: The input and output text of each memo, keyed by id.
+        """
+        memos = {}
+        if not self.exists():
+            return memos
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # A torn final line from an interrupted append.
+                memos[record["id"]] = record["input"], record["output"]
+        return memos
+
+    def rewrite(self, uid_text_dict: Dict[str, Tuple[str, str]]):
+        """
+        Replaces the journal with exactly the given memos, atomically.
+
+        Args:
+            uid_text_dict (Dict[str, Tuple[str, str]]): The input and output text of each memo, keyed by id.
+        """
+        directory, name = os.path.split(os.path.abspath(self.path))
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.writelines(self._line(uid, input_text, output_text)
+                                 for uid, (input_text, output_text) in uid_text_dict.items())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    @staticmethod
+    def _line(uid: str, input_text: str, output_text: str) -> str:
+        return json.dumps({"id": uid, "input": input_text, "output": output_text}, ensure_ascii=False) + "\n"
+
+
+_journals: PathRegistry[MemoJournal] = PathRegistry(MemoJournal)
+
+
+def get_memo_journal(path: str) -> MemoJournal:
+    """
+    Returns the process-wide journal stored at `path`, so every MemoStore writing a file shares its lock.
+
+    Args:
+        path (str): The path to the journal file. Different spellings of the same path share a journal.
+
+    Returns:
+        MemoJournal: The journal.
+    """
+    return _journals.get(path)
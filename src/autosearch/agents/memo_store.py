@@ -0,0 +1,329 @@
+import os
+import pickle
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    from autogen.formatting_utils import colored
+except ImportError:  # autogen is not installed
+    def colored(text, *args, **kwargs):
+        return text
+
+from autosearch.agents.chroma_registry import ChromaStore, get_chroma_store
+from autosearch.agents.memo_ids import get_memo_id_sequence
+from autosearch.agents.memo_journal import get_memo_journal
+
+# Number of memo texts embedded per call to the embedding function in MemoStore.add_many.
+EMBEDDING_BATCH_SIZE = 256
+
+
+class MemoStore:
+    """
+    Provides memory storage and retrieval for a teachable agent, using a vector database.
+    Each DB entry (called a memo) is a pair of strings: an input text and an output text.
+    The input text might be a question, or a task to perform.
+    The output text might be an answer to the question, or advice on how to perform the task.
+    Vector embeddings are currently supplied by Chroma's default Sentence Transformers.
+    The memo texts are also kept in an append-only journal next to the DB.
+    """
+
+    def __init__(self, verbosity, reset, path_to_db_dir):
+        """
+        Args:
+            - verbosity (Optional, int): 1 to print memory operations, 0 to omit them. 3+ to print memo lists.
+            - path_to_db_dir (Optional, str): path to the directory where the DB is stored.
+        """
+        self.verbosity = verbosity
+        self.path_to_db_dir = path_to_db_dir
+
+        # Load or create the vector DB on disk. The client, the embedding function and the
+        # collection are shared by every MemoStore on this directory in the process.
+        self.chroma: ChromaStore = get_chroma_store(path_to_db_dir)
+
+        # Load or create the associated memo journal on disk.
+        self.path_to_dict = os.path.join(path_to_db_dir, "uid_text_journal.jsonl")
+        self.journal = get_memo_journal(self.path_to_dict)
+        self.uid_text_dict = {}
+        self._has_memos = False
+
+        # Memo ids come from a counter shared by every thread and process using this DB.
+        self.id_sequence = get_memo_id_sequence(os.path.join(path_to_db_dir, "memo_ids.db"))
+        self.last_memo_id = self.id_sequence.current()
+        if self.last_memo_id == 0 and self.has_memos():
+            # The DB predates the counter: continue after its highest id.
+            self.last_memo_id = self._max_memo_id(self.vec_db.get(include=[])["ids"])
+            self.id_sequence.advance_to(self.last_memo_id)
+
+        legacy_dict = os.path.join(path_to_db_dir, "uid_text_dict.pkl")  # written by earlier versions
+        if (not reset) and (self.journal.exists() or os.path.exists(legacy_dict)):
+            if self.journal.exists():
+                # Memos added since by other processes are reconciled when a query returns them.
+                self.uid_text_dict = self.journal.load()
+            else:
+                self._migrate_legacy_dict(legacy_dict)
+            print(colored(f"    Location = {self.path_to_dict}", "light_green"))
+            if self.verbosity >= 3:
+                self.list_memos()
+
+        # Clear the DB if requested.
+        if reset:
+            self.reset_db()
+
+    @property
+    def db_client(self):
+        return self.chroma.client
+
+    @property
+    def embedding_function(self):
+        # Memos are embedded here, in batches, so the collection gets the same function for its queries.
+        return self.chroma.embedding_function
+
+    @property
+    def vec_db(self):
+        """The memos collection, which is the DB. Looked up on each use, as another store may have reset it."""
+        return self.chroma.collection("memos")
+
+    def sync_momes(self):
+        if self.verbosity >= 1:
+            print(colored("********************************", "light_cyan"))
+            print(colored("* SYNC DISK MEMORY with VEC_DB *", "light_cyan"))
+            print(colored("********************************", "light_cyan"))
+        memo = self.vec_db.get()
+        for i in range(len(memo["ids"])):
+            uid, input_text, output_text = memo["ids"][i], memo["documents"][i], memo["metadatas"][i]["answer"]
+            self.uid_text_dict[uid] = input_text, output_text
+
+        self.last_memo_id = max(self.last_memo_id, self._max_memo_id(memo["ids"]))
+        self.id_sequence.advance_to(self.last_memo_id)
+        self._save_memos()
+
+    def _migrate_legacy_dict(self, legacy_dict):
+        """Builds the journal, once, from the pickled memo dict of earlier versions and the vector DB."""
+        with open(legacy_dict, "rb") as f:
+            self.uid_text_dict = pickle.load(f)
+        self.sync_momes()
+
+    @staticmethod
+    def _max_memo_id(ids):
+        return max((int(uid) for uid in ids if uid.isdigit()), default=0)
+
+    def get_last_memo_id(self):
+        """Returns the highest memo id allocated so far by any user of the DB, or 0 if there is none."""
+        if self.last_memo_id == 0:
+            # Ids only grow, so once one is known it never needs checking again; memos this
+            # store has not seen yet are synced when a query returns them.
+            self.last_memo_id = self.id_sequence.current()
+        return self.last_memo_id
+
+    def count(self):
+        """Returns the number of memos in the vector DB, including those added by other stores."""
+        return self.vec_db.count()
+
+    def has_memos(self):
+        """
+        Returns whether the vector DB holds any memo, including those added by other stores.
+
+        The collection is only counted until a memo is found: memos are not deleted one by one,
+        so the answer then stays true until the DB is reset.
+        """
+        if not self._has_memos:
+            self._has_memos = self.vec_db.count() > 0
+        return self._has_memos
+
+    def list_memos(self):
+        """Prints the contents of MemoStore."""
+        print(colored("LIST OF MEMOS", "light_green"))
+        for uid, text in self.uid_text_dict.items():
+            input_text, output_text = text
+            print(
+                colored(
+                    f"  ID: {uid}\n    INPUT TEXT: {input_text}\n    OUTPUT TEXT: {output_text}",
+                    "light_green",
+                )
+            )
+
+    def _save_memos(self):
+        """Rewrites the journal on disk to hold exactly the memos in self.uid_text_dict."""
+        self.journal.rewrite(self.uid_text_dict)
+
+    def reset_db(self):
+        """Forces immediate deletion of the DB's contents, in memory and on disk."""
+        print(colored("\nCLEARING MEMORY", "light_green"))
+        self.chroma.reset_collection("memos")
+        self.uid_text_dict = {}
+        self._has_memos = False
+        self._save_memos()
+
+    def add_input_output_pair(self, input_text, output_text):
+        """Adds an input-output pair to the vector DB."""
+        self.add_many([(input_text, output_text)])
+
+    def add_many(self, pairs: Iterable[Tuple[str, str]], batch_size: int = EMBEDDING_BATCH_SIZE) -> List[str]:
+        """
+        Adds many input-output pairs to the vector DB at once.
+
+        The input texts are embedded `batch_size` at a time, the memos are written to the
+        vector DB in one call (split only where Chroma's maximum batch size requires it),
+        and appended to the journal on disk in one write.
+
+        Args:
+            pairs (Iterable[Tuple[str, str]]): The (input text, output text) pairs.
+            batch_size (int): The number of texts embedded per call to the embedding function.
+
+        Returns:
+            List[str]: The ids of the new memos.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        reserved = self.id_sequence.reserve(len(pairs))
+        ids = [str(uid) for uid in reserved]
+        documents = [input_text for input_text, _ in pairs]
+        metadatas = [{"answer": output_text} for _, output_text in pairs]
+
+        embeddings = []
+        for start in range(0, len(documents), batch_size):
+            embeddings.extend(self.embedding_function(documents[start:start + batch_size]))
+
+        max_write = self._max_write_batch_size() or len(ids)
+        for start in range(0, len(ids), max_write):
+            end = start + max_write
+            self.vec_db.add(
+                ids=ids[start:end], documents=documents[start:end],
+                embeddings=embeddings[start:end], metadatas=metadatas[start:end],
+            )
+
+        new_memos = list(zip(ids, documents, (output_text for _, output_text in pairs)))
+        for uid, input_text, output_text in new_memos:
+            self.uid_text_dict[uid] = input_text, output_text
+        self.journal.append(new_memos)
+        self._has_memos = True
+        self.last_memo_id = max(self.last_memo_id, reserved[-1])
+
+        if self.verbosity >= 1:
+            for uid, input_text, output_text in new_memos:
+                print(
+                    colored(
+                        f"\nINPUT-OUTPUT PAIR ADDED TO VECTOR DATABASE:\n  ID\n    {uid}\n  INPUT\n    {input_text}\n  OUTPUT\n    {output_text}\n",
+                        "light_yellow",
+                    )
+                )
+        if self.verbosity >= 3:
+            self.list_memos()
+        return ids
+
+    def _max_write_batch_size(self) -> Optional[int]:
+        """Returns the largest number of records Chroma accepts in one add, if it reports one."""
+        get_max_batch_size = getattr(self.db_client, "get_max_batch_size", None)
+        if get_max_batch_size is not None:
+            return get_max_batch_size()
+        return getattr(self.db_client, "max_batch_size", None)
+
+    def _reconcile(self, uid, input_text, output_text):
+        """Brings uid_text_dict up to date with one memo returned by the vector DB, e.g. a memo added by another process."""
+        self.uid_text_dict[uid] = input_text, output_text
+
+    def get_nearest_memo(self, query_text):
+        """Retrieves the nearest memo to the given query text."""
+        results = self.vec_db.query(query_texts=[query_text], n_results=1)
+        uid, input_text, distance, output_text = results["ids"][0][0], results["documents"][0][0], results["distances"][0][0], results["metadatas"][0][0]["answer"]
+        self._reconcile(uid, input_text, output_text)
+        if self.verbosity >= 1:
+            print(
+                colored(
+                    f"\nINPUT-OUTPUT PAIR RETRIEVED FROM VECTOR DATABASE:\n  INPUT1\n    {input_text}\n  OUTPUT\n    {output_text}\n  DISTANCE\n    {distance}",
+                    "light_yellow",
+                )
+            )
+        return input_text, output_text, distance
+
+    def get_related_memos(self, query_text, n_results, threshold):
+        """Retrieves memos that are related to the given query text within the specified distance threshold."""
+        return self.get_related_memos_many([query_text], n_results, threshold)[0]
+
+    def get_related_memos_many(self, query_texts, n_results, threshold):
+        """
+        Retrieves the memos related to each of the query texts within the specified distance threshold, in one query.
+
+        Memos the local dict does not know yet, or knows differently, are reconciled one by one
+        from the query results instead of resynchronizing the whole collection.
+
+        Args:
+            query_texts (List[str]): The query texts.
+            n_results (int): The maximum number of memos per query text.
+            threshold (float): The maximum distance of a related memo.
+
+        Returns:
+            List[List[Tuple[str, str, float]]]: For each query text, the input text, output text and distance of its memos.
+        """
+        query_texts = list(query_texts)
+        # Chroma returns fewer results when the collection holds fewer than n_results memos.
+        if n_results <= 0 or not query_texts or not self.has_memos():
+            return [[] for _ in query_texts]
+        results = self.vec_db.query(query_texts=query_texts, n_results=n_results)
+        related = []
+        for ids, documents, distances, metadatas in zip(results["ids"], results["documents"], results["distances"], results["metadatas"]):
+            memos = []
+            for uid, input_text, distance, metadata in zip(ids, documents, distances, metadatas):
+                if distance >= threshold:
+                    continue
+                output_text = metadata["answer"]
+                self._reconcile(uid, input_text, output_text)
+
+                if self.verbosity >= 1:
+                    print(
+                        colored(
+                            f"\nINPUT-OUTPUT PAIR RETRIEVED FROM VECTOR DATABASE:\n  INPUT1\n    {input_text}\n  OUTPUT\n    {output_text}\n  DISTANCE\n    {distance}",
+                            "light_yellow",
+                        )
+                    )
+                memos.append((input_text, output_text, distance))
+            related.append(memos)
+        return related
+
+    def prepopulate(self):
+        """Adds a few arbitrary examples to the vector DB, just to make retrieval less trivial."""
+        if self.verbosity >= 1:
+            print(colored("\nPREPOPULATING MEMORY", "light_green"))
+        examples = [
+            {
+                "text": "When I say papers I mean research papers, which are typically pdfs.",
+                "label": "yes",
+            },
+            {
+                "text": "Please verify that each paper you listed actually uses langchain.",
+                "label": "no",
+            },
+            {
+                "text": "Tell gpt the output should still be latex code.",
+                "label": "no",
+            },
+            {
+                "text": "Hint: convert pdfs to text and then answer questions based on them.",
+                "label": "yes",
+            },
+            {
+                "text": "To create a good PPT, include enough content to make it interesting.",
+                "label": "yes",
+            },
+            {
+                "text": "No, for this case the columns should be aspects and the rows should be frameworks.",
+                "label": "no",
+            },
+            {
+                "text": "When writing code, remember to include any libraries that are used.",
+                "label": "yes",
+            },
+            {
+                "text": "Please summarize the papers by Eric Horvitz on bounded rationality.",
+                "label": "no",
+            },
+            {
+                "text": "Compare the h-index of Daniel Weld and Oren Etzioni.",
+                "label": "no",
+            },
+            {
+                "text": "Double check to be sure that the columns in a table correspond to what was asked for.",
+                "label": "yes",
+            },
+        ]
+        self.add_many((example["text"], example["label"]) for example in examples)
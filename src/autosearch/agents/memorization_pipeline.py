@@ -0,0 +1,250 @@
+import queue
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain.schema import Document
+
+from autosearch.data.paper import Paper
+from autosearch.path_registry import PathRegistry
+from autosearch.stage_timings import StageTimings
+
+# Defaults of MemorizationPipeline.
+MEMORIZE_WORKERS = 4
+QUEUE_SIZE = 8
+INSERT_BATCH_SIZE = 64
+MIN_CHUNK_WORDS = 30
+
+_DONE = object()
+
+
+def memorize_message(text: str, paper: Paper) -> str:
+    """Returns the message asking a teachable agent to memorize a passage of `paper`."""
+    title = f"{paper.title} [{paper.url}] updated on {paper.last_updated_date or ''}"
+    return f"MEMORIZE_ARTICLE: The following passage is extracted from an article titled '{title}': \n\n {text}."
+
+
+class MemorizationPipeline:
+    """
+    Memorizes the chunks of papers in four pipelined stages, each fed by a bounded queue:
+
+    - chunking: the paper is analyzed and split into chunks;
+    - filtering: the reference section and chunks of `min_chunk_words` words or fewer are dropped;
+    - memorization: `memorize_workers` teachable agents read the chunks and extract memos;
+    - insertion: the memos of all agents are added to the vector DB in batches.
+
+    The teachable agents are built one at a time, kept in a pool and reused for later
+    chunks and papers, so the vector DB is opened once per agent rather than once per
+    chunk. Their memos go to the insertion stage instead of each agent writing its own,
+    and a single MemoStore writes them in batches of up to `insert_batch_size`.
+    """
+
+    def __init__(self, db_dir: str, config_list: List[Dict[str, Any]], memorize_workers: int = MEMORIZE_WORKERS,
+                 queue_size: int = QUEUE_SIZE, insert_batch_size: int = INSERT_BATCH_SIZE,
+                 min_chunk_words: int = MIN_CHUNK_WORDS,
+                 agent_factory: Optional[Callable[[Callable[[List[Tuple[str, str]]], None]], Tuple[Any, Any]]] = None,
+                 store_factory: Optional[Callable[[], Any]] = None):
+        """
+        Initialize the MemorizationPipeline.
+
+        Args:
+            db_dir (str): The directory of the memo DB.
+            config_list (List[Dict[str, Any]]): The LLM configurations of the teachable agents.
+            memorize_workers (int): The number of teachable agents memorizing chunks at once.
+            queue_size (int): The capacity of the queue in front of each stage.
+            insert_batch_size (int): The maximum number of memos added to the vector DB at once.
+            min_chunk_words (int): Chunks with this many words or fewer are not memorized.
+            agent_factory (Optional[Callable]): Builds an (assistant, user) teachable agent pair that passes its new
+                memos to the given sink. Defaults to create_teachable_groupchat.
+            store_factory (Optional[Callable[[], Any]]): Builds the MemoStore the memos are added to.
+        """
+        self.db_dir = db_dir
+        self.config_list = config_list
+        self.memorize_workers = memorize_workers
+        self.queue_size = queue_size
+        self.insert_batch_size = insert_batch_size
+        self.min_chunk_words = min_chunk_words
+        self.agent_factory = agent_factory or self._create_agents
+        self.store_factory = store_factory or self._create_store
+
+        self._idle_agents: "queue.SimpleQueue[Tuple[Any, Any, Dict[str, queue.Queue]]]" = queue.SimpleQueue()
+        self._build_lock = threading.Lock()
+        self._store = None
+        self._store_lock = threading.Lock()
+
+    def _create_agents(self, memo_sink: Callable[[List[Tuple[str, str]]], None]) -> Tuple[Any, Any]:
+        from autosearch.functions.create_teachable_groupchat import create_teachable_groupchat
+        return create_teachable_groupchat("paper_reader", "reader_user", self.db_dir, self.config_list,
+                                          verbosity=0, memo_sink=memo_sink)
+
+    def _create_store(self):
+        from autosearch.agents.memo_store import MemoStore
+        return MemoStore(0, False, self.db_dir)
+
+    def _acquire_agents(self, memos: queue.Queue) -> Tuple[Any, Any, Dict[str, queue.Queue]]:
+        """
+        Takes an idle agent pair from the pool, or builds one, and points its memo sink at `memos`.
+
+        Pairs are built one at a time: each opens the memo DB, its journal and its caches, which
+        is not worth doing concurrently, and a worker that waited may find a pair returned meanwhile.
+        """
+        try:
+            agents = self._idle_agents.get_nowait()
+        except queue.Empty:
+            with self._build_lock:
+                try:
+                    agents = self._idle_agents.get_nowait()
+                except queue.Empty:
+                    route: Dict[str, queue.Queue] = {}
+                    assistant, user = self.agent_factory(lambda new_memos: route["memos"].put(new_memos))
+                    agents = assistant, user, route
+        agents[2]["memos"] = memos
+        return agents
+
+    def run(self, paper: Paper, chunker: Callable[[Paper], List[Document]]) -> Dict[str, Dict[str, float]]:
+        """
+        Memorizes a paper.
+
+        Args:
+            paper (Paper): The paper.
+            chunker (Callable[[Paper], List[Document]]): Splits the paper into chunks, e.g. DocumentAnalyzer.pdf2md_chunk.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The StageTimings stats of each stage (chunking, filtering,
+            memorization and insertion), including the items handled per second, and the whole
+            run as 'pipeline'.
+
+        Raises:
+            Exception: Whatever `chunker` raised. Failures to memorize or insert a chunk are printed.
+        """
+        timings = StageTimings()
+        chunks: queue.Queue = queue.Queue(self.queue_size)
+        texts: queue.Queue = queue.Queue(self.queue_size)
+        memos: queue.Queue = queue.Queue(self.queue_size)
+        errors: List[BaseException] = []
+
+        stages = [("chunking", self._chunk, (paper, chunker, chunks, timings, errors)),
+                  ("filtering", self._filter, (chunks, texts, timings))]
+        stages += [(f"memorization-{i}", self._memorize, (paper, texts, memos, timings)) for i in range(self.memorize_workers)]
+        stages.append(("insertion", self._insert, (memos, timings)))
+        threads = [threading.Thread(target=target, args=args, name=f"memorize-{name}", daemon=True)
+                   for name, target, args in stages]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        memorized = timings.stats().get("memorization", {}).get("items", 0)
+        timings.record("pipeline", time.perf_counter() - start, memorized)
+        if errors:
+            raise errors[0]
+        return timings.stats()
+
+    def _chunk(self, paper: Paper, chunker: Callable[[Paper], List[Document]], chunks: queue.Queue,
+               timings: StageTimings, errors: List[BaseException]):
+        try:
+            start = time.perf_counter()
+            documents = chunker(paper)
+            timings.record("chunking", time.perf_counter() - start, len(documents))
+            for i, document in enumerate(documents):
+                chunks.put((i, len(documents), document))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            chunks.put(_DONE)
+
+    def _filter(self, chunks: queue.Queue, texts: queue.Queue, timings: StageTimings):
+        in_references = False
+        try:
+            while True:
+                item = chunks.get()
+                if item is _DONE:
+                    break
+                i, total, document = item
+                with timings.time("filtering"):
+                    text = document.page_content or ""
+                    # The first chunk in the second half that mentions REFERENCE(S) starts the reference
+                    # section; it and everything after it are dropped.
+                    if not in_references and i >= total // 2 and re.search(r'\bREFERENCES?\b', text.upper()):
+                        in_references = True
+                    keep = not in_references and len(text.split()) > self.min_chunk_words
+                if keep:
+                    texts.put(text)
+        finally:
+            for _ in range(self.memorize_workers):
+                texts.put(_DONE)
+
+    def _memorize(self, paper: Paper, texts: queue.Queue, memos: queue.Queue, timings: StageTimings):
+        agents = None
+        try:
+            while True:
+                text = texts.get()
+                if text is _DONE:
+                    break
+                with timings.time("memorization"):
+                    try:
+                        if agents is None:
+                            agents = self._acquire_agents(memos)
+                        paper_reader, reader_user, _ = agents
+                        reader_user.initiate_chat(paper_reader, silent=True, message=memorize_message(text, paper))
+                    except Exception as e:
+                        print(f"Error: {e}")
+                        print(f"text: {text}")
+        finally:
+            if agents is not None:
+                self._idle_agents.put(agents)
+            memos.put(_DONE)
+
+    def _insert(self, memos: queue.Queue, timings: StageTimings):
+        finished = 0
+        while finished < self.memorize_workers:
+            batch = []
+            item = memos.get()
+            while True:
+                if item is _DONE:
+                    finished += 1
+                else:
+                    batch.extend(item)
+                # Take whatever else is already waiting, up to the batch size.
+                if len(batch) >= self.insert_batch_size:
+                    break
+                try:
+                    item = memos.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                with timings.time("insertion", len(batch)):
+                    try:
+                        with self._store_lock:
+                            if self._store is None:
+                                self._store = self.store_factory()
+                            self._store.add_many(batch)
+                    except Exception as e:
+                        print(f"Error adding {len(batch)} memos to the vector DB: {e}")
+
+
+_pipelines: PathRegistry[MemorizationPipeline] = PathRegistry(MemorizationPipeline)
+
+
+def get_memorization_pipeline(db_dir: str, config_list: List[Dict[str, Any]], **kwargs) -> MemorizationPipeline:
+    """
+    Returns the process-wide pipeline of a memo DB, creating it with `kwargs` on first use, so its
+    pooled teachable agents are reused by every paper memorized into that DB.
+
+    Args:
+        db_dir (str): The directory of the memo DB.
+        config_list (List[Dict[str, Any]]): The LLM configurations of the teachable agents.
+        **kwargs: MemorizationPipeline arguments, used only when the pipeline is created.
+
+    Returns:
+        MemorizationPipeline: The pipeline.
+
+    Raises:
+        ValueError: If the pipeline of the DB was created with a different `config_list`, as its
+            pooled agents would otherwise answer with another model or key than the caller's.
+    """
+    pipeline = _pipelines.get(db_dir, config_list, **kwargs)
+    if pipeline.config_list != config_list:
+        raise ValueError(f"The memorization pipeline of {db_dir} was created with a different config_list")
+    return pipeline
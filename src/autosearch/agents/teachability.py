@@ -1,13 +1,19 @@
 import os
-from typing import Dict, Optional, Union
-import chromadb
-from chromadb.config import Settings
-import pickle
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from autogen.agentchat.assistant_agent import ConversableAgent
 from autogen.agentchat.contrib.capabilities.agent_capability import AgentCapability
 from autogen.agentchat.contrib.text_analyzer_agent import TextAnalyzerAgent
 # from ....formatting_utils import colored
 from autogen.formatting_utils import colored
+from autogen import runtime_logging
+
+from autosearch.agents.analyzer_cache import get_analyzer_cache
+
+from autosearch.agents.memo_classifier import (
+    STRUCTURED_ANALYSIS_INSTRUCTIONS, MemoPreClassifier, get_memo_decision_log, parse_structured_analysis
+)
+from autosearch.agents.memo_store import MemoStore
+from autosearch.stage_timings import StageTimings
 
 
 class Teachability(AgentCapability):
@@ -36,6 +42,11 @@ class Teachability(AgentCapability):
         max_num_retrievals: Optional[int] = 10,
         llm_config: Optional[Union[Dict, bool]] = None,
         learnable: bool = True,
+        pre_classifier: Optional[MemoPreClassifier] = None,
+        structured_analysis: bool = False,
+        log_decisions: bool = False,
+        cache_analysis: bool = True,
+        memo_sink: Optional[Callable[[List[Tuple[str, str]]], None]] = None,
     ):
         """
         Args:
@@ -46,6 +57,18 @@ class Teachability(AgentCapability):
             max_num_retrievals (Optional, int): The maximum number of memos to retrieve from the DB. Default 10.
             llm_config (dict or False): llm inference configuration passed to TextAnalyzerAgent.
             If None, TextAnalyzerAgent uses llm_config from the teachable agent.
+            learnable (bool): False to only recall memos, never store new ones. Default True.
+            pre_classifier (Optional, MemoPreClassifier): decides locally which analysis rounds a message needs, e.g. a
+            KeywordPreClassifier. Default None, which asks TextAnalyzerAgent about every message.
+            structured_analysis (bool): True to get every decision and extraction from TextAnalyzerAgent in a single
+            JSON reply instead of one call each. Default False.
+            log_decisions (bool): True to log the task and information decisions of TextAnalyzerAgent to
+            memo_decisions.jsonl in the DB directory, as training data for a SklearnPreClassifier. Every logged message is
+            kept in full, up to MAX_DECISION_LOG_BYTES. Default False.
+            cache_analysis (bool): True to reuse TextAnalyzerAgent responses to the same text, instruction and model,
+            cached in analyzer_cache.db in the DB directory. Default True.
+            memo_sink (Optional, Callable): receives the new memos of each message instead of them being added to the
+            DB here, e.g. to batch the vector DB writes of many agents. Default None.
         """
         self.verbosity = verbosity if verbosity is not None else 0
         self.path_to_db_dir = path_to_db_dir
@@ -53,12 +76,19 @@ class Teachability(AgentCapability):
         self.max_num_retrievals = max_num_retrievals
         self.llm_config = llm_config
         self.learnable = learnable
+        self.pre_classifier = pre_classifier
+        self.structured_analysis = structured_analysis
+        self.memo_sink = memo_sink
 
         self.analyzer = None
         self.teachable_agent = None
+        self.timings = StageTimings()
 
         # Create the memo store.
         self.memo_store = MemoStore(self.verbosity, reset_db, self.path_to_db_dir)
+        self.decision_log = get_memo_decision_log(os.path.join(self.path_to_db_dir, "memo_decisions.jsonl")) if log_decisions else None
+        self.analysis_cache = get_analyzer_cache(os.path.join(self.path_to_db_dir, "analyzer_cache.db")) if cache_analysis else None
+        self.analyzer_model = ""
 
     def add_to_agent(self, agent: ConversableAgent):
         """Adds teachability to the given agent."""
@@ -75,6 +105,7 @@ class Teachability(AgentCapability):
 
         # Create the analyzer agent.
         self.analyzer = TextAnalyzerAgent(llm_config=self.llm_config)
+        self.analyzer_model = self._model_name(self.llm_config)
 
         # Append extra info to the system message.
         agent.update_system_message(agent.system_message + "\nYou've been given the special ability to remember user teachings from prior conversations.")
@@ -88,128 +119,188 @@ class Teachability(AgentCapability):
         Appends any relevant memos to the message text, and stores any apparent teachings in new memos.
         Uses TextAnalyzerAgent to make decisions about memo storage and retrieval.
         """
+        with self.timings.time("message"):
+            recall = self.memo_store.has_memos()
+            # The decisions and extractions made about this message, shared by retrieval and storage.
+            analysis, local = self._pre_analyze(text) if recall or self.learnable else ({}, set())
+
+            # Try to retrieve relevant memos from the DB.
+            expanded_text = text
+            if recall:
+                expanded_text = self._consider_memo_retrieval(text, analysis)
+                if self.verbosity >= 1:
+                    print(colored(f"\nexpanded_text: {expanded_text}", "magenta"))
 
-        # Try to retrieve relevant memos from the DB.
-        expanded_text = text
-        if self.memo_store.get_last_memo_id() > 0:
-            expanded_text = self._consider_memo_retrieval(text)
-            if self.verbosity >= 1:
-                print(colored(f"\nexpanded_text: {expanded_text}", "magenta"))
+            # Try to store any user teachings in new memos to be used in the future.
+            if self.learnable:
+                self._consider_memo_storage(text, analysis)
 
-        # Try to store any user teachings in new memos to be used in the future.
-        if self.learnable:
-            self._consider_memo_storage(text)
+            if self.decision_log is not None:
+                self.decision_log.record(
+                    text, **{flag: analysis.get(flag) for flag in ("is_task", "has_information") if flag not in local})
 
         # Return the (possibly) expanded message text.
         return expanded_text
 
-    def _consider_memo_storage(self, comment):
-        """Decides whether to store something from one user comment in the DB."""
-        memo_added = False
+    def latency_stats(self):
+        """
+        Returns the time spent in each stage of message handling: 'message' (the whole hook),
+        'pre_classification', 'structured_analysis', 'recall_analysis' and 'storage_analysis'
+        (the TextAnalyzerAgent calls), 'recall_query' (the vector DB query) and 'storage_write'
+        (adding new memos).
+        """
+        return self.timings.stats()
 
-        # Check for a problem-solution pair.
-        response = self._analyze(
-            comment,
-            "Does any part of the TEXT ask the agent to perform a task or solve a problem? Answer with just one word, yes or no.",
-        )
-        if "yes" in response.lower():
-            # Can we extract advice?
-            advice = self._analyze(
+    def _pre_analyze(self, text):
+        """
+        Makes the decisions about a message that need no sequential analysis rounds: the ones the
+        pre-classifier rules out locally and, in structured mode, everything else in one call.
+        Returns the analysis so far and the set of decisions made locally.
+        """
+        analysis = {}
+        if self.pre_classifier is not None:
+            with self.timings.time("pre_classification"):
+                if not self.pre_classifier.may_contain_task(text):
+                    analysis["is_task"] = False
+                if not self.pre_classifier.may_contain_information(text):
+                    analysis["has_information"] = False
+        local = set(analysis)
+        if self.structured_analysis and len(analysis) < 2:
+            with self.timings.time("structured_analysis"):
+                structured = parse_structured_analysis(self._analyze(text, STRUCTURED_ANALYSIS_INSTRUCTIONS))
+            if structured is None:
+                if self.verbosity >= 1:
+                    print(colored("\nUNPARSABLE STRUCTURED ANALYSIS, FALLING BACK TO SEPARATE CALLS", "light_yellow"))
+            else:
+                for field, value in structured.items():
+                    analysis.setdefault(field, value)
+        return analysis, local
+
+    def _is_task(self, comment, analysis):
+        """Returns whether any part of the comment asks for a task, asking TextAnalyzerAgent unless already decided."""
+        if "is_task" not in analysis:
+            response = self._analyze(
                 comment,
-                "Briefly copy any advice from the TEXT that may be useful for a similar but different task in the future. But if no advice is present, just respond with 'none'.",
+                "Does any part of the TEXT ask the agent to perform a task or solve a problem? Answer with just one word, yes or no.",
             )
-            if "none" not in advice.lower():
-                # Yes. Extract the task.
-                task = self._analyze(
+            analysis["is_task"] = "yes" in response.lower()
+        return analysis["is_task"]
+
+    def _general_task(self, comment, analysis, task_instructions):
+        """
+        Returns the task in the comment in general terms: the one from the structured analysis if there is one,
+        otherwise extracted with `task_instructions`, which differ between retrieval and storage, and generalized.
+        """
+        if analysis.get("general_task"):
+            return analysis["general_task"]
+        # Extract the task.
+        task = analysis.get("task") or self._analyze(comment, task_instructions)
+        # Generalize the task.
+        return self._analyze(
+            task,
+            "Summarize very briefly, in general terms, the type of task described in the TEXT. Leave out details that might not appear in a similar problem.",
+        )
+
+    def _consider_memo_storage(self, comment, analysis=None):
+        """Decides whether to store something from one user comment in the DB."""
+        analysis = {} if analysis is None else analysis
+        new_memos = []
+
+        with self.timings.time("storage_analysis"):
+            # Check for a problem-solution pair.
+            if self._is_task(comment, analysis):
+                # Can we extract advice?
+                advice = analysis.get("advice") or self._analyze(
                     comment,
-                    "Briefly copy just the task from the TEXT, then stop. Don't solve it, and don't include any advice.",
+                    "Briefly copy any advice from the TEXT that may be useful for a similar but different task in the future. But if no advice is present, just respond with 'none'.",
                 )
-                # Generalize the task.
-                general_task = self._analyze(
-                    task,
-                    "Summarize very briefly, in general terms, the type of task described in the TEXT. Leave out details that might not appear in a similar problem.",
+                if "none" not in advice.lower():
+                    # Yes. Extract and generalize the task.
+                    general_task = self._general_task(
+                        comment, analysis,
+                        "Briefly copy just the task from the TEXT, then stop. Don't solve it, and don't include any advice.",
+                    )
+                    # Add the task-advice (problem-solution) pair to the vector DB.
+                    if self.verbosity >= 1:
+                        print(colored("\nREMEMBER THIS TASK-ADVICE PAIR", "light_yellow"))
+                    new_memos.append((general_task, advice))
+
+            # Check for information to be learned.
+            if "has_information" not in analysis:
+                response = self._analyze(
+                    comment,
+                    "Does the TEXT contain information that could be committed to memory? Answer with just one word, yes or no.",
+                )
+                analysis["has_information"] = "yes" in response.lower()
+            if analysis["has_information"]:
+                # Yes. What question would this information answer?
+                question = analysis.get("question") or self._analyze(
+                    comment,
+                    "Imagine that the user forgot this information in the TEXT. How would they ask you for this information? Include no other text in your response.",
                 )
-                # Add the task-advice (problem-solution) pair to the vector DB.
+                # Extract the information.
+                answer = analysis.get("answer") or self._analyze(
+                    comment, "Copy the information from the TEXT that should be committed to memory. Add no explanation."
+                )
+                # Add the question-answer pair to the vector DB.
                 if self.verbosity >= 1:
-                    print(colored("\nREMEMBER THIS TASK-ADVICE PAIR", "light_yellow"))
-                self.memo_store.add_input_output_pair(general_task, advice)
-                memo_added = True
-
-        # Check for information to be learned.
-        response = self._analyze(
-            comment,
-            "Does the TEXT contain information that could be committed to memory? Answer with just one word, yes or no.",
-        )
-        if "yes" in response.lower():
-            # Yes. What question would this information answer?
-            question = self._analyze(
-                comment,
-                "Imagine that the user forgot this information in the TEXT. How would they ask you for this information? Include no other text in your response.",
-            )
-            # Extract the information.
-            answer = self._analyze(
-                comment, "Copy the information from the TEXT that should be committed to memory. Add no explanation."
-            )
-            # Add the question-answer pair to the vector DB.
-            if self.verbosity >= 1:
-                print(colored("\nREMEMBER THIS QUESTION-ANSWER PAIR", "light_yellow"))
-            self.memo_store.add_input_output_pair(question, answer)
-            memo_added = True
-
-        # Were any memos added?
-        if memo_added:
-            # Yes. Save them to disk.
-            self.memo_store._save_memos()
-
-    def _consider_memo_retrieval(self, comment):
+                    print(colored("\nREMEMBER THIS QUESTION-ANSWER PAIR", "light_yellow"))
+                new_memos.append((question, answer))
+
+        # Add the new memos to the DB, and to disk, in one batch.
+        if new_memos:
+            with self.timings.time("storage_write"):
+                if self.memo_sink is not None:
+                    self.memo_sink(new_memos)
+                else:
+                    self.memo_store.add_many(new_memos)
+
+    def _consider_memo_retrieval(self, comment, analysis=None):
         """Decides whether to retrieve memos from the DB, and add them to the chat context."""
+        analysis = {} if analysis is None else analysis
 
         # First, use the comment directly as the lookup key.
         if self.verbosity >= 1:
             print(colored("\nLOOK FOR RELEVANT MEMOS, AS QUESTION-ANSWER PAIRS", "light_yellow"))
-        memo_list = self._retrieve_relevant_memos(comment)
+        lookup_keys = [comment]
 
-        # Next, if the comment involves a task, then extract and generalize the task before using it as the lookup key.
-        response = self._analyze(
-            comment,
-            "Does any part of the TEXT ask the agent to perform a task or solve a problem? Answer with just one word, yes or no.",
-        )
-        if "yes" in response.lower():
-            if self.verbosity >= 1:
-                print(colored("\nLOOK FOR RELEVANT MEMOS, AS TASK-ADVICE PAIRS", "light_yellow"))
-            # Extract the task.
-            task = self._analyze(
-                comment, "Copy just the task from the TEXT, then stop. Don't solve it, and don't include any advice."
-            )
-            # Generalize the task.
-            general_task = self._analyze(
-                task,
-                "Summarize very briefly, in general terms, the type of task described in the TEXT. Leave out details that might not appear in a similar problem.",
-            )
-            # Append any relevant memos.
-            memo_list.extend(self._retrieve_relevant_memos(general_task))
+        # Next, if the comment involves a task, then extract and generalize the task before using it as a lookup key too.
+        with self.timings.time("recall_analysis"):
+            if self._is_task(comment, analysis):
+                if self.verbosity >= 1:
+                    print(colored("\nLOOK FOR RELEVANT MEMOS, AS TASK-ADVICE PAIRS", "light_yellow"))
+                lookup_keys.append(self._general_task(
+                    comment, analysis,
+                    "Copy just the task from the TEXT, then stop. Don't solve it, and don't include any advice.",
+                ))
+
+        # Look all the keys up in one query.
+        with self.timings.time("recall_query"):
+            memo_list = self._retrieve_relevant_memos(lookup_keys)
 
-        # De-duplicate the memo list.
-        memo_list = list(set(memo_list))
+        # De-duplicate the memo list, keeping the order of retrieval.
+        memo_list = list(dict.fromkeys(memo_list))
 
         # Append the memos to the text of the last message.
         if self.verbosity >= 1:
             print(colored(f"\nnew Message: {comment + self._concatenate_memo_texts(memo_list)}", "magenta"))
         return comment + self._concatenate_memo_texts(memo_list)
 
-    def _retrieve_relevant_memos(self, input_text):
-        """Returns semantically related memos from the DB."""
-        memo_list = self.memo_store.get_related_memos(
-            input_text, n_results=self.max_num_retrievals, threshold=self.recall_threshold
+    def _retrieve_relevant_memos(self, input_texts):
+        """Returns the memos semantically related to any of the input texts from the DB, in one query."""
+        related = self.memo_store.get_related_memos_many(
+            input_texts, n_results=self.max_num_retrievals, threshold=self.recall_threshold
         )
 
-        if self.verbosity >= 1 and len(memo_list) == 0:
-            print(colored("\nTHE CLOSEST MEMO IS BEYOND THE THRESHOLD:", "light_yellow"))
-            self.memo_store.get_nearest_memo(input_text)
-            print()  # Print a blank line. The memo details were printed by get_nearest_memo().
+        memo_list = []
+        for input_text, memos in zip(input_texts, related):
+            if self.verbosity >= 1 and len(memos) == 0:
+                print(colored("\nTHE CLOSEST MEMO IS BEYOND THE THRESHOLD:", "light_yellow"))
+                self.memo_store.get_nearest_memo(input_text)
+                print()  # Print a blank line. The memo details were printed by get_nearest_memo().
 
-        # Create a list of just the memo output_text strings.
-        memo_list = [memo[1] for memo in memo_list]
+            # Keep just the memo output_text strings.
+            memo_list.extend(memo[1] for memo in memos)
         return memo_list
 
     def _concatenate_memo_texts(self, memo_list):
@@ -224,8 +315,57 @@ class Teachability(AgentCapability):
             memo_texts = memo_texts + "\n" + info
         return memo_texts
 
+    @staticmethod
+    def _model_name(llm_config):
+        """Returns the model TextAnalyzerAgent tries first, which is part of the analysis cache key."""
+        if not isinstance(llm_config, dict):
+            return ""
+        config_list = llm_config.get("config_list") or [llm_config]
+        return str(config_list[0].get("model", ""))
+
+    def cache_stats(self):
+        """Returns the analysis cache counters, or an empty dict when caching is disabled."""
+        return self.analysis_cache.stats() if self.analysis_cache is not None else {}
+
     def _analyze(self, text_to_analyze, analysis_instructions):
-        """Asks TextAnalyzerAgent to analyze the given text according to specific instructions."""
+        """Asks TextAnalyzerAgent to analyze the given text according to specific instructions, unless the answer is cached."""
+        if self.analysis_cache is None:
+            return self._ask_analyzer(text_to_analyze, analysis_instructions)
+
+        response = self.analysis_cache.get(text_to_analyze, analysis_instructions, self.analyzer_model)
+        hit = response is not None
+        if not hit:
+            used_before = self._analyzer_usage()
+            response = self._ask_analyzer(text_to_analyze, analysis_instructions)
+            if isinstance(response, str):
+                used_after = self._analyzer_usage()
+                if used_after is not None:
+                    tokens = used_after - (used_before or 0)
+                else:
+                    tokens = self._estimate_tokens(text_to_analyze, analysis_instructions, response)
+                self.analysis_cache.put(text_to_analyze, analysis_instructions, self.analyzer_model, response, tokens)
+        if runtime_logging.logging_enabled():
+            runtime_logging.log_event(self.teachable_agent, "teachability_analysis_cache", hit=hit, **self.cache_stats())
+        return response
+
+    def _analyzer_usage(self):
+        """Returns the tokens TextAnalyzerAgent's client has reported using so far, or None if it reports no usage."""
+        try:
+            usage = self.analyzer.get_actual_usage() if self.analyzer is not None else None
+            if not usage:
+                return None
+            return sum(entry.get("total_tokens", 0) for entry in usage.values() if isinstance(entry, dict))
+        except Exception:
+            # The count only feeds the cache statistics, so it must never fail the hook.
+            return None
+
+    @staticmethod
+    def _estimate_tokens(*texts):
+        """Returns a rough token count of the texts, at about four characters per token."""
+        return sum(len(text) for text in texts) // 4
+
+    def _ask_analyzer(self, text_to_analyze, analysis_instructions):
+        """Sends the text and the instructions to TextAnalyzerAgent and returns its reply."""
         self.analyzer.reset()  # type: ignore # Clear the analyzer's list of messages.
         self.teachable_agent.send(
             recipient=self.analyzer, message=text_to_analyze, request_reply=False, silent=(self.verbosity < 2)
@@ -234,197 +374,3 @@ class Teachability(AgentCapability):
             recipient=self.analyzer, message=analysis_instructions, request_reply=True, silent=(self.verbosity < 2)
         )  # Request the reply.
         return self.teachable_agent.last_message(self.analyzer)["content"]
-
-
-class MemoStore:
-    """
-    Provides memory storage and retrieval for a teachable agent, using a vector database.
-    Each DB entry (called a memo) is a pair of strings: an input text and an output text.
-    The input text might be a question, or a task to perform.
-    The output text might be an answer to the question, or advice on how to perform the task.
-    Vector embeddings are currently supplied by Chroma's default Sentence Transformers.
-    """
-
-    def __init__(self, verbosity, reset, path_to_db_dir):
-        """
-        Args:
-            - verbosity (Optional, int): 1 to print memory operations, 0 to omit them. 3+ to print memo lists.
-            - path_to_db_dir (Optional, str): path to the directory where the DB is stored.
-        """
-        self.verbosity = verbosity
-        self.path_to_db_dir = path_to_db_dir
-
-        # Load or create the vector DB on disk.
-        settings = Settings(
-            anonymized_telemetry=False, allow_reset=True, is_persistent=True, persist_directory=path_to_db_dir
-        )
-        self.db_client = chromadb.Client(settings)
-        self.vec_db = self.db_client.create_collection("memos", get_or_create=True)  # The collection is the DB.
-
-        # Load or create the associated memo dict on disk.
-        self.path_to_dict = os.path.join(path_to_db_dir, "uid_text_dict.pkl")
-        self.uid_text_dict = {}
-        self.last_memo_id = self.vec_db.count()
-        if (not reset) and os.path.exists(self.path_to_dict):
-            # sync local menory with vec_db
-            self.sync_momes()
-            print(colored(f"    Location = {self.path_to_dict}", "light_green"))
-            if self.verbosity >= 3:
-                self.list_memos()
-
-        # Clear the DB if requested.
-        if reset:
-            self.reset_db()
-
-    def sync_momes(self):
-        if self.verbosity >= 1:
-            print(colored("********************************", "light_cyan"))
-            print(colored("* SYNC DISK MEMORY with VEC_DB *", "light_cyan"))
-            print(colored("********************************", "light_cyan"))
-        memo = self.vec_db.get()
-        for i in range(len(memo["ids"])):
-            uid, input_text, output_text = memo["ids"][i], memo["documents"][i], memo["metadatas"][i]["answer"]
-            self.uid_text_dict[uid] = input_text, output_text
-
-        self.last_memo_id = len(memo["ids"][-1])
-        self._save_memos()
-
-    def get_last_memo_id(self):
-        if self.last_memo_id != self.vec_db.count():
-            self.sync_momes()
-        return self.last_memo_id
-
-    def list_memos(self):
-        """Prints the contents of MemoStore."""
-        print(colored("LIST OF MEMOS", "light_green"))
-        for uid, text in self.uid_text_dict.items():
-            input_text, output_text = text
-            print(
-                colored(
-                    f"  ID: {uid}\n    INPUT TEXT: {input_text}\n    OUTPUT TEXT: {output_text}",
-                    "light_green",
-                )
-            )
-
-    def _save_memos(self):
-        """save memos to self.uid_text_dict to disk."""
-        with open(self.path_to_dict, "wb") as f:
-            pickle.dump(self.uid_text_dict, f)
-
-    def reset_db(self):
-        """Forces immediate deletion of the DB's contents, in memory and on disk."""
-        print(colored("\nCLEARING MEMORY", "light_green"))
-        self.db_client.delete_collection("memos")
-        self.vec_db = self.db_client.create_collection("memos")
-        self.uid_text_dict = {}
-        self._save_memos()
-
-    def add_input_output_pair(self, input_text, output_text):
-        """Adds an input-output pair to the vector DB."""
-        self.last_memo_id = self.vec_db.count() + 1
-        self.vec_db.add(documents=[input_text], ids=[str(self.last_memo_id)], metadatas=[{"answer": output_text}])
-        self.uid_text_dict[str(self.last_memo_id)] = input_text, output_text
-        if self.verbosity >= 1:
-            print(
-                colored(
-                    f"\nINPUT-OUTPUT PAIR ADDED TO VECTOR DATABASE:\n  ID\n    {self.last_memo_id}\n  INPUT\n    {input_text}\n  OUTPUT\n    {output_text}\n",
-                    "light_yellow",
-                )
-            )
-        if self.verbosity >= 3:
-            self.list_memos()
-
-    def get_nearest_memo(self, query_text):
-        """Retrieves the nearest memo to the given query text."""
-        results = self.vec_db.query(query_texts=[query_text], n_results=1)
-        uid, input_text, distance, output_text = results["ids"][0][0], results["documents"][0][0], results["distances"][0][0], results["metadatas"][0][0]["answer"]
-        try:
-            input_text_2, _ = self.uid_text_dict[uid]
-            if input_text != input_text_2:
-                self.sync_momes()
-        except KeyError:
-            self.sync_momes()
-        if self.verbosity >= 1:
-            print(
-                colored(
-                    f"\nINPUT-OUTPUT PAIR RETRIEVED FROM VECTOR DATABASE:\n  INPUT1\n    {input_text}\n  OUTPUT\n    {output_text}\n  DISTANCE\n    {distance}",
-                    "light_yellow",
-                )
-            )
-        return input_text, output_text, distance
-
-    def get_related_memos(self, query_text, n_results, threshold):
-        """Retrieves memos that are related to the given query text within the specified distance threshold."""
-        n_results = min(n_results, len(self.uid_text_dict))
-        results = self.vec_db.query(query_texts=[query_text], n_results=n_results)
-        memos = []
-        num_results = len(results["ids"][0])
-        for i in range(num_results):
-            uid, input_text, distance, output_text = results["ids"][0][i], results["documents"][0][i], results["distances"][0][i], results["metadatas"][0][i]["answer"]
-            if distance < threshold:
-                try:
-                    input_text_2, _ = self.uid_text_dict[uid]
-                    if input_text != input_text_2:
-                        self.sync_momes()
-                except KeyError:
-                    self.sync_momes()
-
-                if self.verbosity >= 1:
-                    print(
-                        colored(
-                            f"\nINPUT-OUTPUT PAIR RETRIEVED FROM VECTOR DATABASE:\n  INPUT1\n    {input_text}\n  OUTPUT\n    {output_text}\n  DISTANCE\n    {distance}",
-                            "light_yellow",
-                        )
-                    )
-                memos.append((input_text, output_text, distance))
-        return memos
-
-    def prepopulate(self):
-        """Adds a few arbitrary examples to the vector DB, just to make retrieval less trivial."""
-        if self.verbosity >= 1:
-            print(colored("\nPREPOPULATING MEMORY", "light_green"))
-        examples = [
-            {
-                "text": "When I say papers I mean research papers, which are typically pdfs.",
-                "label": "yes",
-            },
-            {
-                "text": "Please verify that each paper you listed actually uses langchain.",
-                "label": "no",
-            },
-            {
-                "text": "Tell gpt the output should still be latex code.",
-                "label": "no",
-            },
-            {
-                "text": "Hint: convert pdfs to text and then answer questions based on them.",
-                "label": "yes",
-            },
-            {
-                "text": "To create a good PPT, include enough content to make it interesting.",
-                "label": "yes",
-            },
-            {
-                "text": "No, for this case the columns should be aspects and the rows should be frameworks.",
-                "label": "no",
-            },
-            {
-                "text": "When writing code, remember to include any libraries that are used.",
-                "label": "yes",
-            },
-            {
-                "text": "Please summarize the papers by Eric Horvitz on bounded rationality.",
-                "label": "no",
-            },
-            {
-                "text": "Compare the h-index of Daniel Weld and Oren Etzioni.",
-                "label": "no",
-            },
-            {
-                "text": "Double check to be sure that the columns in a table correspond to what was asked for.",
-                "label": "yes",
-            },
-        ]
-        for example in examples:
-            self.add_input_output_pair(example["text"], example["label"])
-        self._save_memos()
@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import uuid
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Four-byte headers identifying how an entry was serialized and compressed.
+ZSTD_MAGIC = b"ASZ1"
+ZLIB_MAGIC = b"ASG1"
+
+
+def dumps(result: Dict[str, Any]) -> bytes:
+    """Serialize an analysis result to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(result)
+    return json.dumps(result, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: bytes) -> Dict[str, Any]:
+    """Parse JSON bytes produced by `dumps` or by the legacy pretty-printed writer."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class AnalysisCache:
+    """
+    A persistent, compressed, size-bounded LRU cache of Document Intelligence results.
+
+    Entries are keyed by the SHA-256 of the PDF bytes and the model id, so a result is
+    reused whatever name the PDF was stored under, and a change of model never returns
+    a stale analysis. Results are stored as compact JSON compressed with zstd (zlib if
+    zstandard is not installed). File modification times record recency: reads touch
+    the entry, and the least recently used entries are evicted once the cache grows
+    past `max_size_bytes`.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: int = 2 * 1024 ** 3, compression_level: int = 3):
+        """
+        Initialize the AnalysisCache.
+
+        Args:
+            cache_dir (str): The directory holding the cache entries.
+            max_size_bytes (int): The total size the cache is trimmed to. Defaults to 2 GiB.
+            compression_level (int): The zstd compression level. Defaults to 3.
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.compression_level = compression_level
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, digest: str, model_id: str) -> str:
+        return os.path.join(self.cache_dir, model_id, f"{digest}.bin")
+
+    def _entries(self):
+        for model_dir in os.scandir(self.cache_dir):
+            if model_dir.is_dir():
+                for entry in os.scandir(model_dir.path):
+                    if entry.name.endswith('.bin'):
+                        yield entry
+
+    def get(self, digest: str, model_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached analysis result, or None on a miss.
+
+        Args:
+            digest (str): The SHA-256 digest of the PDF bytes.
+            model_id (str): The Document Intelligence model id, e.g. "prebuilt-document".
+
+        Returns:
+            Optional[Dict[str, Any]]: The analysis result.
+        """
+        path = self._path(digest, model_id)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            result = self._decode(data)
+        except FileNotFoundError:
+            result = None
+        except Exception as e:
+            print(f"Discarding unreadable analysis cache entry {path}: {e}")
+            result = None
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)  # Mark as recently used.
+        except FileNotFoundError:
+            pass
+        return result
+
+    def put(self, digest: str, model_id: str, result: Dict[str, Any]) -> None:
+        """
+        Store an analysis result and evict least recently used entries beyond the size bound.
+
+        Args:
+            digest (str): The SHA-256 digest of the PDF bytes.
+            model_id (str): The Document Intelligence model id.
+            result (Dict[str, Any]): The analysis result.
+        """
+        data = self._encode(result)
+        path = self._path(digest, model_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._size += len(data) - previous
+            if self._size > self.max_size_bytes:
+                self._evict()
+
+    def load_json(self, json_path: str) -> Dict[str, Any]:
+        """
+        Read an analysis result saved as plain JSON by earlier versions.
+
+        Args:
+            json_path (str): The path to the JSON file.
+
+        Returns:
+            Dict[str, Any]: The analysis result.
+        """
+        with open(json_path, 'rb') as f:
+            return loads(f.read())
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits. Caller holds the lock."""
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        self._size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if self._size <= self.max_size_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            self._size -= size
+
+    def _encode(self, result: Dict[str, Any]) -> bytes:
+        raw = dumps(result)
+        if zstandard is not None:
+            return ZSTD_MAGIC + zstandard.ZstdCompressor(level=self.compression_level).compress(raw)
+        return ZLIB_MAGIC + zlib.compress(raw, 6)
+
+    @staticmethod
+    def _decode(data: bytes) -> Optional[Dict[str, Any]]:
+        magic, payload = data[:4], data[4:]
+        if magic == ZSTD_MAGIC:
+            if zstandard is None:
+                return None
+            return loads(zstandard.ZstdDecompressor().decompress(payload))
+        if magic == ZLIB_MAGIC:
+            return loads(zlib.decompress(payload))
+        raise ValueError("unknown cache entry format")
@@ -0,0 +1,251 @@
+import asyncio
+import os
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.ai.formrecognizer.aio import DocumentAnalysisClient
+
+# Status codes the service uses to ask clients to slow down.
+THROTTLED_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """
+    Return the delay in seconds requested by a throttled response, or None if it gives none.
+
+    Understands the millisecond headers sent by Azure services as well as the standard
+    Retry-After header in both its delta-seconds and HTTP-date forms.
+    """
+    for name in ("retry-after-ms", "x-ms-retry-after-ms"):
+        value = headers.get(name)
+        if value:
+            try:
+                return max(float(value) / 1000, 0.0)
+            except ValueError:
+                pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket shared by every request an analyzer sends.
+
+    Tokens refill at `rate` per second up to `capacity`. A throttled response pauses
+    the whole bucket for its Retry-After delay, so the other in-flight operations back
+    off together instead of each discovering the limit with its own 429.
+
+    The bucket holds no asyncio primitives, so it can be reused across event loops;
+    it must only be used from one thread at a time.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (Optional[float]): The maximum burst size. Defaults to `rate` (at least 1).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and the bucket is not paused, then take it."""
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                delay = self._paused_until - now
+            elif self._tokens >= 1:
+                self._tokens -= 1
+                return
+            else:
+                delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds`, and drop any accumulated burst."""
+        now = time.monotonic()
+        self._refill(now)
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+
+
+class RateLimitedTransport(AioHttpTransport):
+    """
+    An aiohttp transport that takes a token before every request, including LRO polls.
+
+    The transport sits below the SDK's retry policy, so each retry also waits for a token,
+    and a throttled response pauses the shared bucket before the retry policy sleeps.
+    (The form recognizer clients reject custom `per_retry_policies`, hence a transport.)
+    """
+
+    def __init__(self, bucket: TokenBucket, default_backoff: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.bucket = bucket
+        self.default_backoff = default_backoff
+        self.requests = 0
+        self.throttled = 0
+
+    async def send(self, request, **kwargs):
+        await self.bucket.acquire()
+        self.requests += 1
+        response = await super().send(request, **kwargs)
+        if response.status_code in THROTTLED_STATUS_CODES:
+            self.throttled += 1
+            delay = parse_retry_after(response.headers)
+            self.bucket.pause(self.default_backoff if delay is None else delay)
+        return response
+
+
+class AsyncAzureDocumentAnalyzer:
+    """
+    Analyzes many PDFs concurrently with Azure's Document Intelligence service.
+
+    Up to `max_concurrency` analyze operations are in flight at once, and their
+    long-running-operation pollers are awaited side by side on one event loop instead
+    of blocking a thread each. All requests go through a shared token bucket that
+    honours the service's Retry-After on 429 responses.
+    """
+
+    def __init__(self, api_key: str, endpoint: str, model_id: str = "prebuilt-document",
+                 max_concurrency: int = 4, requests_per_second: float = 15.0,
+                 polling_interval: Optional[float] = None, max_retries: int = 5, **client_kwargs):
+        """
+        Initialize the AsyncAzureDocumentAnalyzer.
+
+        Args:
+            api_key (str): The API key for Azure Document Intelligence.
+            endpoint (str): The endpoint URL for Azure Document Intelligence.
+            model_id (str): The model to analyze with. Defaults to "prebuilt-document".
+            max_concurrency (int): The maximum number of analyze operations in flight. Defaults to 4.
+            requests_per_second (float): The rate of the token bucket. Defaults to 15, the S0 tier limit.
+            polling_interval (Optional[float]): Seconds between polls when the service sends no Retry-After.
+            max_retries (int): How often a throttled analyze request is resubmitted. Defaults to 5.
+            **client_kwargs: Extra keyword arguments for the DocumentAnalysisClient.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.model_id = model_id
+        self.max_concurrency = max_concurrency
+        self.polling_interval = polling_interval
+        self.max_retries = max_retries
+        self.client_kwargs = client_kwargs
+        self.bucket = TokenBucket(requests_per_second)
+        self.requests = 0
+        self.throttled = 0
+
+    def _create_client(self) -> Tuple[DocumentAnalysisClient, RateLimitedTransport]:
+        transport = RateLimitedTransport(self.bucket)
+        client = DocumentAnalysisClient(
+            self.endpoint,
+            AzureKeyCredential(self.api_key),
+            transport=transport,
+            **self.client_kwargs
+        )
+        return client, transport
+
+    def _record(self, transport: RateLimitedTransport):
+        self.requests += transport.requests
+        self.throttled += transport.throttled
+
+    async def _analyze(self, client: DocumentAnalysisClient, semaphore: asyncio.Semaphore, pdf_path: str) -> Dict[str, Any]:
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"The file {pdf_path} does not exist.")
+        poller_kwargs = {}
+        if self.polling_interval is not None:
+            poller_kwargs["polling_interval"] = self.polling_interval
+        async with semaphore:
+            # Send bytes rather than the file object: aiohttp closes file payloads after sending,
+            # which would make any retry of the upload fail.
+            with open(pdf_path, "rb") as f:
+                document = f.read()
+            try:
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        poller = await client.begin_analyze_document(self.model_id, document=document, **poller_kwargs)
+                        break
+                    except HttpResponseError as e:
+                        # Throttled uploads that outlast the SDK's own retries are resubmitted here;
+                        # the transport has already paused the bucket for the Retry-After delay.
+                        if e.status_code not in THROTTLED_STATUS_CODES or attempt == self.max_retries:
+                            raise
+                result = await poller.result()
+            except HttpResponseError as e:
+                print(f"An error occurred analyzing {pdf_path}: {e}")
+                raise
+        return result.to_dict()
+
+    async def analyze_pdf(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        Analyze a single PDF document.
+
+        Args:
+            pdf_path (str): The path to the PDF file.
+
+        Returns:
+            Dict[str, Any]: The analyzed data from the PDF.
+
+        Raises:
+            FileNotFoundError: If the specified PDF file does not exist.
+            HttpResponseError: If there's an error in the Azure service request.
+        """
+        client, transport = self._create_client()
+        try:
+            async with client:
+                return await self._analyze(client, asyncio.Semaphore(1), pdf_path)
+        finally:
+            self._record(transport)
+
+    async def analyze_many(self, pdf_paths: Iterable[str]) -> Dict[str, Any]:
+        """
+        Analyze several PDF documents concurrently.
+
+        A failure on one document does not stop the others: its entry holds the exception
+        instead of a result.
+
+        Args:
+            pdf_paths (Iterable[str]): The paths to the PDF files.
+
+        Returns:
+            Dict[str, Any]: Each path mapped to its analyzed data or to the exception raised for it.
+        """
+        pdf_paths = list(dict.fromkeys(pdf_paths))
+        if not pdf_paths:
+            return {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        client, transport = self._create_client()
+        try:
+            async with client:
+                results = await asyncio.gather(
+                    *(self._analyze(client, semaphore, pdf_path) for pdf_path in pdf_paths),
+                    return_exceptions=True
+                )
+        finally:
+            self._record(transport)
+        return dict(zip(pdf_paths, results))
@@ -6,8 +6,9 @@ import os
 import json
 
 class AzureDocumentAnalyzer:
-    def __init__(self, api_key: str, endpoint: str):
+    def __init__(self, api_key: str, endpoint: str, model_id: str = "prebuilt-document"):
         self.client = DocumentAnalysisClient(endpoint, AzureKeyCredential(api_key))
+        self.model_id = model_id
 
     def analyze_pdf(self, pdf_path: str) -> Dict[str, Any]:
         """
@@ -28,7 +29,7 @@ class AzureDocumentAnalyzer:
 
         try:
             with open(pdf_path, "rb") as f:
-                poller = self.client.begin_analyze_document("prebuilt-document", document=f)
+                poller = self.client.begin_analyze_document(self.model_id, document=f)
 
             result = poller.result()
             return result.to_dict()
@@ -37,18 +38,6 @@ class AzureDocumentAnalyzer:
             raise
 
 
-    def save_analysis_result(self, result: Dict[str, Any], output_path: str) -> None:
-        """
-        Save the analysis result to a JSON file.
-
-        Args:
-            result (Dict[str, Any]): The analysis result to save.
-            output_path (str): The path where the JSON file should be saved.
-        """
-        print(f"Saving analysis result to {output_path}")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=4)
-
     def load_analysis_result(self, input_path: str) -> Dict[str, Any]:
         """
         Load an analysis result from a JSON file.
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+
+
+class ContentStore:
+    """
+    A content-addressed store for PDF files.
+
+    Every file is stored once under its SHA-256 digest, so the same bytes fetched
+    from different URLs or copied in under different names share one blob. Named
+    paths in the output directory are hard links to the blob (or copies on file
+    systems without hard links).
+    """
+
+    def __init__(self, root_dir: str):
+        """
+        Initialize the ContentStore.
+
+        Args:
+            root_dir (str): The directory holding the blobs.
+        """
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+    @staticmethod
+    def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+        """
+        Compute the SHA-256 digest of a file without loading it into memory.
+
+        Args:
+            path (str): The path to the file.
+            chunk_size (int): The number of bytes read at a time.
+
+        Returns:
+            str: The hex digest.
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def path_for(self, digest: str) -> str:
+        """Return the blob path for a digest, fanned out by its first two characters."""
+        return os.path.join(self.root_dir, digest[:2], f"{digest}.pdf")
+
+    def contains(self, digest: str) -> bool:
+        return os.path.exists(self.path_for(digest))
+
+    def add(self, path: str) -> str:
+        """
+        Add a file to the store, unless identical bytes are already stored.
+
+        Args:
+            path (str): The path to the file.
+
+        Returns:
+            str: The SHA-256 digest of the file.
+        """
+        digest = self.hash_file(path)
+        blob_path = self.path_for(digest)
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            # Copy to a temporary name first so a partially written blob is never visible.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), suffix='.tmp')
+            os.close(fd)
+            try:
+                shutil.copyfile(path, tmp_path)
+                os.replace(tmp_path, blob_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        return digest
+
+    def link(self, digest: str, target_path: str) -> str:
+        """
+        Make `target_path` refer to the blob for `digest`, replacing any existing file.
+
+        Args:
+            digest (str): The digest of a stored blob.
+            target_path (str): The named path to create.
+
+        Returns:
+            str: The target path.
+        """
+        blob_path = self.path_for(digest)
+        if os.path.exists(target_path) and os.path.samefile(blob_path, target_path):
+            return target_path
+        target_dir = os.path.dirname(target_path) or '.'
+        os.makedirs(target_dir, exist_ok=True)
+        tmp_path = os.path.join(target_dir, f".{os.path.basename(target_path)}.{uuid.uuid4().hex}.tmp")
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            shutil.copyfile(blob_path, tmp_path)
+        os.replace(tmp_path, target_path)
+        return target_path
@@ -1,17 +1,21 @@
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.formrecognizer import DocumentAnalysisClient
 
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional, Any
 from langchain.schema import Document
 
 
-from autosearch.api.search_manager import SearchManager
+from autosearch.services import get_project_services
 from typing import Callable
 from autosearch.config_types import ProjectConfig
 from autosearch.data.paper import Paper
 from autosearch.analysis.azure_document_analyzer import AzureDocumentAnalyzer
+from autosearch.analysis.async_azure_document_analyzer import AsyncAzureDocumentAnalyzer
+from autosearch.analysis.analysis_cache import AnalysisCache
 from autosearch.analysis.document_processor import DocumentProcessor
 from autosearch.analysis.metadata_extractor import MetadataExtractor
 from autosearch.analysis.pdf_manager import PDFManager
@@ -24,39 +28,116 @@ class DocumentAnalyzer:
     This class provides methods for analyzing PDFs and creating structured documents from the analyzed data.
     """
 
-    def __init__(self, api_key: str, endpoint: str, project_dir: str, chunk_pdf_func: Callable):
+    def __init__(self, api_key: str, endpoint: str, project_dir: str, chunk_pdf_func: Callable,
+                 analysis_cache_size: int = 2 * 1024 ** 3, max_concurrent_analyses: int = 4):
         """
         Initialize the DocumentAnalyzer.
 
         Args:
             api_key (str): The API key for Azure Document Intelligence.
             endpoint (str): The endpoint URL for Azure Document Intelligence.
+            analysis_cache_size (int): The size in bytes the analysis result cache is trimmed to. Defaults to 2 GiB.
+            max_concurrent_analyses (int): The number of analyses `prefetch_analysis` keeps in flight. Defaults to 4.
         """
         self.client = DocumentAnalysisClient(endpoint, AzureKeyCredential(api_key))
         self.project_dir = project_dir
         self.output_dir = f"{project_dir}/output"
-        os.makedirs(f"{self.output_dir}/json", exist_ok=True)
         os.makedirs(f"{self.output_dir}/markdown", exist_ok=True)
-        self.search_manager = SearchManager(self.project_dir)
+        self.search_manager = get_project_services(self.project_dir).search_manager
         self.paper_db = self.search_manager.paper_db
         self.azure_analyzer = AzureDocumentAnalyzer(api_key, endpoint)
+        self.async_azure_analyzer = AsyncAzureDocumentAnalyzer(api_key, endpoint, max_concurrency=max_concurrent_analyses)
+        self.analysis_cache = AnalysisCache(f"{self.output_dir}/analysis_cache", max_size_bytes=analysis_cache_size)
         self.document_processor = DocumentProcessor()
         self.pdf_manager = PDFManager(project_dir, f"{project_dir}/output")
-        self.metadata_extractor = MetadataExtractor(SearchManager(project_dir))
+        self.metadata_extractor = MetadataExtractor(self.search_manager)
         self.chunk_pdf_func = chunk_pdf_func
 
 
     def analyze_and_create_docs(self, pdf_path: str, paper: Paper, max_token_size: int = 3000, reference: bool = False) -> Tuple[List[Document], Dict[str, str], str]:
-        
-        json_filename =f"{self.pdf_manager.output_dir}/json/{os.path.basename(pdf_path)}.json"
-        if os.path.exists(json_filename):
-            analysis_result = self.azure_analyzer.load_analysis_result(json_filename)
+        analysis_result = self.get_analysis_result(pdf_path)
+        return self.document_processor.create_docs(analysis_result, max_token_size, paper, reference)
+
+    def get_analysis_result(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        Return the Azure analysis of a PDF, analyzing it only if its bytes have not been seen before.
+
+        Results are cached under the SHA-256 of the PDF content and the model id, so the same paper
+        stored under different names or URLs is analyzed once. JSON files written by earlier
+        versions are read and copied into the cache; no new JSON files are written.
+
+        Args:
+            pdf_path (str): The path to the PDF file.
+
+        Returns:
+            Dict[str, Any]: The analysis result.
+        """
+        digest = self.pdf_manager.get_pdf_hash(pdf_path)
+        model_id = self.azure_analyzer.model_id
+        analysis_result = self.analysis_cache.get(digest, model_id)
+        if analysis_result is not None:
+            return analysis_result
+
+        for json_filename in (f"{self.output_dir}/json/{digest}.json",
+                              f"{self.output_dir}/json/{os.path.basename(pdf_path)}.json"):
+            if os.path.exists(json_filename):
+                print(f"Loading analysis result from {json_filename}")
+                analysis_result = self.analysis_cache.load_json(json_filename)
+                break
         else:
             analysis_result = self.azure_analyzer.analyze_pdf(pdf_path)
-            self.azure_analyzer.save_analysis_result(analysis_result, json_filename)
 
-        return self.document_processor.create_docs(analysis_result, max_token_size, paper, reference)
+        self.analysis_cache.put(digest, model_id, analysis_result)
+        return analysis_result
+
+    def prefetch_analysis(self, pdf_paths: List[str]) -> Dict[str, Any]:
+        """
+        Analyze every PDF that has no cached result concurrently and store the results in the cache.
 
+        Later calls to `get_analysis_result` for these files are then cache hits, so callers
+        processing a batch can run the slow Azure round-trips side by side up front.
+
+        Args:
+            pdf_paths (List[str]): The paths to the PDF files.
+
+        Returns:
+            Dict[str, Any]: The paths that needed analysis mapped to their result or the exception raised.
+        """
+        model_id = self.async_azure_analyzer.model_id
+        pending = {}
+        seen = set()
+        for pdf_path in pdf_paths:
+            digest = self.pdf_manager.get_pdf_hash(pdf_path)
+            if digest in seen or self.analysis_cache.get(digest, model_id) is not None:
+                continue
+            seen.add(digest)
+            pending[pdf_path] = digest
+        if not pending:
+            return {}
+
+        print(f"Analyzing {len(pending)} PDFs with up to {self.async_azure_analyzer.max_concurrency} in flight")
+        results = self._run_async(lambda: self.async_azure_analyzer.analyze_many(pending))
+        for pdf_path, result in results.items():
+            if isinstance(result, BaseException):
+                print(f"Error analyzing {pdf_path}: {result}")
+            else:
+                self.analysis_cache.put(pending[pdf_path], model_id, result)
+        return results
+
+    @staticmethod
+    def _run_async(make_coroutine: Callable[[], Any]) -> Any:
+        """
+        Run the coroutine built by `make_coroutine` to completion and return its result.
+
+        When this thread already runs an event loop, as in Jupyter, the coroutine is built
+        and run on a worker thread with its own loop, since `asyncio.run` cannot nest.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(make_coroutine())
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch") as executor:
+            return executor.submit(lambda: asyncio.run(make_coroutine())).result()
 
     def pdf2md_chunk(self, paper: Paper, max_token_size: int = 3000, reference: bool = False) -> List[Document]:
         pdf_path = self.pdf_manager.ensure_pdf_exists(paper)
@@ -120,7 +201,7 @@ class DocumentAnalyzer:
                     full_md_text = f.read()
             else:
                 # If not, process the PDF
-                analysis_result = self.azure_analyzer.analyze_pdf(pdf_path)
+                analysis_result = self.get_analysis_result(pdf_path)
                 docs, _, full_md_text = self.document_processor.create_docs(
                     analysis_result, 
                     max_token_size=3000,  # You might want to make this configurable
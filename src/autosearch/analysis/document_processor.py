@@ -1,12 +1,56 @@
 from langchain.schema import Document
-import tiktoken
-from typing import List, Dict, Any, Tuple
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional, TextIO, Tuple
 import tiktoken
 import numpy as np
 
 from autosearch.analysis import tablehelper as tb
 from autosearch.data.paper import Paper
 
+TOKENIZER_MODEL = "gpt-3.5-turbo"
+
+
+@lru_cache(maxsize=None)
+def get_encoder(model: str = TOKENIZER_MODEL) -> tiktoken.Encoding:
+    """Return the tiktoken encoder for `model`, built once per process."""
+    return tiktoken.encoding_for_model(model)
+
+
+class TableSpanIndex:
+    """
+    A sorted interval index over the spans of a document's tables.
+
+    Tables are ordered by their first offset so they can be merged with the paragraphs in
+    one pass, and every span is kept as a sorted interval so `table_at` finds the table
+    covering an offset with a binary search. Tables split over several spans (e.g. across
+    a page break) cover only their spans, not the gaps between them.
+    """
+
+    def __init__(self, tables: List[Dict[str, Any]]):
+        intervals = sorted(
+            (span['offset'], span['offset'] + span['length'], idx)
+            for idx, table in enumerate(tables)
+            for span in table.get('spans', [])
+        )
+        self.starts = [start for start, _, _ in intervals]
+        self.ends = [end for _, end, _ in intervals]
+        self.table_ids = [idx for _, _, idx in intervals]
+
+        first_offsets = {}
+        for start, _, idx in intervals:
+            first_offsets.setdefault(idx, start)
+        self.table_order = sorted(first_offsets, key=first_offsets.get)
+        self.table_starts = [first_offsets[idx] for idx in self.table_order]
+
+    def table_at(self, offset: int) -> Optional[int]:
+        """Return the index of the table with a span covering `offset`, or None."""
+        i = bisect_right(self.starts, offset) - 1
+        if i >= 0 and offset < self.ends[i]:
+            return self.table_ids[i]
+        return None
+
+
 class DocumentProcessor:
     @staticmethod
     def create_docs(data: Dict[str, Any], max_token_size: int, paper: Paper, reference: bool = False) -> Tuple[List[Document], Dict[str, str], str]:
@@ -25,21 +69,47 @@ class DocumentProcessor:
                 - Dict[str, str]: Page content extracted from the input data.
                 - str: Full markdown text generated from the input data.
         """
-        docs = []
-        page_content = {str(i): "" for i in range(1, len(data['pages']) + 1)}
+        page_parts = {str(i): [] for i in range(1, len(data['pages']) + 1)}
+        docs = list(DocumentProcessor.stream_docs(data, max_token_size, paper, reference, page_parts=page_parts))
+        page_content = {page: ''.join(parts) for page, parts in page_parts.items()}
+        # The markdown is the title followed by every document, as written by stream_docs.
+        title_md = f"# {DocumentProcessor._get_title(data)}\n\n"
+        full_md_text = ''.join([title_md] + [doc.page_content for doc in docs])
+        largest_doc = max((doc.metadata['tokens'] for doc in docs), default=0)
+
+        print(f"Created {len(docs)} docs with a total of {DocumentProcessor.count_tokens(full_md_text)} tokens. Largest doc has {largest_doc} tokens.")
+        return docs, page_content, full_md_text
+
+    @staticmethod
+    def stream_docs(data: Dict[str, Any], max_token_size: int, paper: Paper, reference: bool = False,
+                    md_out: Optional[TextIO] = None, page_parts: Optional[Dict[str, List[str]]] = None) -> Iterator[Document]:
+        """
+        Yield documents as each section closes, writing the markdown incrementally.
 
-        # Extract title from paragraphs
-        title = next((p['content'] for p in data['paragraphs'] if p.get('role') == 'title'), "Untitled Document")
+        Produces the same documents and markdown as `create_docs` without holding the whole
+        document in memory: only the section being assembled is kept, the markdown goes to
+        `md_out` (an open file or `io.StringIO`) and page text is collected as lists of parts.
 
-        full_md_text = f"# {title}\n\n"
+        Args:
+            data (Dict[str, Any]): Input data containing paragraphs and tables.
+            max_token_size (int): Maximum token size for each document.
+            paper (Paper): Paper object containing metadata.
+            reference (bool): Whether to include the References section. Defaults to False.
+            md_out (Optional[TextIO]): Where to write the markdown text. Defaults to discarding it.
+            page_parts (Optional[Dict[str, List[str]]]): Page number to list of content parts, filled in
+                place. Must contain a key for every page. Defaults to not collecting page content.
 
-        largest_doc = 0
+        Yields:
+            Document: The documents created from the input data.
+        """
+        if md_out is not None:
+            md_out.write(f"# {DocumentProcessor._get_title(data)}\n\n")
 
         table_spans = DocumentProcessor._collect_table_spans(data['tables'])
-        paragraphs = DocumentProcessor._process_paragraphs(data['paragraphs'], table_spans, data['tables'])
+        paragraphs = DocumentProcessor._iter_paragraphs(data['paragraphs'], table_spans, data['tables'])
 
         current_section = ""
-        current_text = ""
+        current_text: List[str] = []
         current_pages = []
         reference_section_found = False
 
@@ -47,143 +117,174 @@ class DocumentProcessor:
             if para['type'] == 'section_heading' or para['type'] == 'title':
                 if current_section:
                     if not reference_section_found or reference:
-                        docs, full_md_text, largest_doc = DocumentProcessor._add_document(
-                            docs, current_text, list(np.unique(current_pages)), paper.source, max_token_size, full_md_text, largest_doc
+                        yield from DocumentProcessor._section_docs(
+                            ''.join(current_text), list(np.unique(current_pages)), paper.source, max_token_size, md_out
                         )
                 current_section = para['content']
-                current_text = f"## {current_section}\n\n"
+                current_text = [f"## {current_section}\n\n"]
                 current_pages = []
                 if not reference and current_section.lower().strip() in ['references', 'bibliography', 'works cited']:
                     reference_section_found = True
             else:
                 if not reference_section_found or reference:
-                    current_text += para['content']
+                    current_text.append(para['content'])
                     current_pages.append(para['page'])
 
-            if not reference_section_found or reference:
-                page_key = str(para['page'])
-                page_content[page_key] += para['content']
+            if page_parts is not None and (not reference_section_found or reference):
+                page_parts[str(para['page'])].append(para['content'])
 
         # Add the last document
         if current_section and (not reference_section_found or reference):
-            docs, full_md_text, largest_doc = DocumentProcessor._add_document(
-                docs, current_text, list(np.unique(current_pages)), paper.source, max_token_size, full_md_text, largest_doc
+            yield from DocumentProcessor._section_docs(
+                ''.join(current_text), list(np.unique(current_pages)), paper.source, max_token_size, md_out
             )
 
-        print(f"Created {len(docs)} docs with a total of {DocumentProcessor.count_tokens(full_md_text)} tokens. Largest doc has {largest_doc} tokens.")
-        return docs, page_content, full_md_text
-
+    @staticmethod
+    def _get_title(data: Dict[str, Any]) -> str:
+        """Extract title from paragraphs."""
+        return next((p['content'] for p in data['paragraphs'] if p.get('role') == 'title'), "Untitled Document")
 
     @staticmethod
-    def _process_paragraphs(paragraphs: List[Dict[str, Any]], table_spans: Dict[str, int], tables: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _process_paragraphs(paragraphs: List[Dict[str, Any]], table_spans: TableSpanIndex, tables: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process paragraphs and insert tables where necessary."""
-        processed = []
-        end_of_table = 0
+        return list(DocumentProcessor._iter_paragraphs(paragraphs, table_spans, tables))
+
+    @staticmethod
+    def _iter_paragraphs(paragraphs: List[Dict[str, Any]], table_spans: TableSpanIndex, tables: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield processed paragraphs one at a time, with tables inserted where necessary.
+
+        Paragraphs and tables are merged in one pass over the paragraphs: every table is
+        emitted before the first paragraph at or after its start offset, and paragraphs
+        lying inside any span of a table (its cells) are skipped.
+        """
+        table_order, table_starts, table_at = table_spans.table_order, table_spans.table_starts, table_spans.table_at
+        next_table = 0
         for para in paragraphs:
-            if para['spans'][0]['offset'] >= end_of_table:
-                if para.get('role') == 'sectionHeading':
-                    processed.append({
-                        'type': 'section_heading',
-                        'content': para['content'] + "\n\n",
-                        'page': para['bounding_regions'][0]['page_number']
-                    })
-                elif para.get('role') == 'title':
-                    processed.append({
-                        'type': 'title',
-                        'content': para['content'] + "\n\n",
-                        'page': para['bounding_regions'][0]['page_number']
-                    })
-                elif para.get('role') != 'pageNumber':
-                    processed.append({
-                        'type': 'paragraph',
-                        'content': para['content'] + "\n\n",
-                        'page': para['bounding_regions'][0]['page_number']
-                    })
-
-                # Check for subsequent table
-                search_key = str(para['spans'][0]['offset'] + para['spans'][0]['length'] + 1)
-                if search_key in table_spans:
-                    table_idx = table_spans[search_key]
-                    table_content = "\n\n" + tb.tabletomd(tables[table_idx]) + "\n\n"
-                    processed.append({
-                        'type': 'table',
-                        'content': table_content,
-                        'page': tables[table_idx]['bounding_regions'][0]['page_number']
-                    })
-                    end_of_table = DocumentProcessor._calculate_end_of_table(tables[table_idx])
-
-        return processed
+            offset = para['spans'][0]['offset']
+            while next_table < len(table_order) and table_starts[next_table] <= offset:
+                yield DocumentProcessor._table_item(tables[table_order[next_table]])
+                next_table += 1
+
+            if table_at(offset) is not None:
+                continue
+            if para.get('role') == 'sectionHeading':
+                para_type = 'section_heading'
+            elif para.get('role') == 'title':
+                para_type = 'title'
+            elif para.get('role') != 'pageNumber':
+                para_type = 'paragraph'
+            else:
+                continue
+            yield {
+                'type': para_type,
+                'content': para['content'] + "\n\n",
+                'page': para['bounding_regions'][0]['page_number']
+            }
+
+        # Tables after the last paragraph.
+        for table_idx in table_order[next_table:]:
+            yield DocumentProcessor._table_item(tables[table_idx])
+
+    @staticmethod
+    def _table_item(table: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'type': 'table',
+            'content': "\n\n" + tb.tabletomd(table) + "\n\n",
+            'page': table['bounding_regions'][0]['page_number']
+        }
 
     @staticmethod
     def _split_text(text: str, max_token_size: int) -> List[str]:
         """Split text into parts that fit within the max token size."""
+        return [part for part, _ in DocumentProcessor._split_text_counted(text, max_token_size)]
+
+    @staticmethod
+    def _split_text_counted(text: str, max_token_size: int) -> List[Tuple[str, int]]:
+        """
+        Split text into parts that fit within the max token size, returned with their token counts.
+
+        Each line is encoded once and lines are packed greedily using running token totals.
+        A line longer than the limit is cut at token offsets, preferring the last space
+        before each cut so words stay whole. The count of a part is its running total, the
+        sum of its lines encoded separately, which can exceed the count of the part encoded
+        whole by a token or so per line break.
+        """
+        enc = get_encoder()
+        lines = [line + '\n' for line in text.split('\n')]
+        line_tokens = enc.encode_ordinary_batch(lines)
+
         parts = []
-        current_part = ""
-        for line in text.split('\n'):
-            if DocumentProcessor.count_tokens(current_part + line + '\n') > max_token_size:
-                if current_part:
-                    parts.append(current_part.strip())
-                    current_part = ""
-                if DocumentProcessor.count_tokens(line + '\n') > max_token_size:
-                    # If a single line is too long, split it
-                    words = line.split()
-                    for word in words:
-                        if DocumentProcessor.count_tokens(current_part + word + ' ') > max_token_size:
-                            parts.append(current_part.strip())
-                            current_part = ""
-                        current_part += word + ' '
-                else:
-                    current_part = line + '\n'
-            else:
-                current_part += line + '\n'
+        current_part: List[str] = []
+        current_tokens = 0
+        for line, tokens in zip(lines, line_tokens):
+            if current_tokens + len(tokens) <= max_token_size:
+                current_part.append(line)
+                current_tokens += len(tokens)
+                continue
+            if current_part:
+                parts.append((''.join(current_part).strip(), current_tokens))
+                current_part, current_tokens = [], 0
+            if len(tokens) <= max_token_size:
+                current_part, current_tokens = [line], len(tokens)
+                continue
+            # The line alone is too long: emit full windows, carry the remainder forward.
+            pieces = DocumentProcessor._split_on_token_offsets(line, tokens, max_token_size)
+            parts.extend((piece.strip(), piece_tokens) for piece, piece_tokens in pieces[:-1])
+            last_piece, last_tokens = pieces[-1]
+            current_part, current_tokens = [last_piece], last_tokens
         if current_part:
-            parts.append(current_part.strip())
-        return parts
+            parts.append((''.join(current_part).strip(), current_tokens))
+        return [(part, tokens) for part, tokens in parts if part]
 
+    @staticmethod
+    def _split_on_token_offsets(line: str, tokens: List[int], max_token_size: int) -> List[Tuple[str, int]]:
+        """Cut a line into pieces of at most `max_token_size` tokens, returned with their token counts."""
+        _, offsets = get_encoder().decode_with_offsets(tokens)
+        pieces = []
+        start = 0
+        while start < len(tokens):
+            end = start + max_token_size
+            if end >= len(tokens):
+                pieces.append((line[offsets[start]:], len(tokens) - start))
+                break
+            cut = offsets[end]
+            space = line.rfind(' ', offsets[start] + 1, cut)
+            if space != -1:
+                # Back off to the first token at or after the space (tokens carry their leading
+                # space), keeping the word whole.
+                end = bisect_left(offsets, space, start + 1, end)
+                cut = offsets[end]
+            pieces.append((line[offsets[start]:cut], end - start))
+            start = end
+        return pieces
 
     @staticmethod
     def count_tokens(text: str) -> int:
         """Count the number of tokens in a given text."""
-        enc = tiktoken.encoding_for_model("gpt-3.5-turbo")
-        return len(enc.encode(text))
-    
+        return len(get_encoder().encode_ordinary(text))
+
     @staticmethod
-    def _add_document(docs: List[Document], text: str, pages: List[int], source_name: str,
-                      max_token_size: int, full_md_text: str, largest_doc: int) -> Tuple[List[Document], str, int]:
-        """Add a new document to the list, splitting if necessary."""
+    def _section_docs(text: str, pages: List[int], source_name: str, max_token_size: int,
+                      md_out: Optional[TextIO] = None) -> List[Document]:
+        """Create the documents for one section, splitting if necessary, and write them to `md_out`."""
         tokens = DocumentProcessor.count_tokens(text)
         if tokens <= max_token_size:
-            docs.append(Document(page_content=text, metadata={"source": source_name, "pages": pages, "tokens": tokens}))
-            full_md_text += text
-            largest_doc = max(largest_doc, tokens)
+            docs = [Document(page_content=text, metadata={"source": source_name, "pages": pages, "tokens": tokens})]
         else:
-            # Split the document if it's too large
+            # Split the document if it's too large. The counts of the split add up line counts, so
+            # the parts are counted again, exactly, in one batch.
             parts = DocumentProcessor._split_text(text, max_token_size)
-            for part in parts:
-                part_tokens = DocumentProcessor.count_tokens(part)
-                docs.append(Document(page_content=part, metadata={"source": source_name, "pages": pages, "tokens": part_tokens}))
-                full_md_text += part
-                largest_doc = max(largest_doc, part_tokens)
-        return docs, full_md_text, largest_doc
+            docs = [
+                Document(page_content=part, metadata={"source": source_name, "pages": pages, "tokens": len(part_tokens)})
+                for part, part_tokens in zip(parts, get_encoder().encode_ordinary_batch(parts))
+            ]
+        if md_out is not None:
+            for doc in docs:
+                md_out.write(doc.page_content)
+        return docs
 
     @staticmethod
-    def _collect_table_spans(tables: List[Dict[str, Any]]) -> Dict[str, int]:
+    def _collect_table_spans(tables: List[Dict[str, Any]]) -> TableSpanIndex:
         """Collect spans from tables."""
-        spans = {}
-        for idx, tab in enumerate(tables):
-            if len(tab['spans']) == 1:
-                key = str(tab['spans'][0]['offset'])
-            else:
-                key = str(min(sp['offset'] for sp in tab['spans']))
-            spans[key] = idx
-        return spans
-
-    @staticmethod
-    def _calculate_end_of_table(table: Dict[str, Any]) -> int:
-        """Calculate the end offset of a table."""
-        if len(table['spans']) > 1:
-            return min(sp['offset'] for sp in table['spans']) + sum(sp['length'] for sp in table['spans']) + 1
-        else:
-            return table['spans'][0]['offset'] + table['spans'][0]['length'] + 1
-
-    
+        return TableSpanIndex(tables)
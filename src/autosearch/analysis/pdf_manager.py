@@ -1,13 +1,69 @@
 import os
-import shutil
+import threading
+from typing import Dict, Tuple
 from autosearch.data.paper import Paper
-from autosearch.api.search_manager import SearchManager
+from autosearch.services import get_project_services
+from autosearch.analysis.content_store import ContentStore
 
 class PDFManager:
     def __init__(self, project_dir: str, output_dir: str):
         self.project_dir = project_dir
         self.output_dir = output_dir
-        self.search_manager = SearchManager(project_dir)
+        self.search_manager = get_project_services(project_dir).search_manager
+        self.paper_db = self.search_manager.paper_db
+        self.content_store = ContentStore(os.path.join(output_dir, "blobs"))
+        # Digests of files already hashed, keyed by (real path, size, mtime) so a changed file is hashed again.
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._digests_lock = threading.Lock()
+
+    @staticmethod
+    def _file_key(path: str) -> Tuple[str, int, int]:
+        stat = os.stat(path)
+        return os.path.realpath(path), stat.st_size, stat.st_mtime_ns
+
+    def _remember_digest(self, path: str, digest: str) -> None:
+        with self._digests_lock:
+            self._digests[self._file_key(path)] = digest
+
+    def store_pdf(self, pdf_path: str, *locations: str) -> str:
+        """
+        Add a PDF to the content store and record every location it is known under.
+
+        Args:
+            pdf_path (str): The path to the PDF file. It is replaced by a link to the stored blob.
+            *locations (str): Additional URLs or paths the same bytes were fetched from.
+
+        Returns:
+            str: The SHA-256 digest of the PDF.
+        """
+        digest = self.content_store.add(pdf_path)
+        self.content_store.link(digest, pdf_path)
+        self.paper_db.add_pdf_locations(digest, (pdf_path,) + locations)
+        self._remember_digest(pdf_path, digest)
+        return digest
+
+    def get_pdf_hash(self, pdf_path: str) -> str:
+        """
+        Return the content hash of a local PDF and record it in the location index.
+
+        The file is read only the first time it is seen, or after its size or mtime changed.
+
+        Args:
+            pdf_path (str): The path to the PDF file.
+
+        Returns:
+            str: The SHA-256 digest of the PDF.
+        """
+        key = self._file_key(pdf_path)
+        with self._digests_lock:
+            digest = self._digests.get(key)
+        if digest is None:
+            digest = self.content_store.hash_file(pdf_path)
+            with self._digests_lock:
+                self._digests[key] = digest
+        if self.paper_db.get_pdf_hash(pdf_path) != digest:
+            self.paper_db.add_pdf_locations(digest, [pdf_path])
+        return digest
 
     def handle_local_pdf(self, paper: Paper) -> str:
         """
@@ -30,7 +86,11 @@ class PDFManager:
             raise FileNotFoundError(f"Local PDF file not found: {source_path}")
 
         if not os.path.exists(output_path):
-            shutil.copy2(source_path, output_path)
+            # Identical bytes already copied in under another name share the same blob.
+            digest = self.content_store.add(source_path)
+            self.content_store.link(digest, output_path)
+            self.paper_db.add_pdf_locations(digest, [output_path, source_path, paper.url])
+            self._remember_digest(output_path, digest)
             paper.local_path = output_path
 
         return output_path
@@ -48,16 +108,22 @@ class PDFManager:
         Raises:
             Exception: If there's an error downloading the PDF.
         """
-        pdf_filename = os.path.basename(paper.url)
-        if not pdf_filename.endswith('.pdf'):
-            pdf_filename += '.pdf'
-        output_path = os.path.join(self.output_dir, pdf_filename)
+        output_path = os.path.join(self.output_dir, self.search_manager.pdf_filename(paper))
 
         if not os.path.exists(output_path):
-            try:
-                self.search_manager.download_pdf(paper, self.output_dir)
-            except Exception as e:
-                raise Exception(f"Error downloading PDF for {paper.title}: {str(e)}")
+            # Reuse the stored bytes if this URL was downloaded before under another name.
+            digest = self.paper_db.get_pdf_hash(paper.url)
+            if digest and self.content_store.contains(digest):
+                self.content_store.link(digest, output_path)
+                self._remember_digest(output_path, digest)
+            else:
+                try:
+                    # The hash recorded for the URL is not checked: the content behind a URL may
+                    # legitimately change, and storing the download records its new hash.
+                    output_path = self.search_manager.download_pdf(paper, self.output_dir)
+                except Exception as e:
+                    raise Exception(f"Error downloading PDF for {paper.title}: {str(e)}")
+                self.store_pdf(output_path, paper.url, paper.pdf_url)
 
         paper.local_path = output_path
         return output_path
@@ -1,3 +1,9 @@
+import csv
+import io
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
 
 def tableinfo(tables):
     for table_idx, table in enumerate(tables):  
@@ -8,39 +14,98 @@ def tableinfo(tables):
         )  
 
 
+def tablerows(table: Dict[str, Any]) -> List[List[str]]:
+    """
+    Lay a table's cells out as rows of cell text, filling merged cells.
+
+    A cell spanning several rows or columns repeats its content in every position it
+    covers, so the columns stay aligned. Positions without a cell are empty strings.
+
+    Args:
+        table (Dict[str, Any]): A table from a Document Intelligence analysis result.
+
+    Returns:
+        List[List[str]]: `row_count` rows of `column_count` strings.
+    """
+    row_count, column_count = table['row_count'], table['column_count']
+    cells = table['cells']
+    flat = [''] * (row_count * column_count)
+    for cell in cells:
+        flat[cell['row_index'] * column_count + cell['column_index']] = cell['content']
+
+    # Every position is covered by its own cell unless some cells span or are missing.
+    if len(cells) < len(flat):
+        spanned = [cell for cell in cells if cell.get('row_span', 1) > 1 or cell.get('column_span', 1) > 1]
+        if spanned:
+            grid = np.array(flat, dtype=object).reshape(row_count, column_count)
+            for cell in spanned:
+                row, col = cell['row_index'], cell['column_index']
+                grid[row:row + cell.get('row_span', 1), col:col + cell.get('column_span', 1)] = cell['content']
+            return grid.tolist()
+    if not column_count:
+        return [[] for _ in range(row_count)]
+    return [flat[start:start + column_count] for start in range(0, len(flat), column_count)]
+
+
+def tabletogrid(table: Dict[str, Any]) -> np.ndarray:
+    """Return the table as a `row_count` x `column_count` NumPy object array of cell text."""
+    grid = np.empty((table['row_count'], table['column_count']), dtype=object)
+    grid[...] = tablerows(table) if grid.size else ''
+    return grid
+
+
 def tabletomd(table):
-    
-    celldict = {}
-    lastcolumn=table['column_count']-1
-    
-    for cell in table['cells']:
-        key=str(cell['row_index'])+"-"+str(cell['column_index'])
-        celldict[key]=cell['content']
-    
-    tsvtable=""
-    for row in range(table['row_count']):
-        for col in range(table['column_count']):
-            key=str(row)+"-"+str(col)
-            if col==0:
-                tsvtable+='|'
-            if key in celldict:
-                tsvtable+=celldict[key]+'|'
-            else:
-                tsvtable+='|'
-            if col==lastcolumn:
-                tsvtable+='\n'
-                if row==0:
-                    tsvtable+='|'
-                    for col in range(table['column_count']):
-                        tsvtable+='---|'
-                    tsvtable+='\n'
-                    
-    return tsvtable
-
-def gettablesfrompage(tables, page):
-    tableslist=[]
-    for table_idx, table in enumerate(tables):  
-        if table['bounding_regions'][0]['page_number'] == page:
-            df=tabletomd(table)
-            tableslist.append(df)
-    return tableslist
\ No newline at end of file
+    """Convert a table to markdown, with the first row as the header."""
+    rows = tablerows(table)
+    if not rows:
+        return ""
+    column_count = table['column_count']
+    lines = ['|' + '|'.join(row) + '|' for row in rows]
+    lines.insert(1, '|' + '---|' * column_count)
+    md = '\n'.join(lines) + '\n'
+    # Cell text containing '|' or line breaks would break the layout; only then escape cell by cell.
+    if md.count('|') != (len(rows) + 1) * (column_count + 1) or md.count('\n') != len(rows) + 1:
+        lines = ['|' + '|'.join(_escapemd(value) for value in row) + '|' for row in rows]
+        lines.insert(1, '|' + '---|' * column_count)
+        md = '\n'.join(lines) + '\n'
+    return md
+
+
+def _escapemd(value: str) -> str:
+    return ' '.join(value.replace('|', '\\|').split('\n'))
+
+
+def tabletocsv(table) -> str:
+    """Convert a table to CSV text."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(tablerows(table))
+    return buffer.getvalue()
+
+
+def tabletotsv(table) -> str:
+    """Convert a table to TSV text. Tabs and line breaks inside cells become spaces."""
+    rows = tablerows(table)
+    tsv = ''.join('\t'.join(row) + '\n' for row in rows)
+    if tsv.count('\t') != len(rows) * (table['column_count'] - 1) or tsv.count('\n') != len(rows):
+        tsv = ''.join('\t'.join(' '.join(value.split()) for value in row) + '\n' for row in rows)
+    return tsv
+
+
+def indextablesbypage(tables) -> Dict[int, List[int]]:
+    """Map each page number to the indices of the tables starting on that page."""
+    index: Dict[int, List[int]] = {}
+    for table_idx, table in enumerate(tables):
+        index.setdefault(table['bounding_regions'][0]['page_number'], []).append(table_idx)
+    return index
+
+
+def gettablesfrompage(tables, page, page_index: Optional[Dict[int, List[int]]] = None) -> List[str]:
+    """
+    Convert the tables starting on `page` to markdown.
+
+    Pass the result of `indextablesbypage(tables)` as `page_index` when querying many
+    pages, so each lookup does not scan every table; without it the tables are scanned.
+    """
+    if page_index is None:
+        return [tabletomd(table) for table in tables if table['bounding_regions'][0]['page_number'] == page]
+    return [tabletomd(tables[table_idx]) for table_idx in page_index.get(page, [])]
@@ -1,32 +1,233 @@
 import arxiv
-from typing import List, Dict
-from .search_api_base import SearchAPIBase
+import copy
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, List, Dict, Iterator, Optional, Union
+from .search_api_base import QueueWait, SearchAPIBase
+from .downloader import get_downloader
 import os
 import re
 from urllib.parse import urlparse
 from autosearch.data.paper import Paper
+from autosearch.database.connection_pool import ConnectionPool
+
+
+# arXiv asks API users to make one request at a time, at most one every three seconds.
+ARXIV_PAGE_SIZE = 100
+ARXIV_DELAY_SECONDS = 3.0
+ARXIV_NUM_RETRIES = 3
+
+# Identifiers per id_list request; longer lists make for unwieldy query URLs.
+ID_LIST_CHUNK_SIZE = 100
+
+# PDFs are served at a URL derived from the id alone; an unversioned id serves the latest version.
+ARXIV_PDF_URL = "https://arxiv.org/pdf/{}"
+
+_VERSIONED_ID = re.compile(r'(.+?)v(\d+)')
+
+
+class SerializedClient(arxiv.Client):
+    """
+    An arxiv.Client that can be shared between threads.
+
+    arxiv.Client spaces its requests `delay_seconds` apart but does not guard that
+    bookkeeping against concurrent use; here page requests run one at a time, each starting
+    `delay_seconds` after the previous one ended. Only the public `results` is wrapped,
+    as the request internals of arxiv.Client change between releases. A thread inside
+    `count_waits` has the time it spends queued behind other threads' searches, and
+    sleeping out the delay, counted separately from its own requests.
+    """
+
+    def __init__(self, page_size: int = ARXIV_PAGE_SIZE, delay_seconds: float = ARXIV_DELAY_SECONDS,
+                 num_retries: int = ARXIV_NUM_RETRIES):
+        super().__init__(page_size=page_size, delay_seconds=delay_seconds, num_retries=num_retries)
+        self._search_lock = threading.Lock()
+        self._last_search_end: Optional[float] = None
+        self._local = threading.local()
+
+    @contextmanager
+    def count_waits(self, queue_wait: QueueWait) -> Iterator[None]:
+        """Counts the calling thread's waits for its turn in `queue_wait` within the context."""
+        previous = getattr(self._local, 'queue_wait', None)
+        self._local.queue_wait = queue_wait
+        try:
+            yield
+        finally:
+            self._local.queue_wait = previous
+
+    def results(self, search: arxiv.Search, offset: int = 0) -> Iterator[arxiv.Result]:
+        """
+        Run a search and yield its results.
+
+        Each page is requested as a search of its own, bounded to the page, which holds the
+        client only while the page is fetched; its results are yielded once it is released,
+        so a slow consumer does not hold up other threads' searches, and a consumer that
+        stops early fetches no further pages.
+        """
+        while search.max_results is None or offset < search.max_results:
+            page_size = self.page_size if search.max_results is None else min(self.page_size, search.max_results - offset)
+            page_search = copy.copy(search)
+            page_search.max_results = offset + page_size
+            page = self._fetch_page(page_search, offset)
+            yield from page
+            if len(page) < page_size:
+                break
+            offset += len(page)
+
+    def _fetch_page(self, search: arxiv.Search, offset: int) -> List[arxiv.Result]:
+        """Fetch one page of results, `delay_seconds` after the previous page ended."""
+        queue_wait = getattr(self._local, 'queue_wait', None)
+        with queue_wait.waiting() if queue_wait is not None else nullcontext():
+            self._search_lock.acquire()
+        try:
+            with queue_wait.waiting() if queue_wait is not None else nullcontext():
+                # Sleep out the delay here, where it is counted, rather than in arxiv.Client.
+                if self._last_search_end is not None:
+                    remaining = self.delay_seconds - (time.monotonic() - self._last_search_end)
+                    if remaining > 0:
+                        time.sleep(remaining)
+            return list(super().results(search, offset))
+        finally:
+            self._last_search_end = time.monotonic()
+            self._search_lock.release()
+
+
+_shared_client: Optional[SerializedClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_client() -> SerializedClient:
+    """Return the arXiv client shared by every ArxivAPI in the process, creating it on first use."""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = SerializedClient()
+    return _shared_client
+
+
+class ArxivVersionIndex:
+    """
+    The latest version seen of each arXiv paper, used to pin unversioned ids to an exact PDF.
+
+    Every search and metadata result records its versioned id, so resolving `abs/<id>`
+    to `<id>vN` costs no request. With a `db_path`, the index is kept in a SQLite table
+    and survives restarts; otherwise it lives in memory.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the ArxivVersionIndex.
+
+        Args:
+            db_path (Optional[str]): The SQLite file the index is kept in. Defaults to memory only.
+        """
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.pool = None
+        if db_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self.pool = ConnectionPool(db_path)
+            self.pool.execute_write(lambda conn: conn.execute(
+                'CREATE TABLE IF NOT EXISTS arxiv_versions (arxiv_id TEXT PRIMARY KEY, version INTEGER NOT NULL)'))
+            rows = self.pool.connection().execute('SELECT arxiv_id, version FROM arxiv_versions').fetchall()
+            self._versions = {row['arxiv_id']: row['version'] for row in rows}
+
+    def record(self, *short_ids: str):
+        """
+        Record versioned ids such as '2301.00001v2'. Ids without a version are ignored.
+
+        Args:
+            *short_ids (str): The versioned arXiv ids.
+        """
+        updates = []
+        with self._lock:
+            for short_id in short_ids:
+                match = _VERSIONED_ID.fullmatch(short_id)
+                if match is None:
+                    continue
+                arxiv_id, version = match.group(1), int(match.group(2))
+                if version > self._versions.get(arxiv_id, 0):
+                    self._versions[arxiv_id] = version
+                    updates.append((arxiv_id, version))
+        if updates and self.pool is not None:
+            try:
+                self.pool.execute_write(lambda conn: conn.executemany(
+                    'INSERT INTO arxiv_versions (arxiv_id, version) VALUES (?, ?) '
+                    'ON CONFLICT(arxiv_id) DO UPDATE SET version = MAX(version, excluded.version)', updates))
+            except sqlite3.Error as e:
+                print(f"Error saving arXiv versions: {str(e)}")
+
+    def latest(self, arxiv_id: str) -> Optional[int]:
+        """Return the latest version recorded for an unversioned id, or None."""
+        return self._versions.get(arxiv_id)
+
+    def resolve(self, arxiv_id: str) -> str:
+        """Pin an unversioned id to its latest recorded version; other ids are returned unchanged."""
+        if _VERSIONED_ID.fullmatch(arxiv_id):
+            return arxiv_id
+        version = self.latest(arxiv_id)
+        return f"{arxiv_id}v{version}" if version else arxiv_id
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+
+
+_shared_version_index = ArxivVersionIndex()
 
 
 class ArxivAPI(SearchAPIBase):
 
+    def __init__(self, client: Optional[arxiv.Client] = None, version_index: Optional[ArxivVersionIndex] = None):
+        """
+        Initialize the ArxivAPI.
+
+        Args:
+            client (Optional[arxiv.Client]): The client used for API requests. Defaults to the shared client.
+            version_index (Optional[ArxivVersionIndex]): Where the versions of seen papers are recorded.
+                Defaults to an in-memory index shared by the process.
+        """
+        self.client = client if client is not None else get_client()
+        self.version_index = version_index if version_index is not None else _shared_version_index
+
     def search(self, query: str, n_results: int = 10) -> List[Paper]:
+        return list(self.iter_search(query, n_results))
+
+    def iter_search(self, query: str, n_results: int = 10, cancel_event: Optional[threading.Event] = None) -> Iterator[Paper]:
+        """
+        Yield papers as the arXiv API returns them, stopping once `cancel_event` is set.
+
+        Args:
+            query (str): The search query.
+            n_results (int): The maximum number of results.
+            cancel_event (Optional[threading.Event]): Set by the caller to stop the search.
+
+        Yields:
+            Paper: The matching papers, most relevant first.
+        """
         search = arxiv.Search(
             query=query,
             max_results=n_results,
             sort_by=arxiv.SortCriterion.Relevance
         )
+        for result in self.client.results(search):
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            self.version_index.record(result.get_short_id())
+            yield self._to_paper(result)
+
+    def count_queue_wait(self, queue_wait: QueueWait) -> ContextManager:
+        """Counts the time spent queued behind other threads' arXiv requests, which are made one at a time."""
+        if isinstance(self.client, SerializedClient):
+            return self.client.count_waits(queue_wait)
+        return nullcontext()
 
-        results = []
-        for result in search.results():
-            results.append({
-                'title': result.title,
-                'authors': ', '.join(author.name for author in result.authors),
-                'summary': result.summary,
-                'pdf_url': result.pdf_url,
-                'published': result.published.strftime('%Y-%m-%d'),
-                'updated': result.updated.strftime('%Y-%m-%d')
-            })
-        return [Paper(
+    @staticmethod
+    def _to_paper(result: arxiv.Result) -> Paper:
+        return Paper(
             title=result.title,
             authors=[author.name for author in result.authors],
             url=result.entry_id,
@@ -35,28 +236,77 @@ class ArxivAPI(SearchAPIBase):
             published_date=result.published,
             last_updated_date=result.updated,
             source='arxiv'
-        ) for result in search.results()]
+        )
 
     def get_paper_metadata(self, identifier: str) -> Paper:
-        arxiv_id = self._extract_arxiv_id(identifier)
-        paper = next(arxiv.Search(id_list=[arxiv_id]).results())
+        paper = self.get_papers_metadata([identifier])[identifier]
+        if isinstance(paper, Exception):
+            raise paper
+        return paper
 
-        return Paper(
-            title=paper.title,
-            authors=[author.name for author in paper.authors],
-            url=paper.entry_id,
-            pdf_url=paper.pdf_url,
-            abstract=paper.summary,
-            published_date=paper.published,
-            last_updated_date=paper.updated,
-            source='arxiv'
-        )
+    def get_papers_metadata(self, identifiers: List[str]) -> Dict[str, Union[Paper, Exception]]:
+        """
+        Look the metadata of many papers up with as few requests as possible.
 
-    @staticmethod
-    def download_pdf(identifier: str, save_path: str) -> str:
+        Identifiers are sent in `id_list` queries of up to ID_LIST_CHUNK_SIZE ids. An
+        identifier without a version resolves to the latest version of the paper.
+
+        Args:
+            identifiers (List[str]): ArXiv identifiers or URLs.
+
+        Returns:
+            Dict[str, Union[Paper, Exception]]: For each identifier, its paper, or the exception
+            raised for it (an invalid identifier, a paper not found or a failed request).
+        """
+        results: Dict[str, Union[Paper, Exception]] = {}
+        ids_to_identifiers: Dict[str, List[str]] = {}
+        for identifier in identifiers:
+            try:
+                ids_to_identifiers.setdefault(self._extract_arxiv_id(identifier), []).append(identifier)
+            except ValueError as e:
+                results[identifier] = e
+
+        arxiv_ids = list(ids_to_identifiers)
+        for start in range(0, len(arxiv_ids), ID_LIST_CHUNK_SIZE):
+            chunk = arxiv_ids[start:start + ID_LIST_CHUNK_SIZE]
+            found: Dict[str, Paper] = {}
+            try:
+                for result in self.client.results(arxiv.Search(id_list=chunk, max_results=len(chunk))):
+                    short_id = result.get_short_id()
+                    found[short_id] = found[re.sub(r'v\d+$', '', short_id)] = self._to_paper(result)
+            except Exception as e:
+                for arxiv_id in chunk:
+                    for identifier in ids_to_identifiers[arxiv_id]:
+                        results[identifier] = e
+                continue
+            self.version_index.record(*found)
+            for arxiv_id in chunk:
+                paper = found.get(arxiv_id)
+                for identifier in ids_to_identifiers[arxiv_id]:
+                    results[identifier] = paper if paper is not None else ValueError(f"No arXiv paper found for {identifier}")
+        return results
+
+    def pdf_url(self, identifier: str) -> str:
+        """
+        Build the PDF URL of a paper from its identifier, without an API request.
+
+        An unversioned identifier is pinned to the latest version recorded in the version
+        index; one never seen before gets the unversioned URL, which serves the latest version.
+
+        Args:
+            identifier (str): The ArXiv identifier or URL of the paper.
+
+        Returns:
+            str: The URL of the PDF.
+        """
+        return ARXIV_PDF_URL.format(self.version_index.resolve(self._extract_arxiv_id(identifier)))
+
+    def download_pdf(self, identifier: str, save_path: str) -> str:
         """
         Download a PDF from ArXiv.
 
+        The PDF URL is derived from the identifier, so no metadata request is made.
+
         Args:
             identifier (str): The ArXiv identifier or URL of the paper.
             save_path (str): The path where the PDF should be saved.
@@ -64,19 +314,13 @@ class ArxivAPI(SearchAPIBase):
         Returns:
             str: The path where the PDF was saved.
         """
-        paper_id = ArxivAPI._extract_arxiv_id(identifier)
-        search = arxiv.Search(id_list=[paper_id])
-        result = next(arxiv.Client().results(search))
+        pdf_url = self.pdf_url(identifier)
 
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
         # chech if save_path has .pdf extention or not
         if not save_path.endswith('.pdf'):
             save_path += '.pdf'
 
-        # Download the PDF
-        result.download_pdf(filename=save_path)
-        return save_path
+        return get_downloader().download(pdf_url, save_path)
 
     @staticmethod
     def _extract_arxiv_id(identifier: str) -> str:
@@ -127,7 +371,7 @@ class ArxivAPI(SearchAPIBase):
         import PyPDF2
 
         with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-            ArxivAPI.download_pdf(identifier, temp_file.name)
+            ArxivAPI().download_pdf(identifier, temp_file.name)
 
             with open(temp_file.name, 'rb') as pdf_file:
                 pdf_reader = PyPDF2.PdfReader(pdf_file)
@@ -153,13 +397,20 @@ class ArxivAPI(SearchAPIBase):
         os.makedirs(save_dir, exist_ok=True)
         results = {}
 
+        # PDF URLs are derived from the ids, so the downloads start at once and run concurrently.
+        api = ArxivAPI()
+        jobs = []
         for identifier in identifiers:
             try:
                 paper_id = ArxivAPI._extract_arxiv_id(identifier)
-                save_path = os.path.join(save_dir, f"{paper_id}.pdf")
-                ArxivAPI.download_pdf(identifier, save_path)
-                results[identifier] = save_path
-            except Exception as e:
+            except ValueError as e:
                 results[identifier] = f"Error: {str(e)}"
+                continue
+            jobs.append((identifier, api.pdf_url(paper_id), os.path.join(save_dir, f"{paper_id}.pdf")))
+
+        downloaded = get_downloader().download_many((pdf_url, save_path) for _, pdf_url, save_path in jobs)
+        for identifier, pdf_url, save_path in jobs:
+            outcome = downloaded[pdf_url]
+            results[identifier] = f"Error: {str(outcome)}" if isinstance(outcome, Exception) else outcome
 
         return results
@@ -0,0 +1,235 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class DownloadError(Exception):
+    """Raised when a download cannot be completed or its content fails verification."""
+
+
+# A lock and its number of users for each output path being downloaded in the process.
+_path_locks: Dict[str, List] = {}
+_path_locks_lock = threading.Lock()
+
+
+@contextmanager
+def _output_path_lock(output_path: str) -> Iterator[None]:
+    """Holds the lock of `output_path`, so downloads sharing its `.part` file run one after the other."""
+    key = os.path.realpath(output_path)
+    with _path_locks_lock:
+        entry = _path_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _path_locks_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _path_locks[key]
+
+
+class Downloader:
+    """
+    A download engine shared by everything that fetches PDFs.
+
+    Requests go through one pooled `requests.Session`, so repeated downloads from
+    the same host reuse their connections. At most `max_concurrency` downloads run
+    at a time across all threads. Bodies are streamed in chunks to a `.part` file
+    next to the target and renamed into place only once complete (and verified,
+    when a SHA-256 is given), so a reader never sees a truncated PDF. A download
+    that is interrupted, in this call or an earlier one, resumes from the bytes
+    already in the `.part` file with an HTTP Range request. The ETag or
+    Last-Modified date of the response that started the `.part` file is kept next
+    to it and sent as If-Range, so a resource that changed since is fetched whole
+    instead of appended to the old bytes; a `.part` file without one is not
+    resumed. Downloads to the same path, from any Downloader in the process, run
+    one after the other.
+    """
+
+    def __init__(self, max_concurrency: int = 4, chunk_size: int = 256 * 1024,
+                 timeout: Tuple[float, float] = (10.0, 60.0), max_retries: int = 3):
+        """
+        Initialize the Downloader.
+
+        Args:
+            max_concurrency (int): The maximum number of downloads in flight. Defaults to 4.
+            chunk_size (int): The number of bytes read and written at a time.
+            timeout (Tuple[float, float]): The connect and read timeouts in seconds.
+            max_retries (int): Attempts per download after an interrupted transfer, and retries
+                of failed connections and 429/5xx responses. Defaults to 3.
+        """
+        self.max_concurrency = max_concurrency
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        retry = Retry(total=max_retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset({'GET'}), respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max_concurrency, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = 'autosearch'
+
+    def download(self, url: str, output_path: str, sha256: Optional[str] = None) -> str:
+        """
+        Download `url` to `output_path`, resuming a partial download if there is one.
+
+        Args:
+            url (str): The URL to fetch.
+            output_path (str): Where the file is written.
+            sha256 (Optional[str]): The expected SHA-256 hex digest of the content.
+
+        Returns:
+            str: `output_path`.
+
+        Raises:
+            DownloadError: If the transfer keeps failing or the content does not match `sha256`.
+            requests.HTTPError: If the server answers with an error status.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        part_path = output_path + '.part'
+        validator_path = part_path + '.validator'
+        # Wait for a download to the same path before taking a slot, so waiting does not hold one.
+        with _output_path_lock(output_path):
+            with self._slots:
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        if self._fetch(url, part_path, validator_path):
+                            break
+                    except (requests.ConnectionError, requests.Timeout,
+                            requests.exceptions.ChunkedEncodingError) as e:
+                        if attempt == self.max_retries:
+                            raise DownloadError(f"Download of {url} failed after {attempt + 1} attempts: {str(e)}") from e
+                else:
+                    raise DownloadError(f"Download of {url} was cut short {self.max_retries + 1} times")
+
+            if sha256 is not None:
+                digest = self._hash_file(part_path)
+                if digest != sha256:
+                    self._discard(part_path, validator_path)
+                    raise DownloadError(f"Checksum mismatch for {url}: expected {sha256}, got {digest}")
+            os.replace(part_path, output_path)
+            if os.path.exists(validator_path):
+                os.remove(validator_path)
+        return output_path
+
+    def _fetch(self, url: str, part_path: str, validator_path: str) -> bool:
+        """Fetch the rest of `url` into `part_path`. Returns whether the file is complete."""
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = self._read_validator(validator_path) if offset else None
+        # Identity encoding keeps byte ranges and Content-Length in terms of the file itself.
+        headers = {'Accept-Encoding': 'identity'}
+        if validator:
+            headers['Range'] = f'bytes={offset}-'
+            # The server sends the whole body instead if the resource changed since the part was written.
+            headers['If-Range'] = validator
+        else:
+            offset = 0  # A part that cannot be validated is fetched again.
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if offset and response.status_code == 416:
+                # Nothing left to fetch: the partial file already holds the whole body.
+                total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                if total.isdigit() and int(total) == offset:
+                    return True
+                self._discard(part_path, validator_path)
+                return False
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                if not (offset and response.headers.get('Content-Range', '').startswith(f'bytes {offset}-')
+                        and self._validator(response) == validator):
+                    # A range that does not continue the validated part; start over.
+                    self._discard(part_path, validator_path)
+                    return False
+                mode = 'ab'
+                expected = offset + int(response.headers['Content-Length']) if 'Content-Length' in response.headers else None
+            else:
+                # The server ignored the Range header, or the resource changed; start over.
+                mode = 'wb'
+                expected = int(response.headers['Content-Length']) if 'Content-Length' in response.headers else None
+                self._write_validator(validator_path, self._validator(response))
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(self.chunk_size):
+                    f.write(chunk)
+                written = f.tell()
+        return expected is None or written >= expected
+
+    @staticmethod
+    def _validator(response: requests.Response) -> Optional[str]:
+        """Return the validator If-Range accepts for a response: its strong ETag, or else its Last-Modified date."""
+        etag = response.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return response.headers.get('Last-Modified')
+
+    @staticmethod
+    def _read_validator(validator_path: str) -> Optional[str]:
+        if not os.path.exists(validator_path):
+            return None
+        with open(validator_path, encoding='utf-8') as f:
+            return f.read().strip() or None
+
+    @staticmethod
+    def _write_validator(validator_path: str, validator: Optional[str]):
+        if validator:
+            with open(validator_path, 'w', encoding='utf-8') as f:
+                f.write(validator)
+        elif os.path.exists(validator_path):
+            os.remove(validator_path)
+
+    @staticmethod
+    def _discard(part_path: str, validator_path: str):
+        for path in (part_path, validator_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _hash_file(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def download_many(self, jobs: Iterable[Tuple[str, str]]) -> Dict[str, Union[str, Exception]]:
+        """
+        Download many files concurrently, at most `max_concurrency` at a time.
+
+        Args:
+            jobs (Iterable[Tuple[str, str]]): (url, output_path) pairs.
+
+        Returns:
+            Dict[str, Union[str, Exception]]: For each URL, the path written or the exception raised.
+        """
+        jobs = dict(jobs)  # a URL listed twice is downloaded once
+        if not jobs:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(jobs)), thread_name_prefix="download") as executor:
+            futures = {url: executor.submit(self.download, url, output_path) for url, output_path in jobs.items()}
+        return {url: future.exception() or future.result() for url, future in futures.items()}
+
+    def close(self):
+        self.session.close()
+
+
+_shared_downloader: Optional[Downloader] = None
+_shared_downloader_lock = threading.Lock()
+
+
+def get_downloader() -> Downloader:
+    """Return the Downloader shared by the whole process, creating it on first use."""
+    global _shared_downloader
+    if _shared_downloader is None:
+        with _shared_downloader_lock:
+            if _shared_downloader is None:
+                _shared_downloader = Downloader()
+    return _shared_downloader
@@ -1,56 +1,86 @@
 from scholarly import scholarly
 from .search_api_base import SearchAPIBase
+from .downloader import get_downloader
+from .provider_scheduler import ProviderScheduler, get_scheduler
 from autosearch.data.paper import Paper
-from typing import List
-import os
-import requests
+from typing import Iterator, List, Optional
+import math
+import threading
+import time
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+
+# Google Scholar has no API and blocks clients that query it too often, so every
+# GoogleScholarAPI in the process shares one scheduler with these limits.
+SCHOLAR_REQUESTS_PER_SECOND = 0.2
+SCHOLAR_BURST = 3
+SCHOLAR_FAILURE_THRESHOLD = 3
+SCHOLAR_RESET_TIMEOUT = 300.0
+# Seconds scholarly waits for a single page, which bounds how long a cancelled fetch runs on.
+SCHOLAR_FETCH_TIMEOUT = 10
+# Results on one page of Google Scholar search results.
+RESULTS_PER_PAGE = 10
 
 
 class GoogleScholarAPI(SearchAPIBase):
-    def __init__(self, timeout=30):
+    def __init__(self, timeout=30, scheduler: Optional[ProviderScheduler] = None):
+        """
+        Initialize the GoogleScholarAPI.
+
+        Args:
+            timeout (float): Seconds a search or lookup may take. Defaults to 30.
+            scheduler (Optional[ProviderScheduler]): Paces and guards the requests. Defaults to the shared
+                'google_scholar' scheduler.
+        """
         self.timeout = timeout  # Default timeout of 30 seconds
+        self.scheduler = scheduler if scheduler is not None else get_scheduler(
+            'google_scholar',
+            rate=SCHOLAR_REQUESTS_PER_SECOND,
+            capacity=SCHOLAR_BURST,
+            max_concurrency=1,
+            failure_threshold=SCHOLAR_FAILURE_THRESHOLD,
+            reset_timeout=SCHOLAR_RESET_TIMEOUT,
+        )
+        scholarly.set_timeout(min(int(timeout), SCHOLAR_FETCH_TIMEOUT))
 
     def search(self, query: str, n_results: int = 10) -> List[Paper]:
-        def search_task():
-            search_query = scholarly.search_pubs(query)
-            results = []
-            for _ in range(n_results):
-                try:
-                    pub = next(search_query)
-                    bib = pub.get('bib', {})
-                    authors = bib.get('author', [])
-                    if isinstance(authors, str):
-                        authors = [authors]
-                    elif isinstance(authors, list):
-                        authors = [str(author) for author in authors]
-
-                    paper = Paper(
-                        title=bib.get('title', 'No title available'),
-                        authors=authors,
-                        url=pub.get('pub_url', 'No URL available'),
-                        abstract=bib.get('abstract', 'No abstract available'),
-                        last_updated_date=datetime.strptime(bib.get('year'), "%Y") if bib.get('year') else None,  # type: ignore
-                        published_date=datetime.strptime(bib.get('year'), "%Y") if bib.get('year') else None,  # type: ignore
-                        source='google_scholar',
-                        pdf_url=pub.get('eprint_url')
-                    )
-                    results.append(paper)
-                except StopIteration:
-                    break
-            return results
-
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(search_task)
-            try:
-                return future.result(timeout=self.timeout)
-            except TimeoutError:
-                print(f"Google Scholar search timed out after {self.timeout} seconds.")
-                return []  # Return an empty list if the search times out
+        start = time.monotonic()
+        results = list(self.iter_search(query, n_results))
+        if time.monotonic() - start >= self.timeout:
+            print(f"Google Scholar search timed out after {self.timeout} seconds, returning {len(results)} results.")
+        return results
 
-    def get_paper_metadata(self, identifier: str) -> Paper:
-        pub = next(scholarly.search_pubs(identifier))
+    def iter_search(self, query: str, n_results: int = 10, cancel_event: Optional[threading.Event] = None) -> Iterator[Paper]:
+        """
+        Yield papers as scholarly returns them, stopping once `cancel_event` is set or `timeout` passes.
+
+        The search runs under the shared scheduler: it waits for its share of the rate limit,
+        fails fast with CircuitOpenError while Google Scholar keeps failing, and closes the
+        scholarly generator when it stops early so no further pages are fetched.
+
+        Args:
+            query (str): The search query.
+            n_results (int): The maximum number of results.
+            cancel_event (Optional[threading.Event]): Set by the caller to stop the search.
+
+        Yields:
+            Paper: The matching papers.
+        """
+        pubs = self.scheduler.iterate(
+            lambda: scholarly.search_pubs(query),
+            n_results,
+            cost=math.ceil(n_results / RESULTS_PER_PAGE),
+            cancel_event=cancel_event,
+            deadline=time.monotonic() + self.timeout,
+        )
+        try:
+            for pub in pubs:
+                yield self._to_paper(pub)
+        finally:
+            pubs.close()
+
+    @staticmethod
+    def _to_paper(pub) -> Paper:
         bib = pub.get('bib', {})
         authors = bib.get('author', [])
         if isinstance(authors, str):
@@ -69,19 +99,18 @@ class GoogleScholarAPI(SearchAPIBase):
             pdf_url=pub.get('eprint_url')
         )
 
+    def get_paper_metadata(self, identifier: str) -> Paper:
+        pub = self.scheduler.call(lambda: next(scholarly.search_pubs(identifier), None), deadline=time.monotonic() + self.timeout)
+        if pub is None:
+            raise ValueError(f"No Google Scholar result found for {identifier}")
+        return self._to_paper(pub)
+
     def download_pdf(self, paper: Paper, output_path: str) -> str:
         if not paper.pdf_url:
             raise ValueError(f"No PDF URL found for paper: {paper.title}")
 
-        # Ensure the output directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-        # Download the PDF
-        response = requests.get(paper.pdf_url)
-        response.raise_for_status()
-
-        with open(output_path, 'wb') as f:
-            f.write(response.content)
+        # Stream the PDF to disk through the shared download engine
+        get_downloader().download(paper.pdf_url, output_path)
 
         # Update the paper's local_path
         paper.local_path = output_path
@@ -0,0 +1,292 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+
+class RateLimiter:
+    """
+    A thread-safe token bucket.
+
+    Tokens are added at `rate` per second up to `capacity`; a call takes tokens and
+    waits for them when the bucket is empty. Waits end early when the caller's cancel
+    event is set or its deadline passes.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the RateLimiter.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (Optional[float]): The maximum number of tokens, i.e. the burst size. Defaults to max(1, rate).
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0, cancel_event: Optional[threading.Event] = None,
+                deadline: Optional[float] = None) -> bool:
+        """
+        Take `tokens`, waiting until they are available.
+
+        Args:
+            tokens (float): The number of tokens to take; capped at the capacity.
+            cancel_event (Optional[threading.Event]): Ends the wait when set.
+            deadline (Optional[float]): A time.monotonic() value that ends the wait.
+
+        Returns:
+            bool: True once the tokens are taken, False if the wait was cancelled or timed out.
+        """
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                if deadline <= now:
+                    return False
+                wait = min(wait, deadline - now)
+            if cancel_event is not None:
+                if cancel_event.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing provider.
+
+    After `failure_threshold` consecutive failures the breaker opens and calls are
+    refused for `reset_timeout` seconds. Then one trial call is let through (half
+    open): its success closes the breaker, its failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 120.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return whether a call may go ahead, moving an expired open breaker to half open."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            # A trial that never reported back (cancelled or abandoned) is replaced after reset_timeout too.
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._opened_at = time.monotonic()
+                return True  # the trial call
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class ProviderScheduler:
+    """
+    Paces and guards every call to one search provider across the whole process.
+
+    Calls take tokens from a shared rate limiter, run at most `max_concurrency` at a
+    time and are refused with CircuitOpenError while the circuit breaker is open, so
+    a provider that blocks or throttles us fails fast instead of stalling callers.
+    Paged results are fetched one step at a time: cancellation or the deadline stops
+    the fetch at the next step and closes the provider's generator, rather than
+    leaving it running in an abandoned thread. Errors and deadline overruns count as
+    failures for the breaker.
+    """
+
+    def __init__(self, name: str, rate: float = 0.5, capacity: float = 3.0, max_concurrency: int = 1,
+                 failure_threshold: int = 3, reset_timeout: float = 120.0):
+        """
+        Initialize the ProviderScheduler.
+
+        Args:
+            name (str): The provider name, used in messages.
+            rate (float): Requests per second allowed on average.
+            capacity (float): The burst of requests allowed after an idle period.
+            max_concurrency (int): The number of calls that may run at once.
+            failure_threshold (int): Consecutive failures that open the circuit breaker.
+            reset_timeout (float): Seconds the breaker stays open before a trial call.
+        """
+        self.name = name
+        self.limiter = RateLimiter(rate, capacity)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._metrics = {
+            'calls': 0, 'successes': 0, 'failures': 0, 'timeouts': 0,
+            'cancelled': 0, 'short_circuited': 0, 'in_flight': 0, 'wait_seconds': 0.0,
+        }
+
+    def _count(self, metric: str, amount: float = 1):
+        with self._lock:
+            self._metrics[metric] += amount
+
+    def _admit(self, cost: float, cancel_event: Optional[threading.Event], deadline: Optional[float]) -> bool:
+        """Pass the breaker, take `cost` tokens and a concurrency slot. Returns False if cancelled or timed out."""
+        if not self.breaker.allow():
+            self._count('short_circuited')
+            raise CircuitOpenError(f"{self.name} is unavailable after repeated failures; "
+                                   f"retrying in up to {self.breaker.reset_timeout:.0f} seconds.")
+        self._count('calls')
+        start = time.monotonic()
+        admitted = self.limiter.acquire(cost, cancel_event, deadline)
+        while admitted and not self._slots.acquire(timeout=0.05):
+            admitted = not self._stopped(cancel_event, deadline)
+        self._count('wait_seconds', time.monotonic() - start)
+        if not admitted:
+            # Running out of time in our own queue says nothing about the provider.
+            self._finish_stopped(deadline, blame_provider=False)
+            return False
+        self._count('in_flight')
+        return True
+
+    @staticmethod
+    def _stopped(cancel_event: Optional[threading.Event], deadline: Optional[float]) -> bool:
+        return (cancel_event is not None and cancel_event.is_set()) or (deadline is not None and time.monotonic() >= deadline)
+
+    def _finish_stopped(self, deadline: Optional[float], blame_provider: bool = True):
+        if deadline is not None and time.monotonic() >= deadline:
+            self._count('timeouts')
+            if blame_provider:
+                self.breaker.record_failure()
+        else:
+            self._count('cancelled')
+
+    def _release(self):
+        self._count('in_flight', -1)
+        self._slots.release()
+
+    def call(self, func: Callable[[], T], cost: float = 1.0, cancel_event: Optional[threading.Event] = None,
+             deadline: Optional[float] = None) -> T:
+        """
+        Run a single provider request under the scheduler.
+
+        Args:
+            func (Callable[[], T]): Makes the request.
+            cost (float): The number of requests `func` makes.
+            cancel_event (Optional[threading.Event]): Cancels the call while it waits its turn.
+            deadline (Optional[float]): A time.monotonic() value after which the call gives up waiting.
+
+        Returns:
+            T: The value returned by `func`.
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+            TimeoutError: If the call was cancelled or timed out before it could run.
+        """
+        if not self._admit(cost, cancel_event, deadline):
+            raise TimeoutError(f"{self.name} request was cancelled or timed out before it could run.")
+        try:
+            result = func()
+        except Exception:
+            self._count('failures')
+            self.breaker.record_failure()
+            raise
+        finally:
+            self._release()
+        self._count('successes')
+        self.breaker.record_success()
+        return result
+
+    def iterate(self, factory: Callable[[], Iterator[T]], limit: int, cost: float = 1.0,
+                cancel_event: Optional[threading.Event] = None, deadline: Optional[float] = None) -> Iterator[T]:
+        """
+        Yield up to `limit` items from a paged provider generator under the scheduler.
+
+        Args:
+            factory (Callable[[], Iterator[T]]): Starts the provider's generator.
+            limit (int): The maximum number of items.
+            cost (float): The number of requests the items take.
+            cancel_event (Optional[threading.Event]): Stops the fetch at the next step when set.
+            deadline (Optional[float]): A time.monotonic() value after which the fetch stops.
+
+        Yields:
+            T: The provider's items.
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+        """
+        if not self._admit(cost, cancel_event, deadline):
+            return
+        iterator = None
+        try:
+            for _ in range(limit):
+                if self._stopped(cancel_event, deadline):
+                    self._finish_stopped(deadline)
+                    return
+                try:
+                    if iterator is None:
+                        iterator = factory()
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                except Exception:
+                    self._count('failures')
+                    self.breaker.record_failure()
+                    raise
+                yield item
+            self._count('successes')
+            self.breaker.record_success()
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+            self._release()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return the call counters, the time spent waiting for tokens and slots, and the breaker state."""
+        with self._lock:
+            return dict(self._metrics, state=self.breaker.state)
+
+
+_schedulers: Dict[str, ProviderScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(name: str, **kwargs) -> ProviderScheduler:
+    """
+    Return the process-wide scheduler of a provider, creating it with `kwargs` on first use.
+
+    Args:
+        name (str): The provider name.
+        **kwargs: ProviderScheduler arguments, used only when the scheduler is created.
+
+    Returns:
+        ProviderScheduler: The scheduler.
+    """
+    with _schedulers_lock:
+        if name not in _schedulers:
+            _schedulers[name] = ProviderScheduler(name, **kwargs)
+        return _schedulers[name]
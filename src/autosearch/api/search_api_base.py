@@ -1,5 +1,34 @@
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from contextlib import contextmanager, nullcontext
+from typing import List, Dict, Any, ContextManager, Iterator, Optional
+
+
+class QueueWait:
+    """
+    The time a search has spent waiting for its turn at a provider shared with other searches.
+
+    The provider runs each wait inside `waiting()`; `seconds` includes a wait in progress,
+    so a caller enforcing a deadline can leave the wait out of it while it happens.
+    """
+
+    def __init__(self):
+        self._total = 0.0
+        self._since: Optional[float] = None
+
+    @contextmanager
+    def waiting(self) -> Iterator[None]:
+        self._since = time.monotonic()
+        try:
+            yield
+        finally:
+            self._total += time.monotonic() - self._since
+            self._since = None
+
+    def seconds(self) -> float:
+        since = self._since
+        return self._total + (time.monotonic() - since if since is not None else 0.0)
 
 
 class SearchAPIBase(ABC):
@@ -7,10 +36,39 @@ class SearchAPIBase(ABC):
     def search(self, query: str, n_results: int = 10) -> List[Dict[str, Any]]:
         pass
 
+    def iter_search(self, query: str, n_results: int = 10, cancel_event: Optional[threading.Event] = None) -> Iterator[Any]:
+        """
+        Yield search results one at a time as the provider returns them.
+
+        Providers that can stream override this and stop early once `cancel_event` is set;
+        the default simply yields the results of `search`.
+
+        Args:
+            query (str): The search query.
+            n_results (int): The maximum number of results.
+            cancel_event (Optional[threading.Event]): Set by the caller to ask the search to stop.
+
+        Yields:
+            The search results.
+        """
+        yield from self.search(query, n_results)
+
+    def count_queue_wait(self, queue_wait: QueueWait) -> ContextManager:
+        """
+        Within the returned context, the calling thread's waits for its turn at the provider are added to `queue_wait`.
+
+        Providers that queue requests from concurrent searches, such as arXiv, override this;
+        by default a search never waits.
+
+        Args:
+            queue_wait (QueueWait): Where the waits are counted.
+        """
+        return nullcontext()
+
     @abstractmethod
     def get_paper_metadata(self, identifier: str) -> Dict[str, str]:
         pass
 
     @abstractmethod
     def download_pdf(self, identifier: str, output_path: str) -> str:
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,255 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from autosearch.data.paper import Paper
+from autosearch.database.connection_pool import ConnectionPool
+
+
+# Seconds an entry of each kind is fresh. Search results drift as providers index new
+# papers; the metadata of a given paper hardly ever changes.
+DEFAULT_CACHE_TTLS = {
+    'search': 24 * 3600.0,
+    'metadata': 30 * 24 * 3600.0,
+}
+
+# Recency is only rewritten when an entry was last touched longer ago than this, so
+# most hits are pure reads.
+TOUCH_INTERVAL = 60.0
+
+# arXiv only treats boolean operators as operators in upper case, so they keep their case.
+_QUERY_OPERATORS = {'AND', 'OR', 'NOT', 'ANDNOT'}
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query for use as a cache key: NFKC, case-folded, single spaces."""
+    words = unicodedata.normalize('NFKC', query).split()
+    return ' '.join(word if word in _QUERY_OPERATORS else word.casefold() for word in words)
+
+
+def _paper_to_dict(paper: Paper) -> Dict[str, Any]:
+    # Keep the author list as a list; to_dict joins it with ', ', which does not round-trip.
+    return dict(paper.to_dict(), authors=list(paper.authors))
+
+
+class SearchCache:
+    """
+    A persistent cache of academic search results and paper metadata lookups.
+
+    Entries are stored in their own SQLite file and keyed by the kind of lookup, the
+    provider, the normalized query (the identifier, for metadata) and, for searches,
+    `n_results`. An entry is fresh for the TTL of its kind. For `stale_ttl` seconds
+    after that it is still served, flagged as stale so the caller can refresh it in
+    the background (stale-while-revalidate); older entries are misses. Once the cache
+    holds more than `max_entries`, expired and then least recently used entries are
+    evicted.
+    """
+
+    def __init__(self, db_path: str, ttls: Optional[Dict[str, float]] = None,
+                 stale_ttl: float = 7 * 24 * 3600.0, max_entries: int = 10000):
+        """
+        Initialize the SearchCache.
+
+        Args:
+            db_path (str): The path to the SQLite file holding the cache.
+            ttls (Optional[Dict[str, float]]): Seconds an entry stays fresh, by kind. Overrides DEFAULT_CACHE_TTLS.
+            stale_ttl (float): Seconds past its TTL that an entry is still served while it is refreshed.
+            max_entries (int): The number of entries the cache is trimmed to.
+        """
+        self.db_path = db_path
+        self.ttls = dict(DEFAULT_CACHE_TTLS, **(ttls or {}))
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.pool = ConnectionPool(db_path)
+        self.pool.execute_write(self._create_table)
+
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _create_table(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache(accessed)')
+
+    @staticmethod
+    def key(kind: str, provider: str, query: str, n_results: Optional[int] = None) -> str:
+        """
+        Build the cache key of a lookup.
+
+        Args:
+            kind (str): 'search' or 'metadata'.
+            provider (str): The API name.
+            query (str): The search query, or the paper identifier for metadata.
+            n_results (Optional[int]): The number of results requested from a search.
+
+        Returns:
+            str: The key.
+        """
+        normalized = normalize_query(query) if kind == 'search' else query.strip()
+        return '\x1f'.join((kind, provider, '' if n_results is None else str(n_results), normalized))
+
+    def get(self, kind: str, provider: str, query: str, n_results: Optional[int] = None) -> Optional[Tuple[Any, bool]]:
+        """
+        Look a search or metadata lookup up in the cache.
+
+        Args:
+            kind (str): 'search' or 'metadata'.
+            provider (str): The API name.
+            query (str): The search query, or the paper identifier for metadata.
+            n_results (Optional[int]): The number of results requested from a search.
+
+        Returns:
+            Optional[Tuple[Any, bool]]: The cached list of papers (or paper, for metadata) and
+            whether it is still fresh, or None on a miss.
+        """
+        key = self.key(kind, provider, query, n_results)
+        try:
+            row = self.pool.connection().execute(
+                'SELECT value, created, accessed FROM search_cache WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            # A broken cache must not break searching; treat it as a miss.
+            print(f"Error reading the search cache: {str(e)}")
+            row = None
+        now = time.time()
+        age = now - row['created'] if row is not None else None
+        ttl = self.ttls.get(kind, DEFAULT_CACHE_TTLS['search'])
+        if age is None or age > ttl + self.stale_ttl:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        fresh = age <= ttl
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        if now - row['accessed'] > TOUCH_INTERVAL:
+            try:
+                self.pool.execute_write(
+                    lambda conn: conn.execute('UPDATE search_cache SET accessed = ? WHERE key = ?', (now, key)))
+            except sqlite3.Error as e:
+                print(f"Error writing to the search cache: {str(e)}")
+
+        value = json.loads(row['value'])
+        if isinstance(value, list):
+            return [Paper.from_dict(paper) for paper in value], fresh
+        return Paper.from_dict(value), fresh
+
+    def put(self, kind: str, provider: str, query: str, value: Any, n_results: Optional[int] = None):
+        """
+        Store a list of papers, or a single paper for metadata. Empty results are not stored.
+
+        Args:
+            kind (str): 'search' or 'metadata'.
+            provider (str): The API name.
+            query (str): The search query, or the paper identifier for metadata.
+            value (Any): The papers returned by the provider.
+            n_results (Optional[int]): The number of results requested from a search.
+        """
+        if not value:
+            return
+        try:
+            if isinstance(value, list):
+                data = json.dumps([_paper_to_dict(paper) for paper in value], ensure_ascii=False)
+            else:
+                data = json.dumps(_paper_to_dict(value), ensure_ascii=False)
+        except (AttributeError, TypeError, ValueError) as e:
+            print(f"Not caching {kind} results from {provider} for '{query}': {str(e)}")
+            return
+
+        key = self.key(kind, provider, query, n_results)
+        now = time.time()
+
+        def write(conn: sqlite3.Connection) -> int:
+            conn.execute('INSERT OR REPLACE INTO search_cache (key, kind, provider, value, created, accessed) '
+                         'VALUES (?, ?, ?, ?, ?, ?)', (key, kind, provider, data, now, now))
+            excess = conn.execute('SELECT COUNT(*) FROM search_cache').fetchone()[0] - self.max_entries
+            if excess <= 0:
+                return 0
+            evicted = 0
+            for expired_kind, ttl in self.ttls.items():
+                evicted += conn.execute('DELETE FROM search_cache WHERE kind = ? AND created < ?',
+                                        (expired_kind, now - ttl - self.stale_ttl)).rowcount
+            if evicted < excess:
+                evicted += conn.execute('DELETE FROM search_cache WHERE key IN '
+                                        '(SELECT key FROM search_cache ORDER BY accessed LIMIT ?)',
+                                        (excess - evicted,)).rowcount
+            return evicted
+
+        try:
+            evicted = self.pool.execute_write(write)
+        except sqlite3.Error as e:
+            print(f"Error writing to the search cache: {str(e)}")
+            return
+        if evicted:
+            with self._lock:
+                self.evictions += evicted
+
+    def refresh(self, kind: str, provider: str, query: str, fetch: Callable[[], Any], n_results: Optional[int] = None):
+        """
+        Refresh an entry in a background thread, unless a refresh of it is already running.
+
+        Args:
+            kind (str): 'search' or 'metadata'.
+            provider (str): The API name.
+            query (str): The search query, or the paper identifier for metadata.
+            fetch (Callable[[], Any]): Calls the provider and returns the new value.
+            n_results (Optional[int]): The number of results requested from a search.
+        """
+        key = self.key(kind, provider, query, n_results)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.refreshes += 1
+
+        def run():
+            try:
+                self.put(kind, provider, query, fetch(), n_results)
+            except Exception as e:
+                print(f"Error refreshing cached {kind} results from {provider} for '{query}': {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"search-cache-refresh-{provider}", daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the hit, stale hit, miss, refresh and eviction counters and the hit rate."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        """Remove every entry."""
+        self.pool.execute_write(lambda conn: conn.execute('DELETE FROM search_cache'))
+
+    def close(self):
+        self.pool.close()
@@ -1,55 +1,348 @@
-from typing import List, Dict
+from typing import Any, List, Dict, Iterator, Optional, Tuple, Union
+from contextlib import nullcontext
 import os
-from .arxiv_api import ArxivAPI
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .arxiv_api import ArxivAPI, ArxivVersionIndex
 from .google_scholar_api import GoogleScholarAPI
+from .provider_scheduler import ProviderScheduler
+from .search_api_base import QueueWait, SearchAPIBase
+from .search_cache import SearchCache
+from .downloader import get_downloader
 from autosearch.database.paper_database import PaperDatabase
 from autosearch.data.paper import Paper
 
 
+# Seconds each provider may take in search_all before its partial results are returned.
+DEFAULT_SEARCH_TIMEOUTS = {
+    'arxiv': 30.0,
+    'google_scholar': 30.0,
+}
+
+_DONE = object()
+
+
 class SearchManager:
-    def __init__(self, project_dir):
+    def __init__(self, project_dir, timeouts: Optional[Dict[str, float]] = None, use_cache: bool = True,
+                 paper_db: Optional[PaperDatabase] = None):
+        self.timeouts = dict(DEFAULT_SEARCH_TIMEOUTS, **(timeouts or {}))
+        self.project_dir = project_dir
+        # Pass the project's PaperDatabase to share it; otherwise the manager opens its own.
+        self._owns_paper_db = paper_db is None
+        self.paper_db = paper_db if paper_db is not None else PaperDatabase(self.project_dir)
+        # Search and metadata results persist across SearchManager instances of the project,
+        # as do the arXiv versions seen, which pin PDF downloads to an exact version.
+        cache_path = os.path.join(self.project_dir, 'search_cache.db')
+        self.search_cache = SearchCache(cache_path) if use_cache else None
         self.apis = {
-            'arxiv': ArxivAPI(),
+            'arxiv': ArxivAPI(version_index=ArxivVersionIndex(cache_path)),
             'google_scholar': GoogleScholarAPI(timeout=30),  # Set a 30-second timeout
             # Add more APIs here as they are implemented
         }
-        self.project_dir = project_dir
-        self.paper_db = PaperDatabase(self.project_dir)
 
     def search_all(self, query: str, n_results: int = 10) -> Dict[str, List[Paper]]:
-        results = {}
-        for api_name, api in self.apis.items():
-            try:
-                api_results = api.search(query, n_results)
-                results[api_name] = api_results
-            except Exception as e:
-                print(f"Error searching {api_name}: {str(e)}")
-                results[api_name] = []
+        """
+        Search every provider concurrently.
+
+        A provider that fails or misses its deadline contributes the results it had
+        returned so far, so one slow source no longer delays or empties the others.
+        Results found in the search cache are returned without calling the provider.
+
+        Args:
+            query (str): The search query.
+            n_results (int): The maximum number of results per provider.
+
+        Returns:
+            Dict[str, List[Paper]]: The results of each provider, keyed by API name.
+        """
+        results = {api_name: [] for api_name in self.apis}
+        for api_name, paper in self.search_all_iter(query, n_results):
+            results[api_name].append(paper)
         return results
 
+    def search_all_iter(self, query: str, n_results: int = 10) -> Iterator[Tuple[str, Paper]]:
+        """
+        Search every provider concurrently and yield results as they arrive.
+
+        The results of `search_all_batches`, one at a time.
+
+        Args:
+            query (str): The search query.
+            n_results (int): The maximum number of results per provider.
+
+        Yields:
+            Tuple[str, Paper]: The API name and a paper, in arrival order.
+        """
+        batches = self.search_all_batches(query, n_results)
+        try:
+            for batch in batches:
+                yield from batch
+        finally:
+            batches.close()
+
+    def search_all_batches(self, query: str, n_results: int = 10) -> Iterator[List[Tuple[str, Paper]]]:
+        """
+        Search every provider concurrently and yield results in batches as they arrive.
+
+        Each batch holds every result that arrived since the previous one, so a caller
+        checking results against the database needs one query per batch rather than per
+        paper, without waiting for the slower providers.
+
+        Each provider runs in its own daemon thread with the deadline from `self.timeouts`.
+        Time a provider spends queued behind other searches' requests to it (arXiv serves one
+        request at a time) does not count towards its deadline. When a deadline passes, or the caller stops iterating, the provider is asked to
+        stop through its cancel event and its thread is abandoned rather than waited for.
+        Providers whose results for the query are cached are not called at all; a stale
+        cached result is yielded and refreshed in the background. Only complete results
+        are written to the cache.
+
+        Args:
+            query (str): The search query.
+            n_results (int): The maximum number of results per provider.
+
+        Yields:
+            List[Tuple[str, Paper]]: The API name and paper of each result, in arrival order.
+        """
+        results: "queue.Queue[Tuple[str, object]]" = queue.Queue()
+        cancel_events = {api_name: threading.Event() for api_name in self.apis}
+        start = time.monotonic()
+        deadlines = {api_name: start + self.timeouts.get(api_name, 30.0) for api_name in self.apis}
+        queue_waits = {api_name: QueueWait() for api_name in self.apis}
+
+        def deadline(api_name: str) -> float:
+            return deadlines[api_name] + queue_waits[api_name].seconds()
+
+        cached = {}
+        for api_name, api in self.apis.items():
+            papers = self._cached_search(api_name, api, query, n_results)
+            if papers is not None:
+                cached[api_name] = papers
+                continue
+            threading.Thread(
+                target=self._run_search,
+                args=(api_name, api, query, n_results, cancel_events[api_name], queue_waits[api_name], results),
+                name=f"search-{api_name}",
+                daemon=True
+            ).start()
+
+        pending = set(self.apis) - set(cached)
+        try:
+            cached_batch = [(api_name, paper) for api_name, papers in cached.items() for paper in papers]
+            if cached_batch:
+                yield cached_batch
+            while pending:
+                timeout = min(deadline(api_name) for api_name in pending) - time.monotonic()
+                try:
+                    arrived = [results.get(timeout=max(timeout, 0))]
+                except queue.Empty:
+                    now = time.monotonic()
+                    for api_name in [name for name in pending if deadline(name) <= now]:
+                        print(f"Search on {api_name} timed out after {self.timeouts.get(api_name, 30.0)} seconds, keeping partial results.")
+                        cancel_events[api_name].set()
+                        pending.discard(api_name)
+                    continue
+                # Take whatever else is already waiting.
+                while True:
+                    try:
+                        arrived.append(results.get_nowait())
+                    except queue.Empty:
+                        break
+                batch = []
+                for api_name, item in arrived:
+                    if api_name not in pending:
+                        continue  # Late result from a provider that already timed out.
+                    if item is _DONE:
+                        pending.discard(api_name)
+                    elif isinstance(item, Exception):
+                        print(f"Error searching {api_name}: {str(item)}")
+                    else:
+                        batch.append((api_name, item))
+                if batch:
+                    yield batch
+        finally:
+            for cancel_event in cancel_events.values():
+                cancel_event.set()
+
+    def _cached_search(self, api_name: str, api, query: str, n_results: int) -> Optional[List[Paper]]:
+        if self.search_cache is None:
+            return None
+        entry = self.search_cache.get('search', api_name, query, n_results)
+        if entry is None:
+            return None
+        papers, fresh = entry
+        if not fresh:
+            self.search_cache.refresh('search', api_name, query,
+                                      lambda: list(self._iter_provider(api, query, n_results)), n_results)
+        return papers
+
+    @staticmethod
+    def _iter_provider(api, query: str, n_results: int, cancel_event: Optional[threading.Event] = None):
+        if isinstance(api, SearchAPIBase):
+            return api.iter_search(query, n_results, cancel_event)
+        return api.search(query, n_results)
+
+    def _run_search(self, api_name: str, api, query: str, n_results: int, cancel_event: threading.Event,
+                    queue_wait: QueueWait, results: queue.Queue):
+        try:
+            papers = []
+            with api.count_queue_wait(queue_wait) if isinstance(api, SearchAPIBase) else nullcontext():
+                for paper in self._iter_provider(api, query, n_results, cancel_event):
+                    if cancel_event.is_set():
+                        break
+                    papers.append(paper)
+                    results.put((api_name, paper))
+            if self.search_cache is not None and not cancel_event.is_set():
+                self.search_cache.put('search', api_name, query, papers, n_results)
+        except Exception as e:
+            results.put((api_name, e))
+        finally:
+            results.put((api_name, _DONE))
+
     def get_paper_metadata(self, identifier: str, api_name: str) -> Paper:
         if api_name not in self.apis:
             raise ValueError(f"Unknown API: {api_name}")
-        return self.apis[api_name].get_paper_metadata(identifier)
+        api = self.apis[api_name]
+        if self.search_cache is None:
+            return api.get_paper_metadata(identifier)
 
-    def download_pdf(self, paper: Paper, output_dir: str) -> str:
+        entry = self.search_cache.get('metadata', api_name, identifier)
+        if entry is not None:
+            paper, fresh = entry
+            if not fresh:
+                self.search_cache.refresh('metadata', api_name, identifier, lambda: api.get_paper_metadata(identifier))
+            return paper
+        paper = api.get_paper_metadata(identifier)
+        self.search_cache.put('metadata', api_name, identifier, paper)
+        return paper
+
+    def get_papers_metadata(self, identifiers: List[str], api_name: str) -> Dict[str, Union[Paper, Exception]]:
+        """
+        Look the metadata of many papers up on one provider.
+
+        Cached papers are returned without a request. The rest are fetched in one batch
+        when the provider supports it (`get_papers_metadata`), one at a time otherwise.
+
+        Args:
+            identifiers (List[str]): The paper identifiers or URLs.
+            api_name (str): The provider to ask.
+
+        Returns:
+            Dict[str, Union[Paper, Exception]]: For each identifier, its paper or the exception raised for it.
+        """
+        if api_name not in self.apis:
+            raise ValueError(f"Unknown API: {api_name}")
+        api = self.apis[api_name]
+        results: Dict[str, Union[Paper, Exception]] = {}
+        missing = []
+        for identifier in dict.fromkeys(identifiers):
+            entry = self.search_cache.get('metadata', api_name, identifier) if self.search_cache is not None else None
+            if entry is None:
+                missing.append(identifier)
+                continue
+            paper, fresh = entry
+            if not fresh:
+                self.search_cache.refresh('metadata', api_name, identifier,
+                                          lambda identifier=identifier: api.get_paper_metadata(identifier))
+            results[identifier] = paper
+
+        if missing and hasattr(api, 'get_papers_metadata'):
+            fetched = api.get_papers_metadata(missing)
+        else:
+            fetched = {}
+            for identifier in missing:
+                try:
+                    fetched[identifier] = api.get_paper_metadata(identifier)
+                except Exception as e:
+                    fetched[identifier] = e
+        for identifier, paper in fetched.items():
+            if self.search_cache is not None and not isinstance(paper, Exception):
+                self.search_cache.put('metadata', api_name, identifier, paper)
+            results[identifier] = paper
+        return results
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Return the search cache counters, or an empty dict when caching is disabled."""
+        return self.search_cache.stats() if self.search_cache is not None else {}
+
+    def provider_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the scheduler metrics of each provider that runs under a ProviderScheduler.
+
+        Schedulers are shared by the process, so the counts cover every SearchManager.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Call, failure, timeout and short-circuit counts, time spent
+            waiting and the circuit breaker state, keyed by API name.
+        """
+        return {api_name: api.scheduler.metrics() for api_name, api in self.apis.items()
+                if isinstance(getattr(api, 'scheduler', None), ProviderScheduler)}
+
+    @staticmethod
+    def pdf_filename(paper: Paper) -> str:
+        """Return the file name a paper's PDF is saved under: the last part of its URL, ending in .pdf."""
+        filename = paper.url.rstrip('/').split('/')[-1]
+        return filename if filename.endswith('.pdf') else f"{filename}.pdf"
+
+    def download_pdf(self, paper: Paper, output_dir: str, sha256: Optional[str] = None) -> str:
+        """
+        Download the PDF of a paper into `output_dir`.
+
+        A paper whose `pdf_url` is known is fetched straight through the shared download
+        engine; otherwise its provider resolves and downloads the PDF.
+
+        Args:
+            paper (Paper): The paper.
+            output_dir (str): The directory the PDF is saved in.
+            sha256 (Optional[str]): The expected SHA-256 of the PDF, when already known.
+
+        Returns:
+            str: The path of the downloaded PDF.
+        """
         if paper.source not in self.apis:
             raise ValueError(f"Unknown API: {paper.source}")
-        filename = paper.url.split('/')[-1]
-        return self.apis[paper.source].download_pdf(paper.url, os.path.join(output_dir, f"{filename}.pdf"))
+        output_path = os.path.join(output_dir, self.pdf_filename(paper))
+        if paper.pdf_url:
+            return get_downloader().download(paper.pdf_url, output_path, sha256)
+        return self.apis[paper.source].download_pdf(paper.url, output_path)
+
+    def download_pdfs(self, papers: List[Paper], output_dir: str) -> List[Union[str, Exception]]:
+        """
+        Download the PDFs of many papers concurrently.
+
+        Args:
+            papers (List[Paper]): The papers.
+            output_dir (str): The directory the PDFs are saved in.
+
+        Returns:
+            List[Union[str, Exception]]: For each paper, the path of its PDF or the exception raised.
+        """
+        if not papers:
+            return []
+        with ThreadPoolExecutor(max_workers=get_downloader().max_concurrency, thread_name_prefix="download") as executor:
+            futures = [executor.submit(self.download_pdf, paper, output_dir) for paper in papers]
+        return [future.exception() or future.result() for future in futures]
 
     def search_and_download(self, query: str, n_results: int = 10, output_dir: str = "./downloads") -> Dict[str, List[Paper]]:
         search_results = self.search_all(query, n_results)
-        downloaded_results = {}
+        downloaded_results = {api_name: [] for api_name in search_results}
 
-        for api_name, results in search_results.items():
-            downloaded_results[api_name] = []
-            for paper in results:
-                try:
-                    pdf_path = self.download_pdf(paper, output_dir)
-                    paper.local_path = pdf_path
-                    downloaded_results[api_name].append(paper)
-                except Exception as e:
-                    print(f"Error downloading PDF for {paper.title} from {api_name}: {str(e)}")
+        found = [(api_name, paper) for api_name, results in search_results.items() for paper in results]
+        outcomes = self.download_pdfs([paper for _, paper in found], output_dir)
+        for (api_name, paper), outcome in zip(found, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Error downloading PDF for {paper.title} from {api_name}: {str(outcome)}")
+                continue
+            paper.local_path = outcome
+            downloaded_results[api_name].append(paper)
 
         return downloaded_results
+
+    def close(self):
+        """Close the search cache, the arXiv version index and, unless it was passed in, the PaperDatabase."""
+        if self.search_cache is not None:
+            self.search_cache.close()
+        self.apis['arxiv'].version_index.close()
+        if self._owns_paper_db:
+            self.paper_db.close()
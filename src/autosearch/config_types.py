@@ -2,6 +2,8 @@
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
+from autosearch.services import ProjectServices, get_project_services
+
 
 @dataclass
 class ProjectConfig:
@@ -13,3 +15,8 @@ class ProjectConfig:
     initiate_db: bool
     functions: Optional[Any] = None
     logging_session_id: Optional[str] = None
+
+    @property
+    def services(self) -> ProjectServices:
+        """The project's shared services, such as its SearchManager, built on first use."""
+        return get_project_services(self.project_dir)
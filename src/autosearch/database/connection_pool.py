@@ -0,0 +1,153 @@
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Pragmas applied to every connection. journal_mode=WAL is persistent in the
+# database file, the rest are per-connection settings.
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -16000,  # negative values are KiB, i.e. ~16 MB of page cache
+    "mmap_size": 64 * 1024 * 1024,
+    "foreign_keys": "ON",
+}
+
+
+class ConnectionPool:
+    """
+    A thread-aware pool of SQLite connections for a single database file.
+
+    Every thread gets its own long-lived read connection, so repeated lookups
+    from ThreadPoolExecutor workers no longer pay for `sqlite3.connect` on each
+    call. All writes are funnelled through one writer thread that owns the only
+    write connection, which removes "database is locked" contention between
+    writers. With WAL journaling, readers never block the writer and vice versa.
+    """
+
+    def __init__(self, db_path: str, pragmas: Optional[Dict[str, Any]] = None, busy_timeout: float = 30.0):
+        """
+        Initialize the ConnectionPool.
+
+        Args:
+            db_path (str): The path to the SQLite database file.
+            pragmas (Optional[Dict[str, Any]]): Pragmas to apply to each connection. Defaults to DEFAULT_PRAGMAS.
+            busy_timeout (float): Seconds a connection waits on a lock before raising. Defaults to 30.
+        """
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.busy_timeout = busy_timeout
+
+        self._local = threading.local()
+        self._readers: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._readers_lock = threading.Lock()
+
+        self._write_queue: "queue.Queue[Optional[Tuple[Callable[[sqlite3.Connection], Any], Future]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Return the read connection owned by the calling thread, creating it on first use.
+
+        Returns:
+            sqlite3.Connection: A connection that must only be used from the calling thread.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool.")
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._readers_lock:
+                self._prune_readers()
+                self._readers.append((threading.current_thread(), conn))
+        return conn
+
+    def _prune_readers(self):
+        """Close connections whose owning threads have exited (e.g. finished executor workers)."""
+        alive = []
+        for thread, conn in self._readers:
+            if thread.is_alive():
+                alive.append((thread, conn))
+            else:
+                conn.close()
+        self._readers = alive
+
+    def execute_write(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """
+        Run `func` on the writer connection inside a single transaction and wait for the result.
+
+        The transaction is committed if `func` returns normally and rolled back if it raises,
+        in which case the exception is re-raised in the calling thread. `func` must not return
+        cursors or other objects bound to the writer connection.
+
+        Args:
+            func (Callable[[sqlite3.Connection], T]): The function performing the writes.
+
+        Returns:
+            T: The value returned by `func`.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed connection pool.")
+        if threading.current_thread() is self._writer:
+            # Nested write issued from inside a write job; run it inline.
+            return func(self._writer_conn)
+        self._ensure_writer()
+        future: Future = Future()
+        self._write_queue.put((func, future))
+        return future.result()
+
+    def _ensure_writer(self):
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer_conn = self._connect()
+                self._writer = threading.Thread(target=self._writer_loop, name="paper-db-writer", daemon=True)
+                self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            job = self._write_queue.get()
+            if job is None:
+                break
+            func, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                with self._writer_conn:
+                    result = func(self._writer_conn)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        self._writer_conn.close()
+
+    def close(self):
+        """Stop the writer thread and close every connection held by the pool."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._writer_lock:
+            if self._writer is not None:
+                self._write_queue.put(None)
+                self._writer.join()
+                self._writer = None
+        with self._readers_lock:
+            for _, conn in self._readers:
+                conn.close()
+            self._readers = []
+        self._local = threading.local()
@@ -0,0 +1,142 @@
+import sqlite3
+from typing import Callable, List, Tuple
+
+PAPER_TABLES = ('read_abstracts', 'read_papers')
+
+
+def split_authors(authors: str) -> List[str]:
+    """Split the comma-joined authors column into individual names, as Paper.from_dict does."""
+    return [author.strip() for author in (authors or '').split(', ') if author.strip()]
+
+
+def author_key(author: str) -> str:
+    """Normalize an author name for indexed, case-insensitive lookups."""
+    return ' '.join(author.split()).lower()
+
+
+def _create_paper_tables(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS read_abstracts (
+            url TEXT PRIMARY KEY,
+            title TEXT,
+            authors TEXT,
+            published_date TEXT,
+            last_updated_date TEXT,
+            source TEXT,
+            abstract TEXT,
+            summary TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS read_papers (
+            url TEXT PRIMARY KEY,
+            title TEXT,
+            authors TEXT,
+            published_date TEXT,
+            last_updated_date TEXT,
+            local_path TEXT,
+            source TEXT,
+            abstract TEXT,
+            summary TEXT
+        )
+    ''')
+    # Databases created before abstracts were stored lack these columns.
+    for table_name in PAPER_TABLES:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+        for column in ('abstract', 'summary'):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {column} TEXT")
+
+
+def _create_secondary_indexes(conn: sqlite3.Connection):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_read_papers_local_path ON read_papers(local_path)")
+    for table_name in PAPER_TABLES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_published_date ON {table_name}(published_date)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_source ON {table_name}(source)")
+
+
+def _create_paper_authors(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS paper_authors (
+            table_name TEXT NOT NULL,
+            url TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            author TEXT NOT NULL,
+            author_key TEXT NOT NULL,
+            PRIMARY KEY (table_name, url, position)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_paper_authors_author_key ON paper_authors(author_key, table_name)")
+    for table_name in PAPER_TABLES:
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_authors_delete AFTER DELETE ON {table_name} BEGIN
+                DELETE FROM paper_authors WHERE table_name = '{table_name}' AND url = old.url;
+            END
+        ''')
+        # Backfill from the comma-joined authors column.
+        rows = conn.execute(f"SELECT url, authors FROM {table_name}").fetchall()
+        conn.executemany(
+            "INSERT OR REPLACE INTO paper_authors (table_name, url, position, author, author_key) VALUES (?, ?, ?, ?, ?)",
+            [
+                (table_name, url, position, author, author_key(author))
+                for url, authors in rows
+                for position, author in enumerate(split_authors(authors))
+            ]
+        )
+
+
+def _create_pdf_hashes(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS pdf_hashes (
+            location TEXT PRIMARY KEY,
+            sha256 TEXT NOT NULL,
+            added_date TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pdf_hashes_sha256 ON pdf_hashes(sha256)")
+
+
+# Ordered schema migrations. Each entry is (version, description, function); a
+# database at PRAGMA user_version N gets every migration with version > N applied,
+# each in its own transaction. Append new migrations, never edit released ones.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "paper tables with abstract and summary columns", _create_paper_tables),
+    (2, "indexes on local_path, published_date and source", _create_secondary_indexes),
+    (3, "normalized paper_authors table", _create_paper_authors),
+    (4, "URL/path to PDF content hash index", _create_pdf_hashes),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Upgrade the database in place to the latest schema version.
+
+    Args:
+        conn (sqlite3.Connection): A connection with no open transaction.
+
+    Returns:
+        int: The schema version after migrating.
+    """
+    for version, description, func in MIGRATIONS:
+        if get_schema_version(conn) >= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the write lock.
+            applied = get_schema_version(conn) < version
+            if applied:
+                func(conn)
+                conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        if applied:
+            print(f"Migrated paper database to schema version {version}: {description}")
+    return get_schema_version(conn)
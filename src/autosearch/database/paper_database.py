@@ -1,10 +1,49 @@
 import sqlite3
 import os
-from typing import List, Optional
+import json
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Union
 from autosearch.data.paper import Paper
+from autosearch.database.connection_pool import ConnectionPool
+from autosearch.database.migrations import PAPER_TABLES, author_key, migrate, split_authors
+
+
+# Columns indexed by the full-text tables, in order, with their BM25 weights.
+FTS_COLUMNS = ('title', 'authors', 'abstract', 'summary')
+FTS_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
 
 
 class PaperDatabase:
+    _INSERT_QUERIES = {
+        'read_abstracts': '''
+            INSERT INTO read_abstracts
+            (url, title, authors, published_date, last_updated_date, source, abstract, summary)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                title = excluded.title,
+                authors = excluded.authors,
+                published_date = excluded.published_date,
+                last_updated_date = excluded.last_updated_date,
+                source = excluded.source,
+                abstract = excluded.abstract,
+                summary = excluded.summary
+        ''',
+        'read_papers': '''
+            INSERT INTO read_papers
+            (url, title, authors, published_date, last_updated_date, local_path, source, abstract, summary)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                title = excluded.title,
+                authors = excluded.authors,
+                published_date = excluded.published_date,
+                last_updated_date = excluded.last_updated_date,
+                local_path = excluded.local_path,
+                source = excluded.source,
+                abstract = excluded.abstract,
+                summary = excluded.summary
+        ''',
+    }
+
     def __init__(self, project_dir: str):
         """
         Initialize the PaperDatabase.
@@ -15,72 +54,129 @@ class PaperDatabase:
         self.project_dir = project_dir
         os.makedirs(project_dir, exist_ok=True)
         self.db_path = os.path.join(project_dir, 'papers.db')
+        self.pool = ConnectionPool(self.db_path)
+        self.fts_enabled = False
         self._init_db()
 
     def _init_db(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS read_abstracts (
-                url TEXT PRIMARY KEY,
-                title TEXT,
-                authors TEXT,
-                published_date TEXT,
-                last_updated_date TEXT,
-                source TEXT
-            )
-        ''')
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS read_papers (
-                url TEXT PRIMARY KEY,
-                title TEXT,
-                authors TEXT,
-                published_date TEXT,
-                last_updated_date TEXT,
-                local_path TEXT,
-                source TEXT
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        self.pool.execute_write(migrate)
+        try:
+            self.pool.execute_write(self._create_fts_tables)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search is unavailable, falling back to LIKE search: {e}")
+
+    @staticmethod
+    def _create_fts_tables(conn: sqlite3.Connection):
+        """Create one external-content FTS5 index per paper table, kept in sync by triggers."""
+        columns = ', '.join(FTS_COLUMNS)
+        new_values = ', '.join(f"new.{column}" for column in FTS_COLUMNS)
+        old_values = ', '.join(f"old.{column}" for column in FTS_COLUMNS)
+        for table_name in PAPER_TABLES:
+            fts_name = f"{table_name}_fts"
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_name,)
+            ).fetchone()
+            conn.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts_name} USING fts5(
+                    {columns}, content='{table_name}', content_rowid='rowid', tokenize='porter unicode61'
+                )
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table_name}_fts_insert AFTER INSERT ON {table_name} BEGIN
+                    INSERT INTO {fts_name}(rowid, {columns}) VALUES (new.rowid, {new_values});
+                END
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table_name}_fts_delete AFTER DELETE ON {table_name} BEGIN
+                    INSERT INTO {fts_name}({fts_name}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+                END
+            ''')
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table_name}_fts_update AFTER UPDATE ON {table_name} BEGIN
+                    INSERT INTO {fts_name}({fts_name}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+                    INSERT INTO {fts_name}(rowid, {columns}) VALUES (new.rowid, {new_values});
+                END
+            ''')
+            if not exists:
+                # Index rows that were stored before the FTS table existed.
+                conn.execute(f"INSERT INTO {fts_name}({fts_name}) VALUES ('rebuild')")
+
+    def close(self):
+        """Close all pooled connections. The database cannot be used afterwards."""
+        self.pool.close()
+
+    def _write(self, query: str, params=(), many: bool = False):
+        """Run a single write statement through the pool's writer queue."""
+        def run(conn: sqlite3.Connection):
+            # Cursors are deliberately not returned: they belong to the writer thread.
+            if many:
+                conn.executemany(query, params)
+            else:
+                conn.execute(query, params)
+
+        self.pool.execute_write(run)
+
+    @staticmethod
+    def _paper_params(table_name: str, paper: Paper) -> tuple:
+        params = (
+            paper.url,
+            paper.title,
+            ', '.join(paper.authors),
+            paper.published_date.isoformat() if paper.published_date else '',
+            paper.last_updated_date.isoformat() if paper.last_updated_date else '',
+        )
+        if table_name == 'read_papers':
+            params += (paper.local_path,)
+        return params + (paper.source, paper.abstract, paper.summary)
 
     def add_paper(self, table_name: str, paper: Paper):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-
-        if table_name == 'read_abstracts':
-            c.execute('''
-                INSERT OR REPLACE INTO read_abstracts
-                (url, title, authors, published_date, last_updated_date, source)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                paper.url,
-                paper.title,
-                ', '.join(paper.authors),
-                paper.published_date.isoformat() if paper.published_date else '',
-                paper.last_updated_date.isoformat() if paper.last_updated_date else '',
-                paper.source
-            ))
-        elif table_name == 'read_papers':
-            c.execute('''
-                INSERT OR REPLACE INTO read_papers
-                (url, title, authors, published_date, last_updated_date, local_path, source)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                paper.url,
-                paper.title,
-                ', '.join(paper.authors),
-                paper.published_date.isoformat() if paper.published_date else '',
-                paper.last_updated_date.isoformat() if paper.last_updated_date else '',
-                paper.local_path,
-                paper.source
-            ))
-        else:
-            conn.close()
+        self.add_papers(table_name, [paper])
+
+    def add_papers(self, table_name: str, papers: Iterable[Paper]) -> int:
+        """
+        Insert or replace several papers in the specified table in a single transaction.
+
+        Args:
+            table_name (str): The name of the table to insert into.
+            papers (Iterable[Paper]): The papers to insert.
+
+        Returns:
+            int: The number of papers written.
+        """
+        if table_name not in self._INSERT_QUERIES:
             raise ValueError(f"Invalid table name: {table_name}")
+        papers = list(papers)
+        if not papers:
+            return 0
+        query = self._INSERT_QUERIES[table_name]
+        rows = [self._paper_params(table_name, paper) for paper in papers]
+        # The last occurrence of a URL wins, matching the upsert.
+        authors = list({paper.url: paper.authors for paper in papers}.items())
+
+        def run(conn: sqlite3.Connection):
+            conn.executemany(query, rows)
+            self._sync_authors(conn, table_name, authors)
+
+        self.pool.execute_write(run)
+        return len(rows)
 
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def _sync_authors(conn: sqlite3.Connection, table_name: str, authors: List[tuple]):
+        """Replace the paper_authors rows for the given (url, author list) pairs."""
+        conn.executemany(
+            "DELETE FROM paper_authors WHERE table_name = ? AND url = ?",
+            [(table_name, url) for url, _ in authors]
+        )
+        conn.executemany(
+            "INSERT INTO paper_authors (table_name, url, position, author, author_key) VALUES (?, ?, ?, ?, ?)",
+            [
+                (table_name, url, position, author.strip(), author_key(author))
+                for url, names in authors
+                for position, author in enumerate(names)
+                if author.strip()
+            ]
+        )
 
     def check_paper(self, url: str, table_name: str) -> bool:
         """
@@ -93,12 +189,29 @@ class PaperDatabase:
         Returns:
             bool: True if the paper exists, False otherwise.
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(f"SELECT url FROM {table_name} WHERE url = ?", (url,))
-        result = c.fetchone()
-        conn.close()
-        return result is not None
+        c = self.pool.connection().execute(f"SELECT url FROM {table_name} WHERE url = ?", (url,))
+        return c.fetchone() is not None
+
+    def filter_unseen(self, urls: Iterable[str], table_name: str) -> List[str]:
+        """
+        Return the URLs that are not yet in the specified table, answered with a single query.
+
+        Args:
+            urls (Iterable[str]): The paper URLs to check.
+            table_name (str): The name of the table to check in.
+
+        Returns:
+            List[str]: The unseen URLs, de-duplicated, in their original order.
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        if not urls:
+            return []
+        # json_each binds the whole batch as one parameter, which sidesteps SQLite's host-parameter limit.
+        c = self.pool.connection().execute(
+            f"SELECT url FROM {table_name} WHERE url IN (SELECT value FROM json_each(?))", (json.dumps(urls),)
+        )
+        seen = {row[0] for row in c.fetchall()}
+        return [url for url in urls if url not in seen]
 
     def check_paper_by_localpath(self, local_path: str) -> bool:
         """
@@ -110,12 +223,8 @@ class PaperDatabase:
         Returns:
             bool: True if the paper exists, False otherwise.
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute("SELECT local_path FROM read_papers WHERE local_path = ?", (local_path,))
-        result = c.fetchone()
-        conn.close()
-        return result is not None
+        c = self.pool.connection().execute("SELECT local_path FROM read_papers WHERE local_path = ?", (local_path,))
+        return c.fetchone() is not None
 
     def get_paper_info(self, url: str, table_name: str) -> Optional[Paper]:
         """
@@ -128,35 +237,23 @@ class PaperDatabase:
         Returns:
             Optional[Paper]: A dictionary containing paper information if found, None otherwise.
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        if table_name == 'read_abstracts':
-            c.execute("SELECT * FROM read_abstracts WHERE url = ?", (url,))
-            result = c.fetchone()
-            if result:
-                return Paper.from_dict({
-                    'url': result[0],
-                    'title': result[1],
-                    'authors': result[2],
-                    'published_date': result[3],
-                    'last_updated_date': result[4],
-                    'source': result[5],
-                    'local_path': result[5] if table_name == 'read_papers' else None
-                })
-        elif table_name == 'read_papers':
-            c.execute("SELECT * FROM read_papers WHERE url = ?", (url,))
-            result = c.fetchone()
-            if result:
-                return Paper.from_dict({
-                    'url': result[0],
-                    'title': result[1],
-                    'authors': result[2],
-                    'published_date': result[3],
-                    'last_updated_date': result[4],
-                    'source': result[5],
-                    'local_path': result[5] if table_name == 'read_papers' else None
-                })
+        if table_name not in PAPER_TABLES:
             return None
+        c = self.pool.connection().execute(f"SELECT * FROM {table_name} WHERE url = ?", (url,))
+        result = c.fetchone()
+        if result:
+            return Paper.from_dict({
+                'url': result['url'],
+                'title': result['title'],
+                'authors': result['authors'],
+                'published_date': result['published_date'],
+                'last_updated_date': result['last_updated_date'],
+                'source': result['source'],
+                'local_path': result['local_path'] if table_name == 'read_papers' else None,
+                'abstract': result['abstract'],
+                'summary': result['summary']
+            })
+        return None
 
     def count_papers(self, table_name: str) -> int:
         """
@@ -168,11 +265,8 @@ class PaperDatabase:
         Returns:
             int: The number of papers in the table.
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(f"SELECT COUNT(*) FROM {table_name}")
+        c = self.pool.connection().execute(f"SELECT COUNT(*) FROM {table_name}")
         result = c.fetchone()
-        conn.close()
         return result[0] if result else 0
 
     def get_all_papers(self, table_name: str) -> List[dict]:
@@ -185,37 +279,10 @@ class PaperDatabase:
         Returns:
             List[dict]: A list of dictionaries containing paper information.
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        if table_name == 'read_abstracts':
-            c.execute("SELECT * FROM read_abstracts")
-            return [
-                {
-                    'url': row[0],
-                    'title': row[1],
-                    'authors': row[2],
-                    'published_date': row[3],
-                    'last_updated_date': row[4],
-                    'source': row[5]
-                }
-                for row in c.fetchall()
-            ]
-        elif table_name == 'read_papers':
-            c.execute("SELECT * FROM read_papers")
-            return [
-                {
-                    'url': row[0],
-                    'title': row[1],
-                    'authors': row[2],
-                    'published_date': row[3],
-                    'last_updated_date': row[4],
-                    'local_path': row[5],
-                    'source': row[6]
-                }
-                for row in c.fetchall()
-            ]
-        conn.close()
-        return []
+        if table_name not in PAPER_TABLES:
+            return []
+        c = self.pool.connection().execute(f"SELECT * FROM {table_name}")
+        return [self._row_to_dict(row, table_name) for row in c.fetchall()]
 
     def update_paper(self, url: str, table_name: str, update_data: dict):
         """
@@ -226,13 +293,18 @@ class PaperDatabase:
             table_name (str): The name of the table to update in.
             update_data (dict): A dictionary containing the fields to update.
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
         update_fields = ', '.join([f"{key} = ?" for key in update_data.keys()])
         query = f"UPDATE {table_name} SET {update_fields} WHERE url = ?"
-        c.execute(query, list(update_data.values()) + [url])
-        conn.commit()
-        conn.close()
+        params = list(update_data.values()) + [url]
+
+        def run(conn: sqlite3.Connection):
+            conn.execute(query, params)
+            if 'authors' in update_data and table_name in PAPER_TABLES:
+                authors = update_data['authors']
+                names = split_authors(authors) if isinstance(authors, str) else list(authors or [])
+                self._sync_authors(conn, table_name, [(url, names)])
+
+        self.pool.execute_write(run)
 
     def delete_paper(self, url: str, table_name: str):
         """
@@ -242,54 +314,186 @@ class PaperDatabase:
             url (str): The URL of the paper to delete.
             table_name (str): The name of the table to delete from.
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(f"DELETE FROM {table_name} WHERE url = ?", (url,))
-        conn.commit()
-        conn.close()
+        self._write(f"DELETE FROM {table_name} WHERE url = ?", (url,))
 
-    def search_papers(self, table_name: str, search_term: str) -> List[dict]:
+    def papers_by_author(self, author: str, table_name: str = 'read_papers') -> List[dict]:
+        """
+        Retrieve the papers written by an author, using the paper_authors index.
+
+        Args:
+            author (str): The author's full name. Matching ignores case and extra whitespace.
+            table_name (str): The name of the table to retrieve papers from. Defaults to 'read_papers'.
+
+        Returns:
+            List[dict]: A list of dictionaries containing paper information, newest first.
+        """
+        if table_name not in PAPER_TABLES:
+            return []
+        c = self.pool.connection().execute(f'''
+            SELECT p.* FROM paper_authors AS a
+            JOIN {table_name} AS p ON p.url = a.url
+            WHERE a.author_key = ? AND a.table_name = ?
+            ORDER BY p.published_date DESC
+        ''', (author_key(author), table_name))
+        return [self._row_to_dict(row, table_name) for row in c.fetchall()]
+
+    def papers_between(self, date_from: Optional[Union[str, date, datetime]] = None,
+                       date_to: Optional[Union[str, date, datetime]] = None,
+                       table_name: str = 'read_papers') -> List[dict]:
+        """
+        Retrieve the papers published within a date range, using the published_date index.
+
+        Args:
+            date_from (Optional[Union[str, date, datetime]]): Inclusive lower bound. Defaults to no bound.
+            date_to (Optional[Union[str, date, datetime]]): Inclusive upper bound. A bare date covers
+                that whole day. Defaults to no bound.
+            table_name (str): The name of the table to retrieve papers from. Defaults to 'read_papers'.
+
+        Returns:
+            List[dict]: A list of dictionaries containing paper information, oldest first.
+        """
+        if table_name not in PAPER_TABLES:
+            return []
+        # Papers without a date are stored as '' and must never match.
+        conditions = ["published_date > ''"]
+        params = []
+        if date_from is not None:
+            conditions.append("published_date >= ?")
+            params.append(self._iso_bound(date_from))
+        if date_to is not None:
+            upper = self._iso_bound(date_to)
+            if len(upper) == 10:
+                # Stored values carry a time part, so '2024-01-31T12:00' > '2024-01-31'.
+                conditions.append("published_date < ?")
+                params.append((date.fromisoformat(upper) + timedelta(days=1)).isoformat())
+            else:
+                conditions.append("published_date <= ?")
+                params.append(upper)
+        c = self.pool.connection().execute(
+            f"SELECT * FROM {table_name} WHERE {' AND '.join(conditions)} ORDER BY published_date",
+            params
+        )
+        return [self._row_to_dict(row, table_name) for row in c.fetchall()]
+
+    @staticmethod
+    def _iso_bound(value: Union[str, date, datetime]) -> str:
+        return value if isinstance(value, str) else value.isoformat()
+
+    def add_pdf_locations(self, sha256: str, locations: Iterable[str]):
+        """
+        Record that the PDF with the given content hash is available under each location.
+
+        Args:
+            sha256 (str): The SHA-256 digest of the PDF bytes.
+            locations (Iterable[str]): URLs or file paths the PDF was fetched from or stored at.
+        """
+        rows = [(location, sha256) for location in dict.fromkeys(locations) if location]
+        if rows:
+            self._write(
+                "INSERT INTO pdf_hashes (location, sha256) VALUES (?, ?) "
+                "ON CONFLICT(location) DO UPDATE SET sha256 = excluded.sha256",
+                rows, many=True
+            )
+
+    def get_pdf_hash(self, location: str) -> Optional[str]:
+        """
+        Look up the content hash of the PDF last seen at a URL or path.
+
+        Args:
+            location (str): The URL or file path.
+
+        Returns:
+            Optional[str]: The SHA-256 digest, or None if the location is unknown.
+        """
+        row = self.pool.connection().execute("SELECT sha256 FROM pdf_hashes WHERE location = ?", (location,)).fetchone()
+        return row[0] if row else None
+
+    def get_pdf_locations(self, sha256: str) -> List[str]:
+        """
+        List every URL or path under which the PDF with the given content hash was seen.
+
+        Args:
+            sha256 (str): The SHA-256 digest of the PDF bytes.
+
+        Returns:
+            List[str]: The known locations.
+        """
+        c = self.pool.connection().execute("SELECT location FROM pdf_hashes WHERE sha256 = ? ORDER BY added_date", (sha256,))
+        return [row[0] for row in c.fetchall()]
+
+    def search_papers(self, table_name: str, search_term: str, mode: str = "like", limit: Optional[int] = None) -> List[dict]:
         """
         Search for papers in the specified table.
 
         Args:
             table_name (str): The name of the table to search in.
-            search_term (str): The term to search for in titles and authors.
+            search_term (str): The term to search for.
+            mode (str): "like" (default) matches the term as a substring of titles and authors.
+                "fts" runs a full-text query over titles, authors, abstracts and summaries,
+                ordered by BM25 relevance, and adds 'score' and 'snippet' keys to each result.
+            limit (Optional[int]): The maximum number of results to return. Defaults to all.
 
         Returns:
             List[dict]: A list of dictionaries containing matching paper information.
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        if table_name not in PAPER_TABLES:
+            return []
+        if mode == "fts":
+            if self.fts_enabled:
+                return self._search_papers_fts(table_name, search_term, limit)
+            print("Full-text search is unavailable, falling back to LIKE search.")
+        elif mode != "like":
+            raise ValueError(f"Invalid search mode: {mode}")
+
         search_term = f"%{search_term}%"
-        if table_name == 'read_abstracts':
-            c.execute("SELECT * FROM read_abstracts WHERE title LIKE ? OR authors LIKE ?", (search_term, search_term))
-            return [
-                {
-                    'url': row[0],
-                    'title': row[1],
-                    'authors': row[2],
-                    'published_date': row[3],
-                    'last_updated_date': row[4],
-                    'source': row[5]
-                }
-                for row in c.fetchall()
-            ]
-        elif table_name == 'read_papers':
-            c.execute("SELECT * FROM read_papers WHERE title LIKE ? OR authors LIKE ?", (search_term, search_term))
-            return [
-                {
-                    'url': row[0],
-                    'title': row[1],
-                    'authors': row[2],
-                    'published_date': row[3],
-                    'last_updated_date': row[4],
-                    'local_path': row[5],
-                    'source': row[6]
-                }
-                for row in c.fetchall()
-            ]
-        conn.close()
-        return []
+        c = self.pool.connection().execute(
+            f"SELECT * FROM {table_name} WHERE title LIKE ? OR authors LIKE ? LIMIT ?",
+            (search_term, search_term, -1 if limit is None else limit)
+        )
+        return [self._row_to_dict(row, table_name) for row in c.fetchall()]
+
+    def _search_papers_fts(self, table_name: str, search_term: str, limit: Optional[int]) -> List[dict]:
+        match = self._fts_query(search_term)
+        if not match:
+            return []
+        fts_name = f"{table_name}_fts"
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        c = self.pool.connection().execute(f'''
+            SELECT p.*, bm25({fts_name}, {weights}) AS score,
+                   snippet({fts_name}, -1, '**', '**', '...', 16) AS snippet
+            FROM {fts_name}
+            JOIN {table_name} AS p ON p.rowid = {fts_name}.rowid
+            WHERE {fts_name} MATCH ?
+            ORDER BY score
+            LIMIT ?
+        ''', (match, -1 if limit is None else limit))
+        results = []
+        for row in c.fetchall():
+            paper = self._row_to_dict(row, table_name)
+            # bm25() is lower-is-better; flip the sign so larger scores rank higher.
+            paper['score'] = -row['score']
+            paper['snippet'] = row['snippet']
+            results.append(paper)
+        return results
+
+    @staticmethod
+    def _fts_query(search_term: str) -> str:
+        """Turn free text into an FTS5 query that requires every term, quoting each to neutralise FTS syntax."""
+        terms = search_term.split()
+        return ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
 
-    # Other methods (check_paper, count_papers, update_paper, delete_paper) remain unchanged
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row, table_name: str) -> dict:
+        paper = {
+            'url': row['url'],
+            'title': row['title'],
+            'authors': row['authors'],
+            'published_date': row['published_date'],
+            'last_updated_date': row['last_updated_date'],
+        }
+        if table_name == 'read_papers':
+            paper['local_path'] = row['local_path']
+        paper['source'] = row['source']
+        paper['abstract'] = row['abstract']
+        paper['summary'] = row['summary']
+        return paper
@@ -1,5 +1,4 @@
 from autosearch.project_config import ProjectConfig
-from autosearch.api.search_manager import SearchManager
 from autosearch.functions.base_function import BaseFunction
 from autosearch.functions.create_teachable_groupchat import create_teachable_groupchat
 from autosearch.data.paper import Paper
@@ -21,7 +20,6 @@ class AcademicRetriever(BaseFunction):
 def initiate_chat_with_paper_info(paper: Paper, query: str, project_config: ProjectConfig):
     db_dir = project_config.db_dir
     config_list = project_config.config_list
-    paper_db = project_config.paper_db
 
     arxiver, arxiver_user = create_teachable_groupchat("arxiver", "arxiver_user",
                                                        db_dir, config_list, verbosity=0)
@@ -30,7 +28,6 @@ def initiate_chat_with_paper_info(paper: Paper, query: str, project_config: Proj
                                    silent=True,
                                    message=f"The following article is one of the articles that I found for '{query}' topic: \n\n '{paper.title}' by {', '.join(paper.authors)} URL: {paper.url or paper.pdf_url} \nsummary: {paper.abstract or paper.summary} \n")
 
-        paper_db.add_paper("read_abstracts", paper)
         return f"Title: {paper.title} Authors: {', '.join(paper.authors)} URL: {paper.url or paper.pdf_url} added to MEMOS\n\n "
 
     except Exception as e:
@@ -39,19 +36,34 @@ def initiate_chat_with_paper_info(paper: Paper, query: str, project_config: Proj
 
 def process_query(query: str, n_results: int, project_config: ProjectConfig):
     paper_db = project_config.paper_db
-    search_manager = SearchManager(project_config.project_dir)
+    search_manager = project_config.services.search_manager
 
-    all_papers = search_manager.search_all(query, n_results=n_results)
-    papers = []
-    for source_papers in all_papers.values():
-        papers.extend(source_papers)
+    # Start memorizing each paper as soon as its source returns it, while slower sources are still searching.
+    seen = set()
+    futures = {}
 
-    papers = [paper for paper in papers if not paper_db.check_paper(paper.url or paper.pdf_url, "read_abstracts")]
+    def record(future):
+        # Record each abstract as soon as it is memorized, so an interrupted query keeps its progress.
+        paper = futures.pop(future)
+        try:
+            if future.result():
+                paper_db.add_paper("read_abstracts", paper)
+        except Exception as e:
+            print(f"Error memorizing {paper.title}: {e}")
 
     with ThreadPoolExecutor() as executor:
-        futures = [executor.submit(initiate_chat_with_paper_info, paper, query, project_config) for paper in papers]
-        for future in as_completed(futures):
-            future.result()
+        for batch in search_manager.search_all_batches(query, n_results=n_results):
+            papers = {}
+            for api_name, paper in batch:
+                papers.setdefault(paper.url or paper.pdf_url, paper)
+            # One query checks every paper of the batch.
+            for key in paper_db.filter_unseen([key for key in papers if key not in seen], "read_abstracts"):
+                seen.add(key)
+                futures[executor.submit(initiate_chat_with_paper_info, papers[key], query, project_config)] = papers[key]
+            for future in [future for future in futures if future.done()]:
+                record(future)
+        for future in as_completed(list(futures)):
+            record(future)
 
 
 def academic_retriever(
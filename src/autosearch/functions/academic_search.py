@@ -1,5 +1,4 @@
 from autosearch.project_config import ProjectConfig
-from autosearch.api.search_manager import SearchManager
 from autosearch.functions.base_function import BaseFunction
 from typing_extensions import Annotated
 
@@ -18,8 +17,7 @@ def academic_search(
     query: Annotated[str, "The query to search for in academic sources."],
     project_config: ProjectConfig,
 ) -> str:
-    project_dir = project_config.project_dir
-    search_manager = SearchManager(project_dir)
+    search_manager = project_config.services.search_manager
     results = search_manager.search_all(query, n_results=5)
 
     output = ""
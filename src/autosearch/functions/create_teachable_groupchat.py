@@ -4,7 +4,7 @@ from autosearch.agents.utils import termination_msg
 
 
 def create_teachable_groupchat(assitant_name, user_name, db_dir, config_list,
-                               verbosity=0):
+                               verbosity=0, pre_classifier=None, structured_analysis=False, memo_sink=None):
 
     # Start by instantiating any agent that inherits from ConversableAgent.
     assistant = autogen.ConversableAgent(
@@ -22,6 +22,9 @@ def create_teachable_groupchat(assitant_name, user_name, db_dir, config_list,
         path_to_db_dir=db_dir,
         recall_threshold=1.5,  # Higher numbers allow more (but less relevant) memos to be recalled.
         learnable=True,  # If False, the agent will not learn from user input.
+        pre_classifier=pre_classifier,  # Skips analysis rounds a message does not need, e.g. KeywordPreClassifier().
+        structured_analysis=structured_analysis,  # If True, all analysis is done in one LLM call.
+        memo_sink=memo_sink,  # If set, receives new memos instead of the agent writing them to the DB.
     )
 
     # Now add the Teachability capability to the agent.
@@ -1,7 +1,6 @@
 from autosearch.functions.check_reasoning import check_reasoning
 from autosearch.functions.text_analysis import chunk_pdf, momorized_text
 from autosearch.functions.base_function import BaseFunction
-from autosearch.api.search_manager import SearchManager
 from autosearch.project_config import ProjectConfig
 
 from typing_extensions import Annotated
@@ -33,7 +32,7 @@ def get_pdf(
     output_dir = project_dir + "/output"
     config_list = project_config.config_list
 
-    search_manager = SearchManager(project_dir)
+    search_manager = project_config.services.search_manager
 
     # Determine which API to use based on the URL structure
     if 'arxiv.org' in url:
@@ -2,13 +2,11 @@ from autosearch.functions.check_reasoning import check_reasoning
 from autosearch.functions.text_analysis import chunk_pdf
 from autosearch.functions.base_function import BaseFunction
 from autosearch.project_config import ProjectConfig
-from autosearch.api.search_manager import SearchManager
 from autosearch.data.paper import Paper
 
 from typing_extensions import Annotated
 from typing import List
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import os
 
 
 class GetPDFs(BaseFunction):
@@ -29,28 +27,40 @@ def get_pdfs(
     paper_db = project_config.paper_db
     initiate_db = project_config.initiate_db
     config_list = project_config.config_list
-    search_manager = SearchManager(project_config.project_dir)
+    search_manager = project_config.services.search_manager
 
-    papers_to_process = []
+    candidates = []
     message = ''
 
+    # Determine which API to use based on the URL structure
+    urls_by_api = {}
     for url, reason in zip(urls, reasons):
-        # Determine which API to use based on the URL structure
         if 'arxiv.org' in url:
-            api_name = 'arxiv'
+            urls_by_api.setdefault('arxiv', []).append(url)
         elif 'scholar.google.com' in url:
-            api_name = 'google_scholar'
-        else:
+            urls_by_api.setdefault('google_scholar', []).append(url)
+
+    # Resolve the metadata of every URL of a provider in one batch.
+    metadata = {}
+    for api_name, api_urls in urls_by_api.items():
+        metadata.update(search_manager.get_papers_metadata(api_urls, api_name))
+
+    for url, reason in zip(urls, reasons):
+        if url not in metadata:
             message += f"Unsupported URL: {url}\n"
             continue
-
-        try:
-            paper = search_manager.get_paper_metadata(url, api_name)
-        except Exception as e:
-            message += f"Error retrieving metadata for {url}: {str(e)}\n"
+        paper = metadata[url]
+        if isinstance(paper, Exception):
+            message += f"Error retrieving metadata for {url}: {str(paper)}\n"
             continue
+        candidates.append((paper, reason))
+
+    # Check all candidates against the database in one query.
+    unseen = set(paper_db.filter_unseen([paper.url for paper, _ in candidates], "read_papers"))
 
-        if paper_db.check_paper(paper.url, "read_papers"):
+    papers_to_process = []
+    for paper, reason in candidates:
+        if paper.url not in unseen:
             print(f"The article, '{paper.title}', has already been read and shared with you in your memory.")
             message += f"The article, '{paper.title}', has already been read and shared with you in your memory.\n"
             continue
@@ -67,19 +77,23 @@ def get_pdfs(
         project_dir = project_config.project_dir
         output_dir = project_dir + "/output"
         try:
-            pdf_filename = os.path.basename(paper.url)
-            pdf_path = os.path.join(project_dir, 'output', pdf_filename)
-            search_manager.download_pdf(paper, output_dir)
-            paper.local_path = pdf_path
-            chunk_pdf(paper, project_config)
-            return f"Successfully processed {paper.title}"
+            paper.local_path = search_manager.download_pdf(paper, output_dir)
+            chunk_pdf(paper, project_config, add_to_db=False)
+            return True, f"Successfully processed {paper.title}"
         except Exception as e:
-            return f"Error processing {paper.title}: {str(e)}"
+            return False, f"Error processing {paper.title}: {str(e)}"
 
+    processed = []
     with ThreadPoolExecutor() as executor:
-        futures = [executor.submit(process_paper, paper, reason) for paper, reason in papers_to_process]
+        futures = {executor.submit(process_paper, paper, reason): paper for paper, reason in papers_to_process}
         for future in as_completed(futures):
-            message += future.result() + "\n"
+            success, result = future.result()
+            if success:
+                processed.append(futures[future])
+            message += result + "\n"
+
+    # Record every processed paper in one transaction.
+    paper_db.add_papers("read_papers", processed)
 
     num_papers = paper_db.count_papers("read_papers")
     print(f"{num_papers} articles have been read, so far.")
@@ -16,16 +16,18 @@ class ProcessLocalPDFs(BaseFunction):
         )
 
 
+def is_processed(pdf_path: str, project_config: ProjectConfig) -> bool:
+    paper_db = project_config.paper_db
+    output_pdf_path = os.path.join(project_config.project_dir, 'output', os.path.basename(pdf_path))
+    return paper_db.check_paper_by_localpath(pdf_path) or paper_db.check_paper_by_localpath(output_pdf_path)
+
+
 def process_single_pdf(pdf_file: str, local_folder: str, project_config: ProjectConfig):
     document_analyzer = project_config.doc_analyzer
-    paper_db = project_config.paper_db
-    project_dir = project_config.project_dir
 
     pdf_path = os.path.join(local_folder, pdf_file)
-    pdf_filename = os.path.basename(pdf_path)
-    output_pdf_path = os.path.join(project_dir, 'output', pdf_filename)
 
-    if paper_db.check_paper_by_localpath(pdf_path) or paper_db.check_paper_by_localpath(output_pdf_path):
+    if is_processed(pdf_path, project_config):
         return f"Skipping {pdf_file} as it is already in the database."
 
     try:
@@ -60,6 +62,15 @@ def process_local_pdfs(
     if not pdf_files:
         return f"No PDF files found in {local_folder}."
 
+    # Run the Azure analyses concurrently up front; the workers below then hit the analysis cache.
+    # Any file that fails here is simply analyzed again, and reported, by its worker.
+    new_pdf_paths = [os.path.join(local_folder, f) for f in pdf_files
+                     if not is_processed(os.path.join(local_folder, f), project_config)]
+    try:
+        project_config.doc_analyzer.prefetch_analysis(new_pdf_paths)
+    except Exception as e:
+        print(f"Concurrent analysis failed, falling back to per-file analysis: {str(e)}")
+
     results = []
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -1,5 +1,4 @@
 from typing_extensions import Annotated
-from autosearch.api.search_manager import SearchManager
 from autosearch.functions.base_function import BaseFunction
 from autosearch.project_config import ProjectConfig
 from autosearch.data.paper import Paper
@@ -20,7 +19,7 @@ def url_check(
     paper_title: Annotated[str, "The title of the paper to be used for fact checking."],
     project_config: ProjectConfig
 ) -> tuple[bool, str]:
-    search_manager = SearchManager(project_config.project_dir)
+    search_manager = project_config.services.search_manager
 
     # Determine which API to use based on the URL structure
     if 'arxiv.org' in paper_url:
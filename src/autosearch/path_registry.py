@@ -0,0 +1,47 @@
+import os
+import threading
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PathRegistry(Generic[T]):
+    """
+    Process-wide objects keyed by the real path of a file or directory.
+
+    Every object is built by `factory` the first time its path is looked up, and handed
+    to every later lookup, so different spellings of the same path share one object.
+    """
+
+    def __init__(self, factory: Callable[..., T]):
+        """
+        Args:
+            factory (Callable[..., T]): Builds the object of a path, called with the path
+                and the other arguments of the first lookup.
+        """
+        self.factory = factory
+        self._items: Dict[str, T] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, *args, **kwargs) -> T:
+        """
+        Returns the object of `path`, building it with `factory(path, *args, **kwargs)` on first use.
+
+        Args:
+            path (str): The path.
+            *args, **kwargs: Factory arguments, used only when the object is built.
+
+        Returns:
+            T: The object.
+        """
+        key = os.path.realpath(path)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                item = self._items[key] = self.factory(path, *args, **kwargs)
+            return item
+
+    def pop(self, path: str) -> Optional[T]:
+        """Removes the object of `path` from the registry and returns it, or None if there is none."""
+        with self._lock:
+            return self._items.pop(os.path.realpath(path), None)
@@ -1,8 +1,7 @@
-from autosearch.database.paper_database import PaperDatabase
+from autosearch.services import get_project_services
 from autosearch.analysis.document_analyzer import DocumentAnalyzer
 from autosearch.functions.text_analysis import chunk_pdf
 from autosearch.agents.agents_creator import AgentsCreator
-from autosearch.api.arxiv_api import ArxivAPI
 from autosearch.project_config import ProjectConfig
 from autosearch.functions.memorization_skill import memorization_skill
 from autosearch.functions.process_local_pdfs import ProcessLocalPDFs
@@ -51,8 +50,10 @@ class ResearchProject:
                 "model": [model for model in (models if models is not None else ["gpt-4o", "gpt-4", "gpt-4-32k", "gpt-4o-mini"])]
             },
         )
-        self.paper_db = PaperDatabase(self.project_dir)
-        self.arxiv_api = ArxivAPI()
+        self.services = get_project_services(self.project_dir)
+        self.paper_db = self.services.paper_db
+        # The arXiv provider of the shared SearchManager, which records the versions it sees in the project's cache.
+        self.arxiv_api = self.services.search_manager.apis['arxiv']
         self.document_analyzer = DocumentAnalyzer(config['doc_api_key'], config['doc_endpoint'], self.project_dir, chunk_pdf)
         if initiate_db:
             memorization_skill(self.db_dir, self.config_list, verbosity=0)
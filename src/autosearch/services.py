@@ -0,0 +1,78 @@
+import threading
+from typing import Any, Callable, Dict
+
+from autosearch.api.search_manager import SearchManager
+from autosearch.database.paper_database import PaperDatabase
+from autosearch.path_registry import PathRegistry
+
+
+class ProjectServices:
+    """
+    The long-lived services of one project, built on first use and shared by every thread.
+
+    Agent functions, the document analyzer and the PDF manager used to build their own
+    SearchManager, each with its own API clients and PaperDatabase (re-running the schema
+    setup). They now ask the project's registry, which constructs each service once.
+    """
+
+    def __init__(self, project_dir: str):
+        """
+        Initialize the ProjectServices.
+
+        Args:
+            project_dir (str): The project directory the services work in.
+        """
+        self.project_dir = project_dir
+        self._services: Dict[str, Any] = {}
+        self._lock = threading.RLock()  # reentrant, as services are built from other services
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    service = factory()
+                    self._services[name] = service
+        return service
+
+    @property
+    def paper_db(self) -> PaperDatabase:
+        return self._get('paper_db', lambda: PaperDatabase(self.project_dir))
+
+    @property
+    def search_manager(self) -> SearchManager:
+        return self._get('search_manager', lambda: SearchManager(self.project_dir, paper_db=self.paper_db))
+
+    def close(self):
+        """Close the services that hold database connections."""
+        with self._lock:
+            search_manager = self._services.pop('search_manager', None)
+            paper_db = self._services.pop('paper_db', None)
+        if search_manager is not None:
+            search_manager.close()
+        if paper_db is not None:
+            paper_db.close()
+
+
+_registry: PathRegistry[ProjectServices] = PathRegistry(ProjectServices)
+
+
+def get_project_services(project_dir: str) -> ProjectServices:
+    """
+    Return the services of a project directory, shared by the whole process.
+
+    Args:
+        project_dir (str): The project directory. Different spellings of the same directory share services.
+
+    Returns:
+        ProjectServices: The project's services.
+    """
+    return _registry.get(project_dir)
+
+
+def close_project_services(project_dir: str):
+    """Close the services of a project directory and remove them from the registry."""
+    services = _registry.pop(project_dir)
+    if services is not None:
+        services.close()
@@ -0,0 +1,60 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StageTimings:
+    """
+    Thread-safe latency counters for the named stages of a piece of work.
+
+    Each stage keeps its number of runs, total and maximum duration and the number of
+    items it handled, so the share of time each stage takes, and its throughput, can be
+    read off `stats()` while the work is running.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def time(self, stage: str, items: int = 1) -> Iterator[None]:
+        """Times the enclosed block as one run of `stage` handling `items` items, whether or not it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, items)
+
+    def record(self, stage: str, seconds: float, items: int = 1):
+        """
+        Records one run of a stage.
+
+        Args:
+            stage (str): The stage name.
+            seconds (float): How long the run took.
+            items (int): The number of items the run handled.
+        """
+        with self._lock:
+            counters = self._stages.setdefault(stage, {'count': 0, 'items': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            counters['count'] += 1
+            counters['items'] += items
+            counters['total_seconds'] += seconds
+            counters['max_seconds'] = max(counters['max_seconds'], seconds)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the counters of every stage.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The run and item counts, the total, mean and maximum seconds and
+            the items handled per second of work (summed over threads), keyed by stage name.
+        """
+        with self._lock:
+            return {stage: dict(counters, mean_seconds=counters['total_seconds'] / counters['count'],
+                                items_per_second=counters['items'] / counters['total_seconds'] if counters['total_seconds'] else 0.0)
+                    for stage, counters in self._stages.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
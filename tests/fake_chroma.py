@@ -0,0 +1,62 @@
+"""In-memory stand-ins for a Chroma client and its collections, shared by the tests."""
+
+
+class FakeCollection:
+    """A Chroma collection whose distance is the share of words two texts do not have in common."""
+
+    def __init__(self, name="memos"):
+        self.name = name
+        self.records = {}
+        self.queries = []
+        self.count_calls = 0
+
+    def count(self):
+        self.count_calls += 1
+        return len(self.records)
+
+    def add(self, ids, documents, embeddings=None, metadatas=None):
+        for uid, document, metadata in zip(ids, documents, metadatas):
+            self.records[uid] = document, metadata
+
+    def get(self, include=None):
+        ids = list(self.records)
+        return {"ids": ids, "documents": [self.records[uid][0] for uid in ids],
+                "metadatas": [self.records[uid][1] for uid in ids]}
+
+    @staticmethod
+    def distance(a, b):
+        a, b = set(a.lower().split()), set(b.lower().split())
+        return 1.0 - len(a & b) / len(a | b)
+
+    def query(self, query_texts, n_results):
+        self.queries.append(list(query_texts))
+        results = {"ids": [], "documents": [], "distances": [], "metadatas": []}
+        for query_text in query_texts:
+            ranked = sorted(self.records.items(), key=lambda item: (self.distance(query_text, item[1][0]), item[0]))[:n_results]
+            results["ids"].append([uid for uid, _ in ranked])
+            results["documents"].append([document for _, (document, _) in ranked])
+            results["distances"].append([self.distance(query_text, document) for _, (document, _) in ranked])
+            results["metadatas"].append([metadata for _, (_, metadata) in ranked])
+        return results
+
+
+class FakeClient:
+    def __init__(self, path):
+        self.path = path
+        self.collections = {}
+        self.create_calls = 0
+
+    def create_collection(self, name, embedding_function=None, get_or_create=False):
+        self.create_calls += 1
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(name)
+        elif not get_or_create:
+            raise ValueError(f"Collection {name} already exists")
+        return self.collections[name]
+
+    def delete_collection(self, name):
+        del self.collections[name]
+
+
+def fake_embedding_function():
+    return lambda texts: [[float(len(text))] for text in texts]
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from autosearch.analysis.analysis_cache import AnalysisCache
+
+RESULT = {
+    "pages": [{"page_number": 1, "words": [{"content": "Polymer", "confidence": 0.99}]}],
+    "paragraphs": [{"content": "Üniçødé text", "role": "title", "spans": [{"offset": 0, "length": 12}]}],
+    "tables": [],
+}
+
+
+class TestAnalysisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip_keyed_by_digest_and_model(self):
+        cache = AnalysisCache(self.cache_dir)
+        self.assertIsNone(cache.get("abc", "prebuilt-document"))
+        cache.put("abc", "prebuilt-document", RESULT)
+        self.assertEqual(cache.get("abc", "prebuilt-document"), RESULT)
+        self.assertIsNone(cache.get("abc", "prebuilt-layout"))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        # Entries survive a restart.
+        self.assertEqual(AnalysisCache(self.cache_dir).get("abc", "prebuilt-document"), RESULT)
+
+    def test_entries_are_smaller_than_pretty_printed_json(self):
+        result = {"paragraphs": [{"content": f"paragraph {i} " * 20, "spans": [{"offset": i, "length": 5}]} for i in range(500)]}
+        cache = AnalysisCache(self.cache_dir)
+        cache.put("abc", "prebuilt-document", result)
+        self.assertLess(cache.size_bytes * 5, len(json.dumps(result, indent=4)))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = AnalysisCache(self.cache_dir)
+        cache.put("first", "m", RESULT)
+        entry_size = cache.size_bytes
+        cache.max_size_bytes = entry_size * 2
+
+        cache.put("second", "m", RESULT)
+        # Make "first" the most recently used entry.
+        old = time.time() - 60
+        os.utime(os.path.join(self.cache_dir, "m", "second.bin"), (old, old))
+        os.utime(os.path.join(self.cache_dir, "m", "first.bin"), (old - 60, old - 60))
+        self.assertIsNotNone(cache.get("first", "m"))
+
+        cache.put("third", "m", RESULT)
+        self.assertIsNone(cache.get("second", "m"))
+        self.assertIsNotNone(cache.get("first", "m"))
+        self.assertIsNotNone(cache.get("third", "m"))
+        self.assertLessEqual(cache.size_bytes, cache.max_size_bytes)
+
+    def test_unreadable_entry_is_a_miss(self):
+        cache = AnalysisCache(self.cache_dir)
+        os.makedirs(os.path.join(self.cache_dir, "m"))
+        with open(os.path.join(self.cache_dir, "m", "bad.bin"), "wb") as f:
+            f.write(b"garbage")
+        self.assertIsNone(cache.get("bad", "m"))
+
+    def test_load_legacy_json(self):
+        path = os.path.join(self.temp_dir.name, "paper.pdf.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(RESULT, f, ensure_ascii=False, indent=4)
+        self.assertEqual(AnalysisCache(self.cache_dir).load_json(path), RESULT)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from autosearch.agents import analyzer_cache
+from autosearch.agents.analyzer_cache import AnalyzerCache, analysis_key, get_analyzer_cache
+
+
+class TestAnalyzerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "analyzer_cache.db")
+        self.cache = AnalyzerCache(self.db_path, max_entries=3)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def test_key_covers_text_instruction_and_model(self):
+        key = analysis_key("text", "instruction", "gpt-4o")
+        self.assertEqual(key, analysis_key("text", "instruction", "gpt-4o"))
+        self.assertNotEqual(key, analysis_key("text ", "instruction", "gpt-4o"))
+        self.assertNotEqual(key, analysis_key("text", "other instruction", "gpt-4o"))
+        self.assertNotEqual(key, analysis_key("text", "instruction", "gpt-4o-mini"))
+
+    def test_hits_misses_and_saved_tokens(self):
+        self.assertIsNone(self.cache.get("Tg of PS is 100 C.", "Is there information?", "gpt-4o"))
+        self.cache.put("Tg of PS is 100 C.", "Is there information?", "gpt-4o", "yes", tokens=12)
+        self.assertEqual(self.cache.get("Tg of PS is 100 C.", "Is there information?", "gpt-4o"), "yes")
+        self.assertEqual(self.cache.get("Tg of PS is 100 C.", "Is there information?", "gpt-4o"), "yes")
+        self.assertIsNone(self.cache.get("Tg of PS is 100 C.", "Is there information?", "gpt-4o-mini"))
+        self.assertEqual(self.cache.stats(), {'hits': 2, 'misses': 2, 'evictions': 0, 'hit_rate': 0.5, 'saved_tokens': 24})
+
+    def test_persists_across_instances(self):
+        self.cache.put("text", "instruction", "gpt-4o", "response")
+        other = AnalyzerCache(self.db_path)
+        try:
+            self.assertEqual(other.get("text", "instruction", "gpt-4o"), "response")
+        finally:
+            other.close()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        for i in range(3):
+            self.cache.put(f"text {i}", "instruction", "gpt-4o", f"response {i}")
+        # Make "text 0" the most recently used entry and "text 1" the least.
+        for i, accessed in enumerate((3000.0, 1000.0, 2000.0)):
+            self.cache.pool.execute_write(lambda conn: conn.execute(
+                "UPDATE analyzer_cache SET accessed = ? WHERE key = ?", (accessed, analysis_key(f"text {i}", "instruction", "gpt-4o"))))
+        self.cache.put("text 3", "instruction", "gpt-4o", "response 3")
+
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        self.assertEqual(self.cache.get("text 0", "instruction", "gpt-4o"), "response 0")
+        self.assertIsNone(self.cache.get("text 1", "instruction", "gpt-4o"))
+        self.assertEqual(self.cache.get("text 3", "instruction", "gpt-4o"), "response 3")
+
+    def test_concurrent_use(self):
+        def work(i):
+            self.cache.put(f"text {i % 2}", "instruction", "gpt-4o", "response")
+            self.cache.get(f"text {i % 2}", "instruction", "gpt-4o")
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.stats()['hits'], 16)
+
+    def test_shared_cache_per_path(self):
+        shared = get_analyzer_cache(os.path.join(self.temp_dir.name, "shared.db"))
+        try:
+            self.assertIs(get_analyzer_cache(os.path.join(self.temp_dir.name, ".", "shared.db")), shared)
+        finally:
+            analyzer_cache._caches.pop(shared.db_path).close()
+
+
+if __name__ == '__main__':
+    unittest.main()
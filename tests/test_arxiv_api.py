@@ -0,0 +1,175 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import arxiv
+
+from autosearch.api import arxiv_api
+from autosearch.api.arxiv_api import ArxivAPI, ArxivVersionIndex, SerializedClient, get_client
+from autosearch.api.search_api_base import QueueWait
+
+
+def make_result(short_id: str) -> arxiv.Result:
+    return arxiv.Result(entry_id=f"http://arxiv.org/abs/{short_id}", title=f"Paper {short_id}",
+                        authors=[arxiv.Result.Author("A. Author")], summary="An abstract.")
+
+
+class FakeClient:
+    """Answers searches from a fixed catalogue and records every request."""
+
+    def __init__(self, latest_versions, n_search_results=3, fail_on=None):
+        self.latest_versions = latest_versions
+        self.n_search_results = n_search_results
+        self.fail_on = fail_on
+        self.searches = []
+
+    def results(self, search):
+        self.searches.append(search)
+        if search.id_list:
+            if self.fail_on in search.id_list:
+                raise arxiv.HTTPError("http://export.arxiv.org/api/query", 0, 503)
+            for arxiv_id in search.id_list:
+                if arxiv_id in self.latest_versions:
+                    yield make_result(f"{arxiv_id}v{self.latest_versions[arxiv_id]}")
+                elif arxiv_id[:arxiv_id.rfind('v')] in self.latest_versions:
+                    yield make_result(arxiv_id)
+        else:
+            for i in range(min(self.n_search_results, search.max_results)):
+                yield make_result(f"2401.{i:05d}v1")
+
+
+class TestArxivAPI(unittest.TestCase):
+
+    def test_shared_client(self):
+        self.assertIsInstance(get_client(), SerializedClient)
+        self.assertIs(ArxivAPI().client, ArxivAPI().client)
+
+    def test_serialized_client_counts_queued_time(self):
+        client = SerializedClient(delay_seconds=0.1)
+
+        def request(self, search, offset=0):
+            time.sleep(0.2)
+            yield make_result("2401.00001v1")
+
+        queue_wait = QueueWait()
+
+        def queued_request():
+            with client.count_waits(queue_wait):
+                self.assertEqual(len(list(client.results(arxiv.Search(query="second")))), 1)
+
+        with patch.object(arxiv.Client, 'results', request):
+            first = threading.Thread(target=lambda: list(client.results(arxiv.Search(query="first"))))
+            first.start()
+            time.sleep(0.05)
+            start = time.monotonic()
+            second = threading.Thread(target=queued_request)
+            second.start()
+            first.join()
+            second.join()
+            elapsed = time.monotonic() - start
+
+        # Queued behind the first request (~0.15 s), then the delay (0.1 s); the request itself is not counted.
+        self.assertGreater(queue_wait.seconds(), 0.2)
+        self.assertLess(queue_wait.seconds(), elapsed - 0.1)
+
+    def test_serialized_client_holds_the_client_per_page(self):
+        client = SerializedClient(page_size=2, delay_seconds=0)
+        pages = []
+
+        def request(self, search, offset=0):
+            pages.append((offset, search.max_results))
+            for i in range(offset, min(search.max_results, 5)):
+                yield make_result(f"2401.{i:05d}v1")
+
+        with patch.object(arxiv.Client, 'results', request):
+            results = client.results(arxiv.Search(query="polymers", max_results=10))
+            next(results)
+            # The first page is fetched, and the client released before its results are yielded.
+            self.assertEqual(pages, [(0, 2)])
+            self.assertFalse(client._search_lock.locked())
+            self.assertEqual(len(list(results)), 4)
+
+        self.assertEqual(pages, [(0, 2), (2, 4), (4, 6)])
+
+    def test_search_makes_one_pass(self):
+        client = FakeClient({})
+        papers = ArxivAPI(client).search("polymers", 2)
+
+        self.assertEqual([p.url for p in papers], ["http://arxiv.org/abs/2401.00000v1", "http://arxiv.org/abs/2401.00001v1"])
+        self.assertEqual(len(client.searches), 1)
+
+    def test_get_papers_metadata_batches_id_lists(self):
+        ids = [f"2301.{i:05d}" for i in range(250)]
+        client = FakeClient({arxiv_id: 2 for arxiv_id in ids})
+        urls = [f"https://arxiv.org/abs/{arxiv_id}" for arxiv_id in ids]
+
+        results = ArxivAPI(client).get_papers_metadata(urls + ["https://arxiv.org/pdf/2301.00007v1.pdf"])
+
+        self.assertEqual([len(search.id_list) for search in client.searches], [100, 100, 51])
+        self.assertEqual(results[urls[0]].url, "http://arxiv.org/abs/2301.00000v2")
+        self.assertEqual(results["https://arxiv.org/pdf/2301.00007v1.pdf"].url, "http://arxiv.org/abs/2301.00007v1")
+
+    def test_get_papers_metadata_reports_errors_per_identifier(self):
+        client = FakeClient({"2301.00001": 1}, fail_on="2301.00002")
+        api = ArxivAPI(client)
+        with patch.object(arxiv_api, 'ID_LIST_CHUNK_SIZE', 1):
+            results = api.get_papers_metadata(["2301.00001", "2301.00002", "2301.00003", "not an id"])
+
+        self.assertEqual(results["2301.00001"].title, "Paper 2301.00001v1")
+        self.assertIsInstance(results["2301.00002"], arxiv.HTTPError)
+        self.assertIsInstance(results["2301.00003"], ValueError)
+        self.assertIsInstance(results["not an id"], ValueError)
+        with self.assertRaises(ValueError):
+            api.get_paper_metadata("2301.00003")
+
+
+class TestArxivPdfUrls(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "search_cache.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_version_index_keeps_the_latest_version_across_runs(self):
+        index = ArxivVersionIndex(self.db_path)
+        index.record("2301.00001v2", "2301.00001v1", "2301.00002", "2301.00003v3")
+        index.close()
+
+        index = ArxivVersionIndex(self.db_path)
+        self.assertEqual(index.latest("2301.00001"), 2)
+        self.assertEqual(index.resolve("2301.00001"), "2301.00001v2")
+        self.assertEqual(index.resolve("2301.00001v1"), "2301.00001v1")
+        self.assertEqual(index.resolve("2301.00002"), "2301.00002")
+        index.close()
+
+    def test_results_seen_pin_pdf_urls_without_requests(self):
+        client = FakeClient({"2301.00005": 3})
+        api = ArxivAPI(client, ArxivVersionIndex())
+
+        self.assertEqual(api.pdf_url("https://arxiv.org/abs/2301.00005"), "https://arxiv.org/pdf/2301.00005")
+        api.get_papers_metadata(["2301.00005"])
+        self.assertEqual(api.pdf_url("https://arxiv.org/abs/2301.00005"), "https://arxiv.org/pdf/2301.00005v3")
+        self.assertEqual(api.pdf_url("https://arxiv.org/pdf/2301.00005v1.pdf"), "https://arxiv.org/pdf/2301.00005v1")
+        self.assertEqual(len(client.searches), 1)
+
+    def test_download_pdf_makes_no_api_request(self):
+        client = FakeClient({})
+        api = ArxivAPI(client, ArxivVersionIndex())
+        downloader = MagicMock()
+        downloader.download.side_effect = lambda url, path: path
+
+        with patch.object(arxiv_api, 'get_downloader', return_value=downloader):
+            path = api.download_pdf("https://arxiv.org/abs/2301.00009", os.path.join(self.temp_dir.name, "2301.00009"))
+
+        self.assertEqual(path, os.path.join(self.temp_dir.name, "2301.00009.pdf"))
+        downloader.download.assert_called_once_with("https://arxiv.org/pdf/2301.00009", path)
+        self.assertEqual(client.searches, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+from azure.core.exceptions import HttpResponseError
+
+from autosearch.analysis.async_azure_document_analyzer import (
+    AsyncAzureDocumentAnalyzer,
+    TokenBucket,
+    parse_retry_after,
+)
+from autosearch.analysis.document_analyzer import DocumentAnalyzer
+
+TIMESTAMP = "2024-01-01T00:00:00Z"
+
+
+class FakeDocumentIntelligence(ThreadingHTTPServer):
+    """
+    A local stand-in for the Document Intelligence REST API.
+
+    POST .../documentModels/{model}:analyze answers 202 with an Operation-Location,
+    and GET on that location reports "running" for `polls_per_operation - 1` polls
+    before returning the result. The analyzed content is the uploaded bytes decoded.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, polls_per_operation: int = 3, throttle_first: int = 0, fail_content: bytes = b"fail"):
+        super().__init__(("127.0.0.1", 0), FakeHandler)
+        self.polls_per_operation = polls_per_operation
+        self.throttle_remaining = throttle_first
+        self.fail_content = fail_content
+        self.lock = threading.Lock()
+        self.operations = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.analyze_requests = 0
+        self.throttled = 0
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        document = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.analyze_requests += 1
+            if server.throttle_remaining > 0:
+                server.throttle_remaining -= 1
+                server.throttled += 1
+                throttle = True
+            else:
+                throttle = False
+                operation_id = uuid.uuid4().hex
+                server.operations[operation_id] = {"polls": 0, "document": document}
+                server.in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        if throttle:
+            self._send(429, {"error": {"code": "429", "message": "Rate limit exceeded."}},
+                       {"Retry-After": "1", "retry-after-ms": "200"})
+            return
+        model_id = self.path.split("/documentModels/")[1].split(":")[0]
+        location = f"{server.endpoint}/formrecognizer/documentModels/{model_id}/analyzeResults/{operation_id}?api-version=2023-07-31"
+        self._send(202, headers={"Operation-Location": location, "Retry-After": "0"})
+
+    def do_GET(self):
+        server = self.server
+        operation_id = self.path.split("?")[0].rsplit("/", 1)[-1]
+        with server.lock:
+            operation = server.operations[operation_id]
+            operation["polls"] += 1
+            done = operation["polls"] >= server.polls_per_operation
+            if done:
+                server.in_flight -= 1
+        body = {"status": "running", "createdDateTime": TIMESTAMP, "lastUpdatedDateTime": TIMESTAMP}
+        if done and operation["document"] == server.fail_content:
+            body["status"] = "failed"
+            body["error"] = {"code": "InvalidContent", "message": "The file is corrupted or format is unsupported."}
+        elif done:
+            content = operation["document"].decode()
+            body["status"] = "succeeded"
+            body["analyzeResult"] = {
+                "apiVersion": "2023-07-31",
+                "modelId": "prebuilt-document",
+                "stringIndexType": "textElements",
+                "content": content,
+                "pages": [],
+                "paragraphs": [{"content": content, "spans": [{"offset": 0, "length": len(content)}]}],
+                "tables": [],
+            }
+        self._send(200, body, {"Retry-After": "0"})
+
+
+class TestAsyncAzureDocumentAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        shutil.rmtree(self.temp_dir)
+
+    def _start_server(self, **kwargs) -> FakeDocumentIntelligence:
+        server = FakeDocumentIntelligence(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.servers.append(server)
+        return server
+
+    def _write_pdfs(self, contents):
+        paths = []
+        for i, content in enumerate(contents):
+            path = os.path.join(self.temp_dir, f"paper_{i}.pdf")
+            with open(path, "wb") as f:
+                f.write(content)
+            paths.append(path)
+        return paths
+
+    def test_analyze_many_multiplexes_operations_within_the_concurrency_bound(self):
+        server = self._start_server(polls_per_operation=4)
+        paths = self._write_pdfs([f"document {i}".encode() for i in range(8)])
+        analyzer = AsyncAzureDocumentAnalyzer("fake-key", server.endpoint, max_concurrency=3,
+                                              requests_per_second=1000, polling_interval=0.05)
+
+        results = asyncio.run(analyzer.analyze_many(paths))
+
+        self.assertEqual(list(results), paths)
+        for i, path in enumerate(paths):
+            self.assertEqual(results[path]["content"], f"document {i}")
+        self.assertLessEqual(server.max_in_flight, 3)
+        self.assertGreater(server.max_in_flight, 1)
+
+    def test_failures_are_returned_per_path(self):
+        server = self._start_server(polls_per_operation=2)
+        good, bad = self._write_pdfs([b"good", b"fail"])
+        missing = os.path.join(self.temp_dir, "missing.pdf")
+        analyzer = AsyncAzureDocumentAnalyzer("fake-key", server.endpoint, requests_per_second=1000,
+                                              polling_interval=0.05)
+
+        results = asyncio.run(analyzer.analyze_many([good, bad, missing]))
+
+        self.assertEqual(results[good]["content"], "good")
+        self.assertIsInstance(results[bad], HttpResponseError)
+        self.assertIsInstance(results[missing], FileNotFoundError)
+
+    def test_throttled_requests_pause_the_bucket_and_are_retried(self):
+        server = self._start_server(polls_per_operation=1, throttle_first=2)
+        paths = self._write_pdfs([b"one", b"two"])
+        analyzer = AsyncAzureDocumentAnalyzer("fake-key", server.endpoint, requests_per_second=1000,
+                                              polling_interval=0.05)
+
+        start = time.monotonic()
+        results = asyncio.run(analyzer.analyze_many(paths))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(sorted(result["content"] for result in results.values()), ["one", "two"])
+        self.assertEqual(analyzer.throttled, 2)
+        self.assertEqual(server.analyze_requests, 4)
+        # The retry-after-ms hint (200 ms) wins over the coarser Retry-After header.
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 5)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_acquire_is_limited_to_the_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+
+        async def take(n):
+            for _ in range(n):
+                await bucket.acquire()
+
+        start = time.monotonic()
+        asyncio.run(take(6))
+        self.assertGreaterEqual(time.monotonic() - start, 5 / 50 * 0.9)
+
+    def test_pause_delays_every_waiter(self):
+        bucket = TokenBucket(rate=1000)
+        bucket.pause(0.2)
+        start = time.monotonic()
+        asyncio.run(bucket.acquire())
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after({"retry-after-ms": "250", "retry-after": "3"}), 0.25)
+        self.assertEqual(parse_retry_after({"retry-after": "3"}), 3.0)
+        self.assertIsNone(parse_retry_after({}))
+
+
+class TestDocumentAnalyzerPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = FakeDocumentIntelligence(polls_per_operation=2)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.analyzer = DocumentAnalyzer("fake-key", self.server.endpoint, self.temp_dir, lambda paper, config: None)
+        self.analyzer.async_azure_analyzer.polling_interval = 0.05
+        self.analyzer.azure_analyzer = MagicMock()
+        self.analyzer.azure_analyzer.model_id = "prebuilt-document"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.analyzer.paper_db.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_prefetch_fills_the_cache_once_per_unique_file(self):
+        paths = []
+        for name, content in (("a.pdf", b"alpha"), ("b.pdf", b"beta"), ("a_copy.pdf", b"alpha")):
+            path = os.path.join(self.temp_dir, name)
+            with open(path, "wb") as f:
+                f.write(content)
+            paths.append(path)
+
+        results = self.analyzer.prefetch_analysis(paths)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(self.server.analyze_requests, 2)
+        self.assertEqual(self.analyzer.get_analysis_result(paths[2])["content"], "alpha")
+        self.analyzer.azure_analyzer.analyze_pdf.assert_not_called()
+        self.assertEqual(self.analyzer.prefetch_analysis(paths), {})
+
+    def test_prefetch_works_inside_a_running_event_loop(self):
+        path = os.path.join(self.temp_dir, "a.pdf")
+        with open(path, "wb") as f:
+            f.write(b"alpha")
+
+        async def prefetch_from_a_notebook_cell():
+            return self.analyzer.prefetch_analysis([path])
+
+        results = asyncio.run(prefetch_from_a_notebook_cell())
+
+        self.assertEqual(results[path]["content"], "alpha")
+        self.assertEqual(self.server.analyze_requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from autosearch.agents.chroma_registry import ChromaStore, close_chroma_store, get_chroma_store
+from fake_chroma import FakeClient
+
+
+class TestChromaRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_dir = self.temp_dir.name
+        self.clients = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        close_chroma_store(self.db_dir)
+        self.temp_dir.cleanup()
+
+    def client_factory(self, path):
+        client = FakeClient(path)
+        with self.lock:
+            self.clients.append(client)
+        return client
+
+    def get_store(self, path):
+        return get_chroma_store(path, client_factory=self.client_factory, embedding_function_factory=object)
+
+    def test_registry_is_keyed_by_directory(self):
+        store = self.get_store(self.db_dir)
+        self.assertIs(self.get_store(os.path.join(self.db_dir, '.')), store)
+
+        with tempfile.TemporaryDirectory() as other_dir:
+            self.assertIsNot(self.get_store(other_dir), store)
+            close_chroma_store(other_dir)
+        self.assertEqual(len(self.clients), 2)
+
+    def test_concurrent_agents_share_one_client_and_collection(self):
+        stores, collections = [], []
+
+        def open_memos():
+            store = self.get_store(self.db_dir)
+            stores.append(store)
+            collections.append(store.collection("memos"))
+
+        threads = [threading.Thread(target=open_memos) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.clients), 1)
+        self.assertEqual(self.clients[0].create_calls, 1)
+        self.assertTrue(all(store is stores[0] for store in stores))
+        self.assertTrue(all(collection is collections[0] for collection in collections))
+
+    def test_reset_replaces_the_shared_collection(self):
+        store = self.get_store(self.db_dir)
+        old = store.collection("memos")
+        new = store.reset_collection("memos")
+        self.assertIsNot(new, old)
+        self.assertIs(store.collection("memos"), new)
+        self.assertIs(self.clients[0].collections["memos"], new)
+
+        # A collection that was never opened through the store is reset too.
+        self.assertIsNotNone(store.reset_collection("other"))
+
+    def test_close_opens_a_new_client_on_next_lookup(self):
+        store = self.get_store(self.db_dir)
+        close_chroma_store(self.db_dir)
+        self.assertIsNot(self.get_store(self.db_dir), store)
+        self.assertEqual(len(self.clients), 2)
+
+    def test_store_without_chromadb_needs_a_client_factory(self):
+        from autosearch.agents import chroma_registry
+        if chroma_registry.chromadb is not None:
+            self.skipTest("chromadb is installed")
+        with self.assertRaises(ImportError):
+            ChromaStore(self.db_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from autosearch.analysis.content_store import ContentStore
+from autosearch.analysis.document_analyzer import DocumentAnalyzer
+from autosearch.data.paper import Paper
+
+REAL_PDF = os.path.join(os.path.dirname(__file__), "files/real_test.pdf")
+
+
+class TestContentStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = ContentStore(os.path.join(self.temp_dir.name, "blobs"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_identical_bytes_share_one_blob(self):
+        first = self._write("2401.01234v1.pdf", b"%PDF-1.4 same bytes")
+        second = self._write("copy.pdf", b"%PDF-1.4 same bytes")
+        other = self._write("other.pdf", b"%PDF-1.4 other bytes")
+
+        digest = self.store.add(first)
+        self.assertEqual(self.store.add(second), digest)
+        self.assertNotEqual(self.store.add(other), digest)
+        self.assertTrue(self.store.contains(digest))
+        self.assertEqual(len(os.listdir(os.path.join(self.temp_dir.name, "blobs", digest[:2]))), 1)
+
+    def test_link_replaces_target_with_blob(self):
+        source = self._write("paper.pdf", b"%PDF-1.4 content")
+        digest = self.store.add(source)
+        target = os.path.join(self.temp_dir.name, "output", "named.pdf")
+        self.store.link(digest, target)
+        self.assertTrue(os.path.samefile(target, self.store.path_for(digest)))
+        # Linking again is a no-op.
+        self.store.link(digest, target)
+        with open(target, "rb") as f:
+            self.assertEqual(f.read(), b"%PDF-1.4 content")
+
+
+class TestDocumentAnalyzerDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_dir = self.temp_dir.name
+        self.analyzer = DocumentAnalyzer("fake-key", "https://example.invalid", self.project_dir, lambda paper, config: None)
+        self.analyzer.azure_analyzer = MagicMock()
+        self.analyzer.azure_analyzer.analyze_pdf.return_value = {"pages": [], "paragraphs": [], "tables": []}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_same_bytes_under_two_names_are_analyzed_once(self):
+        papers_dir = os.path.join(self.project_dir, "papers")
+        os.makedirs(papers_dir)
+        first = os.path.join(papers_dir, "2401.01234v1.pdf")
+        second = os.path.join(papers_dir, "renamed.pdf")
+        shutil.copy(REAL_PDF, first)
+        shutil.copy(REAL_PDF, second)
+
+        first_out = self.analyzer.pdf_manager.ensure_pdf_exists(Paper(title="a", authors=[], url=first, source="local"))
+        second_out = self.analyzer.pdf_manager.ensure_pdf_exists(Paper(title="b", authors=[], url=second, source="local"))
+        self.assertTrue(os.path.samefile(first_out, second_out))
+
+        self.analyzer.azure_analyzer.model_id = "prebuilt-document"
+        self.analyzer.get_analysis_result(first_out)
+        result = self.analyzer.get_analysis_result(second_out)
+
+        self.analyzer.azure_analyzer.analyze_pdf.assert_called_once()
+        self.assertEqual(result, {"pages": [], "paragraphs": [], "tables": []})
+        self.assertEqual(self.analyzer.analysis_cache.hits, 1)
+        digest = ContentStore.hash_file(REAL_PDF)
+        locations = self.analyzer.paper_db.get_pdf_locations(digest)
+        self.assertIn(first, locations)
+        self.assertIn(second_out, locations)
+
+    def test_pdf_is_hashed_once_until_it_changes(self):
+        pdf_path = os.path.join(self.project_dir, "paper.pdf")
+        shutil.copy(REAL_PDF, pdf_path)
+        pdf_manager = self.analyzer.pdf_manager
+
+        with patch.object(ContentStore, 'hash_file', wraps=ContentStore.hash_file) as hash_file:
+            digest = pdf_manager.get_pdf_hash(pdf_path)
+            self.assertEqual(pdf_manager.get_pdf_hash(pdf_path), digest)
+            self.assertEqual(hash_file.call_count, 1)
+
+            with open(pdf_path, 'ab') as f:
+                f.write(b'\n%%EOF\n')
+            self.assertNotEqual(pdf_manager.get_pdf_hash(pdf_path), digest)
+            self.assertEqual(hash_file.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
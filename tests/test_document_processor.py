@@ -0,0 +1,245 @@
+import copy
+import io
+import json
+import os
+import random
+import unittest
+from unittest.mock import patch
+
+from autosearch.analysis import tablehelper as tb
+from autosearch.analysis.document_processor import DocumentProcessor, TableSpanIndex, get_encoder
+from autosearch.data.paper import Paper
+
+
+def make_text(n_lines: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = "polymer chain representation learning graph network monomer property prediction 3.14 (Fig. 2) α-helix".split()
+    return '\n'.join(' '.join(rng.choice(words) for _ in range(rng.randint(0, 40))) for _ in range(n_lines))
+
+
+class TestDocumentProcessorChunking(unittest.TestCase):
+
+    def test_encoder_is_built_once(self):
+        self.assertIs(get_encoder(), get_encoder())
+
+    def test_short_text_is_one_part(self):
+        self.assertEqual(DocumentProcessor._split_text("one line\nanother line\n", 100), ["one line\nanother line"])
+
+    def test_parts_fit_and_preserve_lines(self):
+        text = make_text(400)
+        for max_token_size in (50, 200, 1000):
+            parts = DocumentProcessor._split_text(text, max_token_size)
+            self.assertGreater(len(parts), 1)
+            for part in parts:
+                self.assertLessEqual(DocumentProcessor.count_tokens(part), max_token_size)
+            self.assertEqual(' '.join(parts).split(), text.split())
+
+    def test_long_line_is_cut_between_words(self):
+        line = make_text(1).replace('\n', ' ') or "word"
+        line = ' '.join([line] * 50)
+        parts = DocumentProcessor._split_text(line, 64)
+        self.assertGreater(len(parts), 1)
+        for part in parts:
+            self.assertLessEqual(DocumentProcessor.count_tokens(part), 64)
+        self.assertEqual(' '.join(parts).split(), line.split())
+
+    def test_split_counts_bound_the_exact_counts(self):
+        text = make_text(400, seed=1)
+        for part, tokens in DocumentProcessor._split_text_counted(text, 200):
+            exact = DocumentProcessor.count_tokens(part)
+            self.assertLessEqual(tokens, 200)
+            self.assertGreaterEqual(tokens, exact)
+            self.assertLessEqual(tokens - exact, part.count('\n') + 1)
+
+    def test_section_is_counted_once_before_splitting(self):
+        text = make_text(400, seed=2)
+        with patch.object(DocumentProcessor, 'count_tokens', wraps=DocumentProcessor.count_tokens) as count_tokens:
+            docs = DocumentProcessor._section_docs(text, [1], "paper.pdf", 200)
+        self.assertEqual(count_tokens.call_count, 1)
+        self.assertEqual([doc.page_content for doc in docs], DocumentProcessor._split_text(text, 200))
+        self.assertTrue(all(doc.metadata["tokens"] <= 200 for doc in docs))
+
+    def test_split_documents_carry_their_exact_token_counts(self):
+        text = make_text(400, seed=3)
+        docs = DocumentProcessor._section_docs(text, [1], "paper.pdf", 200)
+        self.assertGreater(len(docs), 1)
+        for doc in docs:
+            self.assertEqual(doc.metadata["tokens"], DocumentProcessor.count_tokens(doc.page_content))
+
+    def test_create_docs_prints_the_exact_total(self):
+        data = {"pages": [{}], "paragraphs": [paragraph("Results", 0, 1, "sectionHeading")] + [
+            paragraph(make_text(3, seed=i), 8 + i, 1) for i in range(200)], "tables": []}
+        with patch('builtins.print') as printed:
+            _, _, full_md_text = DocumentProcessor.create_docs(data, 100, Paper(title="Results", authors=[], url="local.pdf", source="local"))
+        self.assertIn(f"a total of {DocumentProcessor.count_tokens(full_md_text)} tokens", printed.call_args[0][0])
+
+    def test_line_without_spaces_is_cut_on_token_offsets(self):
+        line = "x" * 5000
+        parts = DocumentProcessor._split_text(line, 100)
+        self.assertEqual(''.join(parts), line)
+        for part in parts:
+            self.assertLessEqual(DocumentProcessor.count_tokens(part), 100)
+
+
+def paragraph(content, offset, page, role=None):
+    para = {"content": content, "spans": [{"offset": offset, "length": len(content)}],
+            "bounding_regions": [{"page_number": page}]}
+    if role:
+        para["role"] = role
+    return para
+
+
+def make_layout():
+    return {
+        "pages": [{}, {}],
+        "paragraphs": [
+            paragraph("A Title", 0, 1, "title"),
+            paragraph("Introduction", 8, 1, "sectionHeading"),
+            paragraph("First paragraph.", 21, 1),
+            paragraph("1", 38, 1, "pageNumber"),
+            paragraph("Second paragraph.", 40, 2),
+            paragraph("a", 58, 2),
+            paragraph("References", 60, 2, "sectionHeading"),
+            paragraph("[1] A reference.", 71, 2),
+        ],
+        "tables": [{
+            "row_count": 1, "column_count": 1,
+            "cells": [{"row_index": 0, "column_index": 0, "content": "a"}],
+            "bounding_regions": [{"page_number": 2}],
+            "spans": [{"offset": 58, "length": 1}],
+        }],
+    }
+
+
+class TestDocumentProcessorCreateDocs(unittest.TestCase):
+
+    def setUp(self):
+        self.paper = Paper(title="A Title", authors=[], url="local.pdf", source="local")
+
+    def test_create_docs_output(self):
+        docs, page_content, full_md_text = DocumentProcessor.create_docs(make_layout(), 3000, self.paper)
+
+        # The title paragraph opens a section of its own.
+        title_section = "## A Title\n\n\n\n"
+        section = "## Introduction\n\n\n\nFirst paragraph.\n\nSecond paragraph.\n\n\n\n|a|\n|---|\n\n\n"
+        self.assertEqual([doc.page_content for doc in docs], [title_section, section])
+        self.assertEqual(docs[1].metadata["pages"], [1, 2])
+        self.assertEqual(full_md_text, "# A Title\n\n" + title_section + section)
+        self.assertEqual(page_content, {
+            "1": "A Title\n\nIntroduction\n\nFirst paragraph.\n\n",
+            "2": "Second paragraph.\n\n\n\n|a|\n|---|\n\n\n",
+        })
+
+    def test_stream_docs_matches_create_docs(self):
+        data = make_layout()
+        for reference in (False, True):
+            docs, page_content, full_md_text = DocumentProcessor.create_docs(data, 3000, self.paper, reference)
+            md_out = io.StringIO()
+            page_parts = {"1": [], "2": []}
+            streamed = list(DocumentProcessor.stream_docs(data, 3000, self.paper, reference, md_out, page_parts))
+
+            self.assertEqual([(d.page_content, d.metadata) for d in streamed], [(d.page_content, d.metadata) for d in docs])
+            self.assertEqual(md_out.getvalue(), full_md_text)
+            self.assertEqual({page: ''.join(parts) for page, parts in page_parts.items()}, page_content)
+        self.assertIn("[1] A reference.", full_md_text)
+
+    def test_create_docs_matches_the_original_implementation(self):
+        # Generated with the create_docs that predates the streaming rewrite, on a layout with
+        # multi-column tables, tables broken over pages, page furniture and a References section.
+        with open(os.path.join(os.path.dirname(__file__), "files/create_docs_golden.json"), encoding="utf-8") as f:
+            golden = json.load(f)
+        paper = Paper(title=golden["title"], authors=[], url="paper.pdf", source="local")
+        for reference, key in ((False, "without_references"), (True, "with_references")):
+            with self.subTest(reference=reference), patch("builtins.print"):
+                expected = golden["expected"][key]
+                docs, page_content, full_md_text = DocumentProcessor.create_docs(
+                    copy.deepcopy(golden["layout"]), golden["max_token_size"], paper, reference)
+
+                self.assertEqual([{"page_content": d.page_content, "metadata": d.metadata} for d in docs], expected["docs"])
+                self.assertEqual(page_content, expected["page_content"])
+                self.assertEqual(full_md_text, expected["markdown"])
+
+    def test_stream_docs_yields_before_the_document_ends(self):
+        data = make_layout()
+        stream = DocumentProcessor.stream_docs(data, 3000, self.paper, reference=True)
+        self.assertTrue(next(stream).page_content.startswith("## A Title"))
+        self.assertTrue(next(stream).page_content.startswith("## Introduction"))
+        self.assertTrue(next(stream).page_content.startswith("## References"))
+
+
+def make_random_layout(n_elements: int, seed: int):
+    """
+    Build a random layout and the processed sequence it should produce.
+
+    Tables start right after the previous paragraph or after a gap, span one to three
+    ranges separated by page furniture, and repeat their cells as paragraphs.
+    """
+    rng = random.Random(seed)
+    paragraphs, tables, expected = [], [], []
+    offset = 0
+
+    def add_paragraph(content, role=None, inside_table=False):
+        nonlocal offset
+        para = paragraph(content, offset, 1 + offset // 1000, role)
+        paragraphs.append(para)
+        offset += len(content) + 1
+        if not inside_table and role != 'pageNumber':
+            expected.append(content + "\n\n")
+        return para
+
+    while len(paragraphs) < n_elements:
+        if rng.random() < 0.15:
+            offset += rng.choice([0, 0, 3, 17])
+            table = {"row_count": 0, "column_count": rng.randint(1, 3), "cells": [], "spans": [],
+                     "bounding_regions": [{"page_number": 1 + offset // 1000}]}
+            tables.append(table)
+            expected.append(table)
+            for span_number in range(rng.randint(1, 3)):
+                if span_number:
+                    add_paragraph(str(offset), rng.choice(['pageNumber', 'pageHeader']))
+                span_start = offset
+                for row in range(rng.randint(1, 3)):
+                    for col in range(table["column_count"]):
+                        cell = f"r{table['row_count'] + row}c{col}"
+                        table["cells"].append({"row_index": table["row_count"] + row, "column_index": col, "content": cell})
+                        add_paragraph(cell, inside_table=True)
+                table["row_count"] += row + 1
+                table["spans"].append({"offset": span_start, "length": offset - span_start - 1})
+        else:
+            role = rng.choice([None, None, None, 'sectionHeading', 'pageNumber', 'footnote'])
+            add_paragraph(f"p{len(paragraphs)}", role)
+
+    expected = [item if isinstance(item, str) else "\n\n" + tb.tabletomd(item) + "\n\n" for item in expected]
+    return paragraphs, tables, expected
+
+
+class TestTableSpanIndex(unittest.TestCase):
+
+    def test_table_at(self):
+        index = TableSpanIndex([
+            {"spans": [{"offset": 10, "length": 5}, {"offset": 30, "length": 5}]},
+            {"spans": [{"offset": 20, "length": 3}]},
+        ])
+        self.assertEqual(index.table_order, [0, 1])
+        self.assertEqual([index.table_at(o) for o in (9, 10, 14, 15, 20, 25, 30, 34, 35)],
+                         [None, 0, 0, None, 1, None, 0, 0, None])
+
+    def test_random_layouts_keep_every_table_once_and_in_place(self):
+        for seed in range(20):
+            paragraphs, tables, expected = make_random_layout(3000, seed)
+            processed = DocumentProcessor._process_paragraphs(
+                paragraphs, DocumentProcessor._collect_table_spans(tables), tables)
+
+            self.assertEqual([item['content'] for item in processed], expected, f"seed {seed}")
+            self.assertEqual(sum(item['type'] == 'table' for item in processed), len(tables))
+
+    def test_table_after_the_last_paragraph(self):
+        table = {"row_count": 1, "column_count": 1, "cells": [{"row_index": 0, "column_index": 0, "content": "x"}],
+                 "bounding_regions": [{"page_number": 1}], "spans": [{"offset": 50, "length": 1}]}
+        processed = DocumentProcessor._process_paragraphs(
+            [paragraph("Only paragraph.", 0, 1)], DocumentProcessor._collect_table_spans([table]), [table])
+        self.assertEqual([item['type'] for item in processed], ['paragraph', 'table'])
+
+
+if __name__ == '__main__':
+    unittest.main()
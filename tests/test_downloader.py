@@ -0,0 +1,239 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from autosearch.api import downloader as downloader_module
+from autosearch.api.downloader import Downloader, DownloadError
+
+
+class FakeFileServer(ThreadingHTTPServer):
+    """
+    A local stand-in for a PDF host.
+
+    GET /{name} serves `files[name]` over keep-alive HTTP/1.1, with an ETag of its
+    content, and honours Range and If-Range requests. The first `cut_after` responses stop after half the body and drop the
+    connection, and every response waits `delay` seconds before the body.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, files, cut_first: int = 0, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), FileHandler)
+        self.files = files
+        self.cut_remaining = cut_first
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.connections = set()
+        self.ranges = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def url(self, name: str) -> str:
+        return f"http://127.0.0.1:{self.server_port}/{name}"
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        data = server.files.get(self.path.lstrip('/'))
+        if data is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.ranges.append(self.headers.get("Range"))
+            cut = server.cut_remaining > 0
+            server.cut_remaining -= cut
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            start = 0
+            etag = file_etag(data)
+            if self.headers.get("Range") and self.headers.get("If-Range", etag) == etag:
+                start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+                if start >= len(data):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(data)}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+            else:
+                self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(data) - start))
+            self.end_headers()
+            time.sleep(server.delay)
+            if cut:
+                self.wfile.write(data[start:start + (len(data) - start) // 2])
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.wfile.write(data[start:])
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+def file_etag(data: bytes) -> str:
+    return f'"{hashlib.sha256(data).hexdigest()[:16]}"'
+
+
+def make_pdf(size: int, seed: int = 0) -> bytes:
+    return b"%PDF-1.4\n" + bytes((i * 31 + seed) % 256 for i in range(size))
+
+
+class TestDownloader(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = {f"paper{i}.pdf": make_pdf(200_000 + i, i) for i in range(6)}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def start_server(self, **kwargs) -> FakeFileServer:
+        server = FakeFileServer(self.files, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def make_downloader(self, **kwargs) -> Downloader:
+        downloader = Downloader(chunk_size=16 * 1024, **kwargs)
+        self.addCleanup(downloader.close)
+        return downloader
+
+    def test_download_is_written_atomically_and_reuses_connections(self):
+        server = self.start_server()
+        downloader = self.make_downloader()
+
+        for name in self.files:
+            path = downloader.download(server.url(name), os.path.join(self.temp_dir, "out", name))
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), self.files[name])
+
+        self.assertEqual(sorted(os.listdir(os.path.join(self.temp_dir, "out"))), sorted(self.files))
+        self.assertEqual(len(server.connections), 1)
+
+    def test_interrupted_download_resumes_with_range(self):
+        server = self.start_server(cut_first=2)
+        path = self.make_downloader().download(server.url("paper0.pdf"), os.path.join(self.temp_dir, "paper0.pdf"))
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.files["paper0.pdf"])
+        self.assertIsNone(server.ranges[0])
+        # The chunks written before the connection dropped are not fetched again.
+        self.assertGreater(int(server.ranges[1][len("bytes="):-1]), 0)
+        self.assertEqual(len(server.ranges), 3)
+
+    def test_partial_file_from_an_earlier_run_is_resumed(self):
+        server = self.start_server()
+        path = os.path.join(self.temp_dir, "paper1.pdf")
+        with open(path + ".part", "wb") as f:
+            f.write(self.files["paper1.pdf"][:1000])
+        with open(path + ".part.validator", "w") as f:
+            f.write(file_etag(self.files["paper1.pdf"]))
+
+        self.make_downloader().download(server.url("paper1.pdf"), path)
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.files["paper1.pdf"])
+        self.assertEqual(server.ranges, ["bytes=1000-"])
+        self.assertFalse(os.path.exists(path + ".part.validator"))
+
+    def test_partial_file_of_a_changed_resource_is_fetched_whole(self):
+        server = self.start_server()
+        path = os.path.join(self.temp_dir, "paper1.pdf")
+        old = make_pdf(200_001, seed=7)
+        with open(path + ".part", "wb") as f:
+            f.write(old[:1000])
+        with open(path + ".part.validator", "w") as f:
+            f.write(file_etag(old))
+
+        self.make_downloader().download(server.url("paper1.pdf"), path)
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.files["paper1.pdf"])
+        self.assertEqual(server.ranges, ["bytes=1000-"])
+
+    def test_partial_file_without_a_validator_is_not_resumed(self):
+        server = self.start_server()
+        path = os.path.join(self.temp_dir, "paper1.pdf")
+        with open(path + ".part", "wb") as f:
+            f.write(b"stale bytes")
+
+        self.make_downloader().download(server.url("paper1.pdf"), path)
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.files["paper1.pdf"])
+        self.assertEqual(server.ranges, [None])
+
+    def test_checksum_is_verified(self):
+        server = self.start_server()
+        downloader = self.make_downloader()
+        path = os.path.join(self.temp_dir, "paper2.pdf")
+        sha256 = hashlib.sha256(self.files["paper2.pdf"]).hexdigest()
+
+        with self.assertRaises(DownloadError):
+            downloader.download(server.url("paper2.pdf"), path, sha256="0" * 64)
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(path + ".part"))
+
+        self.assertEqual(downloader.download(server.url("paper2.pdf"), path, sha256=sha256), path)
+
+    def test_download_many_bounds_concurrency_and_reports_errors(self):
+        server = self.start_server(delay=0.1)
+        downloader = self.make_downloader(max_concurrency=2)
+        jobs = [(server.url(name), os.path.join(self.temp_dir, name)) for name in self.files]
+        jobs.append((server.url("missing.pdf"), os.path.join(self.temp_dir, "missing.pdf")))
+
+        results = downloader.download_many(jobs)
+
+        self.assertEqual(server.max_in_flight, 2)
+        for url, path in jobs[:-1]:
+            self.assertEqual(results[url], path)
+        self.assertIsInstance(results[server.url("missing.pdf")], Exception)
+
+    def test_downloads_to_the_same_path_do_not_share_a_part_file(self):
+        server = self.start_server(delay=0.1)
+        path = os.path.join(self.temp_dir, "paper3.pdf")
+        downloaders = [self.make_downloader(), self.make_downloader()]
+        errors = []
+
+        def download(downloader):
+            try:
+                downloader.download(server.url("paper3.pdf"), path)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=download, args=(downloader,)) for downloader in downloaders * 2]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(server.max_in_flight, 1)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.files["paper3.pdf"])
+        self.assertEqual(downloader_module._path_locks, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+from autosearch.agents import memo_classifier
+from autosearch.agents.memo_classifier import (
+    KeywordPreClassifier, MemoDecisionLog, MemoPreClassifier, SklearnPreClassifier, get_memo_decision_log,
+    parse_structured_analysis
+)
+
+
+class TestParseStructuredAnalysis(unittest.TestCase):
+
+    def test_parses_fenced_json(self):
+        response = ('Here you go:\n```json\n{"is_task": true, "task": "Find papers on Tg", "general_task": "Literature search",'
+                    ' "advice": "Use arXiv", "has_information": "no", "question": null, "answer": ""}\n```')
+        self.assertEqual(parse_structured_analysis(response), {
+            "is_task": True, "task": "Find papers on Tg", "general_task": "Literature search", "advice": "Use arXiv",
+            "has_information": False, "question": "", "answer": "",
+        })
+
+    def test_rejects_unusable_replies(self):
+        self.assertIsNone(parse_structured_analysis("yes"))
+        self.assertIsNone(parse_structured_analysis('{"is_task": true'))
+        self.assertIsNone(parse_structured_analysis('{"is_task": true, "task": "x"}'))
+
+
+class TestKeywordPreClassifier(unittest.TestCase):
+
+    def setUp(self):
+        self.classifier = KeywordPreClassifier()
+
+    def test_skips_messages_without_content(self):
+        for text in ("", "TERMINATE", "ok thanks", "```python\nprint('a long piece of code here')\n```"):
+            self.assertFalse(self.classifier.may_contain_task(text), text)
+            self.assertFalse(self.classifier.may_contain_information(text), text)
+
+    def test_keeps_tasks_and_information(self):
+        task = "Please summarize the papers on polymer glass transition prediction."
+        self.assertTrue(self.classifier.may_contain_task(task))
+        self.assertTrue(self.classifier.may_contain_task("Compare the h-index of Daniel Weld and Oren Etzioni."))
+        self.assertTrue(self.classifier.may_contain_information("The glass transition temperature of polystyrene is 100 C."))
+
+    def test_statement_without_request_is_not_a_task(self):
+        text = "The glass transition temperature of polystyrene is 100 C."
+        self.assertFalse(self.classifier.may_contain_task(text))
+
+    def test_base_class_asks_the_llm(self):
+        self.assertTrue(MemoPreClassifier().may_contain_task(""))
+        self.assertTrue(MemoPreClassifier().may_contain_information(""))
+
+
+class TestMemoDecisionLog(unittest.TestCase):
+
+    def test_record_and_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log = MemoDecisionLog(os.path.join(temp_dir, "memo_decisions.jsonl"))
+            self.assertEqual(log.load(), [])
+            log.record("Find papers on Tg.", is_task=True, has_information=False)
+            log.record("Nothing decided.")
+            log.record("Tg of PS is 100 C.", has_information=True)
+            self.assertEqual(log.load(), [
+                {"text": "Find papers on Tg.", "is_task": True, "has_information": False},
+                {"text": "Tg of PS is 100 C.", "is_task": None, "has_information": True},
+            ])
+
+    def test_stops_recording_past_max_bytes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "memo_decisions.jsonl")
+            log = MemoDecisionLog(path, max_bytes=200)
+            for i in range(20):
+                log.record(f"Find papers on topic {i}.", is_task=True)
+            self.assertLess(os.path.getsize(path), 300)
+            logged = len(log.load())
+
+            # The size already on disk counts for a new log of the same file.
+            MemoDecisionLog(path, max_bytes=200).record("One more.", is_task=True)
+            self.assertEqual(len(log.load()), logged)
+
+    def test_agents_in_a_directory_share_one_log(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log = get_memo_decision_log(os.path.join(temp_dir, "memo_decisions.jsonl"))
+            self.assertIs(get_memo_decision_log(os.path.join(temp_dir, ".", "memo_decisions.jsonl")), log)
+
+
+@unittest.skipIf(memo_classifier.make_pipeline is None, "scikit-learn is not installed")
+class TestSklearnPreClassifier(unittest.TestCase):
+
+    def test_learns_from_logged_decisions(self):
+        decisions = [{"text": f"Please find papers about topic {i}", "is_task": True} for i in range(20)]
+        decisions += [{"text": f"Thanks, that looks fine {i}", "is_task": False} for i in range(20)]
+        classifier = SklearnPreClassifier().fit(decisions)
+        self.assertTrue(classifier.may_contain_task("Please find papers about polymers"))
+        self.assertFalse(classifier.may_contain_task("Thanks, that looks fine"))
+        # No information decisions were logged, so that round is always left to the LLM.
+        self.assertTrue(classifier.may_contain_information("Thanks, that looks fine"))
+
+
+if __name__ == '__main__':
+    unittest.main()
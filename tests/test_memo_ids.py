@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from autosearch.agents.memo_ids import MemoIdSequence, close_memo_id_sequence, get_memo_id_sequence
+
+
+def reserve_in_process(db_path, rounds, queue):
+    sequence = MemoIdSequence(db_path)
+    ids = []
+    for i in range(rounds):
+        ids.extend(sequence.reserve(1 + i % 3))
+    sequence.close()
+    queue.put(ids)
+
+
+class TestMemoIdSequence(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "memo_ids.db")
+        self.sequence = MemoIdSequence(self.db_path)
+
+    def tearDown(self):
+        self.sequence.close()
+        self.temp_dir.cleanup()
+
+    def test_reserves_consecutive_increasing_ids(self):
+        self.assertEqual(self.sequence.current(), 0)
+        self.assertEqual(list(self.sequence.reserve()), [1])
+        self.assertEqual(list(self.sequence.reserve(3)), [2, 3, 4])
+        self.assertEqual(self.sequence.current(), 4)
+
+    def test_counter_persists_and_is_shared(self):
+        self.sequence.reserve(5)
+        other = MemoIdSequence(self.db_path)
+        try:
+            self.assertEqual(other.current(), 5)
+            self.assertEqual(list(other.reserve(2)), [6, 7])
+            self.assertEqual(list(self.sequence.reserve()), [8])
+        finally:
+            other.close()
+
+    def test_advance_to_never_moves_back(self):
+        self.sequence.advance_to(41)
+        self.assertEqual(list(self.sequence.reserve()), [42])
+        self.sequence.advance_to(10)
+        self.assertEqual(list(self.sequence.reserve()), [43])
+
+    def test_concurrent_threads_get_unique_ids(self):
+        sequences = [self.sequence, MemoIdSequence(self.db_path)]
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                batches = list(executor.map(lambda i: list(sequences[i % 2].reserve(1 + i % 4)), range(200)))
+        finally:
+            sequences[1].close()
+        ids = [uid for batch in batches for uid in batch]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(sorted(ids), list(range(1, len(ids) + 1)))
+
+    def test_shared_sequence_per_path(self):
+        threads_before = threading.active_count()
+        shared = get_memo_id_sequence(self.db_path)
+        try:
+            self.assertIs(get_memo_id_sequence(os.path.join(self.temp_dir.name, ".", "memo_ids.db")), shared)
+            self.assertLessEqual(threading.active_count(), threads_before + 1)
+        finally:
+            close_memo_id_sequence(self.db_path)
+        self.assertIsNot(get_memo_id_sequence(self.db_path), shared)
+        close_memo_id_sequence(self.db_path)
+
+    def test_concurrent_processes_get_unique_ids(self):
+        queue = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=reserve_in_process, args=(self.db_path, 30, queue)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        ids = [uid for _ in processes for uid in queue.get(timeout=60)]
+        for process in processes:
+            process.join()
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(self.sequence.current(), len(ids))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from autosearch.agents.memo_journal import MemoJournal, get_memo_journal
+
+
+class TestMemoJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal = MemoJournal(os.path.join(self.temp_dir.name, "uid_text_journal.jsonl"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_append_only_adds_lines(self):
+        self.assertFalse(self.journal.exists())
+        self.assertEqual(self.journal.load(), {})
+
+        self.journal.append([("1", "What is PS?", "Polystyrene"), ("2", "Tg of PS?", "100 °C")])
+        size = os.path.getsize(self.journal.path)
+        self.journal.append([("3", "multi\nline", 'quote "x"')])
+        self.journal.append([])
+
+        with open(self.journal.path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 3)
+        self.assertGreater(os.path.getsize(self.journal.path), size)
+        self.assertEqual(self.journal.load(), {
+            "1": ("What is PS?", "Polystyrene"),
+            "2": ("Tg of PS?", "100 °C"),
+            "3": ("multi\nline", 'quote "x"'),
+        })
+
+    def test_last_line_of_an_id_wins(self):
+        self.journal.append([("1", "old", "old")])
+        self.journal.append([("1", "new", "new")])
+        self.assertEqual(self.journal.load(), {"1": ("new", "new")})
+
+    def test_torn_line_is_skipped(self):
+        self.journal.append([("1", "kept", "kept")])
+        with open(self.journal.path, "a", encoding="utf-8") as f:
+            f.write('{"id": "2", "inp')
+        self.assertEqual(self.journal.load(), {"1": ("kept", "kept")})
+
+    def test_rewrite_compacts(self):
+        self.journal.append([(str(i), f"input {i}", f"output {i}") for i in range(10)])
+        self.journal.rewrite({"3": ("input 3", "output 3")})
+        self.assertEqual(self.journal.load(), {"3": ("input 3", "output 3")})
+        self.assertEqual(os.listdir(self.temp_dir.name), ["uid_text_journal.jsonl"])
+
+        self.journal.rewrite({})
+        self.assertTrue(self.journal.exists())
+        self.assertEqual(self.journal.load(), {})
+
+    def test_concurrent_rewrites_and_appends(self):
+        journal = get_memo_journal(self.journal.path)
+        self.assertIs(get_memo_journal(os.path.join(self.temp_dir.name, ".", "uid_text_journal.jsonl")), journal)
+        base = {str(i): (f"input {i}", f"output {i}") for i in range(100)}
+        errors = []
+
+        def work(i):
+            try:
+                journal.rewrite(base)
+                journal.append([(f"new {i}", "input", "output")])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        memos = journal.load()
+        self.assertLessEqual(set(base), set(memos))
+        self.assertEqual(os.listdir(self.temp_dir.name), ["uid_text_journal.jsonl"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from autosearch.agents.chroma_registry import close_chroma_store, get_chroma_store
+from autosearch.agents.memo_ids import close_memo_id_sequence
+from autosearch.agents.memo_store import MemoStore
+from fake_chroma import FakeClient, fake_embedding_function
+
+
+class TestMemoStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_dir = self.temp_dir.name
+        self.chroma = get_chroma_store(self.db_dir, client_factory=FakeClient, embedding_function_factory=fake_embedding_function)
+        self.collection = self.chroma.collection("memos")
+
+    def tearDown(self):
+        close_chroma_store(self.db_dir)
+        close_memo_id_sequence(os.path.join(self.db_dir, "memo_ids.db"))
+        self.temp_dir.cleanup()
+
+    def seed(self, ids):
+        self.collection.add(ids=ids, documents=[f"question {uid}" for uid in ids],
+                            metadatas=[{"answer": f"answer {uid}"} for uid in ids])
+
+    def test_legacy_dict_is_migrated_and_ids_continue_after_the_highest(self):
+        self.seed(["1", "2", "10"])
+        with open(os.path.join(self.db_dir, "uid_text_dict.pkl"), "wb") as f:
+            pickle.dump({"1": ("question 1", "answer 1"), "2": ("question 2", "answer 2")}, f)
+
+        store = MemoStore(0, False, self.db_dir)
+
+        # The pickle is merged with the memos only the vector DB knows, and written out as the journal.
+        expected = {uid: (f"question {uid}", f"answer {uid}") for uid in ("1", "2", "10")}
+        self.assertEqual(store.uid_text_dict, expected)
+        self.assertEqual(store.journal.load(), expected)
+        self.assertEqual(store.add_many([("a", "b"), ("c", "d")]), ["11", "12"])
+
+    def test_db_predating_the_counter_continues_after_its_highest_id(self):
+        self.seed(["3", "7"])
+        store = MemoStore(0, False, self.db_dir)
+        self.assertEqual(store.get_last_memo_id(), 7)
+        self.assertEqual(store.add_many([("a", "b")]), ["8"])
+
+        # A later store reads the counter instead of the vector DB.
+        self.assertEqual(MemoStore(0, False, self.db_dir).add_many([("c", "d")]), ["9"])
+
+    def test_sync_advances_past_ids_added_outside_the_counter(self):
+        store = MemoStore(0, False, self.db_dir)
+        self.assertEqual(store.add_many([("a", "b")]), ["1"])
+        self.seed(["20"])
+
+        store.sync_momes()
+
+        self.assertEqual(store.get_last_memo_id(), 20)
+        self.assertEqual(store.uid_text_dict["20"], ("question 20", "answer 20"))
+        self.assertEqual(store.add_many([("c", "d")]), ["21"])
+
+    def test_collection_is_counted_only_until_it_holds_memos(self):
+        store = MemoStore(0, False, self.db_dir)
+        self.assertFalse(store.has_memos())
+        self.assertEqual(store.get_related_memos_many(["question"], 10, 1.5), [[]])
+        self.assertEqual(self.collection.queries, [])
+
+        self.seed(["1"])  # added by another store
+        self.assertTrue(store.has_memos())
+        counted = self.collection.count_calls
+        related = store.get_related_memos_many(["question 1", "question 2"], 10, 1.5)
+        self.assertTrue(store.has_memos())
+        self.assertEqual(self.collection.count_calls, counted)
+        self.assertEqual(related[0][0][:2], ("question 1", "answer 1"))
+
+        store.reset_db()
+        self.assertFalse(store.has_memos())
+
+    def test_reset_keeps_ids_unique(self):
+        store = MemoStore(0, False, self.db_dir)
+        store.add_many([("a", "b"), ("c", "d")])
+        store.reset_db()
+        self.assertEqual(store.count(), 0)
+        self.assertEqual(store.journal.load(), {})
+        self.assertEqual(store.add_many([("e", "f")]), ["3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from langchain.schema import Document
+
+from autosearch.data.paper import Paper
+from autosearch.agents import memorization_pipeline
+from autosearch.agents.memorization_pipeline import MemorizationPipeline, get_memorization_pipeline
+
+
+class FakeAssistant:
+    def __init__(self, memo_sink):
+        self.memo_sink = memo_sink
+
+
+class FakeUser:
+    def __init__(self, fail_on=None, delay=0.0):
+        self.messages = []
+        self.fail_on = fail_on
+        self.delay = delay
+
+    def initiate_chat(self, assistant, silent, message):
+        if self.fail_on and self.fail_on in message:
+            raise RuntimeError("LLM unavailable")
+        time.sleep(self.delay)
+        self.messages.append(message)
+        passage = message.split("\n\n ", 1)[1]
+        assistant.memo_sink([(f"What does passage {passage.split()[1]} say?", passage)])
+
+
+class FakeStore:
+    def __init__(self):
+        self.batches = []
+
+    def add_many(self, pairs):
+        self.batches.append(list(pairs))
+
+
+def chunk(i, words=40, extra=""):
+    return Document(page_content=f"passage {i} " + " ".join(["word"] * words) + extra)
+
+
+class TestMemorizationPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.paper = Paper(title="A paper", authors=["A. Author"], url="http://arxiv.org/abs/2401.00001", source="arxiv")
+        self.users = []
+        self.factory_calls = 0
+        self.store = FakeStore()
+        self.lock = threading.Lock()
+        self.building = 0
+        self.max_building = 0
+
+    def make_pipeline(self, user_kwargs=None, **kwargs):
+        def agent_factory(memo_sink):
+            with self.lock:
+                self.factory_calls += 1
+                self.building += 1
+                self.max_building = max(self.max_building, self.building)
+                user = FakeUser(**(user_kwargs or {}))
+                self.users.append(user)
+            time.sleep(0.01)  # building a teachable agent opens its memo DB
+            with self.lock:
+                self.building -= 1
+            return FakeAssistant(memo_sink), user
+
+        return MemorizationPipeline("unused", [], agent_factory=agent_factory, store_factory=lambda: self.store, **kwargs)
+
+    def test_memorizes_filtered_chunks_and_inserts_their_memos(self):
+        chunks = [chunk(0), chunk(1, words=5), chunk(2, extra=" see REFERENCE 3"), chunk(3), chunk(4),
+                  chunk(5, extra=" REFERENCES"), chunk(6)]
+        pipeline = self.make_pipeline(memorize_workers=2, queue_size=2)
+
+        stats = pipeline.run(self.paper, lambda paper: chunks)
+
+        messages = [message for user in self.users for message in user.messages]
+        # Chunk 1 is too short; chunk 5 starts the references in the second half, which are dropped.
+        self.assertEqual(sorted(message.split("\n\n ", 1)[1].split()[1] for message in messages), ["0", "2", "3", "4"])
+        self.assertTrue(all(message.startswith("MEMORIZE_ARTICLE: ") and "'A paper [http://arxiv.org/abs/2401.00001]" in message
+                            for message in messages))
+        self.assertEqual(sum(len(batch) for batch in self.store.batches), 4)
+
+        self.assertEqual(stats["chunking"]["items"], 7)
+        self.assertEqual(stats["filtering"]["items"], 7)
+        self.assertEqual(stats["memorization"]["items"], 4)
+        self.assertEqual(stats["insertion"]["items"], 4)
+        self.assertEqual(stats["pipeline"]["items"], 4)
+        self.assertIn("items_per_second", stats["insertion"])
+
+    def test_agents_are_reused_across_chunks_and_papers(self):
+        pipeline = self.make_pipeline(memorize_workers=3, user_kwargs={"delay": 0.01})
+        pipeline.run(self.paper, lambda paper: [chunk(i) for i in range(12)])
+        pipeline.run(self.paper, lambda paper: [chunk(i) for i in range(12)])
+        self.assertLessEqual(self.factory_calls, 3)
+        self.assertEqual(self.max_building, 1)
+        self.assertEqual(sum(len(batch) for batch in self.store.batches), 24)
+
+    def test_insertion_batches_memos(self):
+        pipeline = self.make_pipeline(memorize_workers=4, insert_batch_size=3)
+        pipeline.run(self.paper, lambda paper: [chunk(i) for i in range(20)])
+        self.assertTrue(all(len(batch) <= 3 for batch in self.store.batches))
+        self.assertEqual(sum(len(batch) for batch in self.store.batches), 20)
+
+    def test_failed_chunks_do_not_stop_the_pipeline(self):
+        pipeline = self.make_pipeline(memorize_workers=2, user_kwargs={"fail_on": "passage 1 "})
+        stats = pipeline.run(self.paper, lambda paper: [chunk(i) for i in range(4)])
+        self.assertEqual(stats["memorization"]["items"], 4)
+        self.assertEqual(sum(len(batch) for batch in self.store.batches), 3)
+
+    def test_chunker_errors_are_raised(self):
+        pipeline = self.make_pipeline(memorize_workers=2)
+
+        def chunker(paper):
+            raise FileNotFoundError("no PDF")
+
+        with self.assertRaises(FileNotFoundError):
+            pipeline.run(self.paper, chunker)
+        self.assertEqual(self.factory_calls, 0)
+
+    def test_registry_shares_a_pipeline_per_db_and_config(self):
+        config_list = [{"model": "gpt-4o", "api_key": "key"}]
+        with tempfile.TemporaryDirectory() as db_dir:
+            try:
+                pipeline = get_memorization_pipeline(db_dir, config_list)
+                self.assertIs(get_memorization_pipeline(os.path.join(db_dir, "."), [dict(config_list[0])]), pipeline)
+                with self.assertRaises(ValueError):
+                    get_memorization_pipeline(db_dir, [{"model": "gpt-4o-mini", "api_key": "key"}])
+            finally:
+                memorization_pipeline._pipelines.pop(db_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
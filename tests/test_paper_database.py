@@ -0,0 +1,205 @@
+import os
+import sqlite3
+import unittest
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from autosearch.database.paper_database import PaperDatabase
+from autosearch.database.migrations import SCHEMA_VERSION
+from autosearch.data.paper import Paper
+
+
+def make_paper(i: int) -> Paper:
+    return Paper(
+        title=f"Paper {i}",
+        authors=["Author A", "Author B"],
+        url=f"http://arxiv.org/abs/2401.{i:05d}",
+        source="arxiv",
+        local_path=f"/tmp/output/2401.{i:05d}.pdf",
+        published_date=datetime(2024, 1, 1),
+    )
+
+
+class TestPaperDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.paper_db = PaperDatabase(self.temp_dir.name)
+
+    def tearDown(self):
+        self.paper_db.close()
+        self.temp_dir.cleanup()
+
+    def test_wal_mode_enabled(self):
+        mode = self.paper_db.pool.connection().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode.lower(), "wal")
+
+    def test_add_and_check_paper(self):
+        paper = make_paper(1)
+        self.assertFalse(self.paper_db.check_paper(paper.url, "read_papers"))
+        self.paper_db.add_paper("read_papers", paper)
+        self.assertTrue(self.paper_db.check_paper(paper.url, "read_papers"))
+        self.assertTrue(self.paper_db.check_paper_by_localpath(paper.local_path))
+        self.assertEqual(self.paper_db.count_papers("read_papers"), 1)
+
+        info = self.paper_db.get_paper_info(paper.url, "read_papers")
+        self.assertEqual(info.title, "Paper 1")
+        self.assertEqual(info.source, "arxiv")
+        self.assertEqual(info.local_path, paper.local_path)
+        self.assertEqual(info.authors, ["Author A", "Author B"])
+
+    def test_invalid_table_name(self):
+        with self.assertRaises(ValueError):
+            self.paper_db.add_paper("unknown", make_paper(1))
+
+    def test_update_and_delete(self):
+        paper = make_paper(1)
+        self.paper_db.add_paper("read_abstracts", paper)
+        self.paper_db.update_paper(paper.url, "read_abstracts", {"title": "Renamed"})
+        self.assertEqual(self.paper_db.get_all_papers("read_abstracts")[0]["title"], "Renamed")
+        self.paper_db.delete_paper(paper.url, "read_abstracts")
+        self.assertEqual(self.paper_db.count_papers("read_abstracts"), 0)
+
+    def test_failed_write_is_rolled_back(self):
+        def failing_write(conn):
+            conn.execute("INSERT INTO read_abstracts (url, title) VALUES ('x', 'y')")
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            self.paper_db.pool.execute_write(failing_write)
+        self.assertEqual(self.paper_db.count_papers("read_abstracts"), 0)
+
+    def test_concurrent_writes_and_reads(self):
+        def worker(i):
+            paper = make_paper(i)
+            self.paper_db.add_paper("read_abstracts", paper)
+            return self.paper_db.check_paper(paper.url, "read_abstracts")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(worker, range(200)))
+
+        self.assertTrue(all(results))
+        self.assertEqual(self.paper_db.count_papers("read_abstracts"), 200)
+
+    def test_add_papers_bulk(self):
+        written = self.paper_db.add_papers("read_papers", [make_paper(i) for i in range(500)])
+        self.assertEqual(written, 500)
+        self.assertEqual(self.paper_db.count_papers("read_papers"), 500)
+        self.assertEqual(self.paper_db.add_papers("read_papers", []), 0)
+        with self.assertRaises(ValueError):
+            self.paper_db.add_papers("unknown", [make_paper(1)])
+
+    def test_filter_unseen(self):
+        self.paper_db.add_papers("read_abstracts", [make_paper(i) for i in range(0, 2000, 2)])
+        urls = [make_paper(i).url for i in range(2000)]
+        unseen = self.paper_db.filter_unseen(urls + [urls[1], None], "read_abstracts")
+        self.assertEqual(unseen, urls[1::2])
+        self.assertEqual(self.paper_db.filter_unseen([], "read_abstracts"), [])
+
+    def test_fts_search_ranks_and_highlights(self):
+        papers = [make_paper(i) for i in range(3)]
+        papers[0].abstract = "We study polymer chains with graph neural networks."
+        papers[1].title = "Polymer representation learning"
+        papers[1].abstract = "A survey of polymer descriptors."
+        papers[2].abstract = "Nothing relevant here."
+        self.paper_db.add_papers("read_abstracts", papers)
+
+        results = self.paper_db.search_papers("read_abstracts", "polymer", mode="fts")
+        self.assertEqual([r["url"] for r in results], [papers[1].url, papers[0].url])
+        self.assertGreater(results[0]["score"], results[1]["score"])
+        self.assertIn("**polymer**", results[1]["snippet"].lower())
+        self.assertEqual(results[0]["abstract"], "A survey of polymer descriptors.")
+        self.assertEqual(len(self.paper_db.search_papers("read_abstracts", "polymer", mode="fts", limit=1)), 1)
+        self.assertEqual(self.paper_db.search_papers("read_abstracts", 'polymer "chains', mode="fts")[0]["url"], papers[0].url)
+
+    def test_fts_stays_in_sync(self):
+        paper = make_paper(1)
+        paper.abstract = "quantum annealing"
+        self.paper_db.add_paper("read_papers", paper)
+        paper.abstract = "classical optimisation"
+        self.paper_db.add_paper("read_papers", paper)
+        self.assertEqual(self.paper_db.search_papers("read_papers", "quantum", mode="fts"), [])
+        self.assertEqual(len(self.paper_db.search_papers("read_papers", "classical", mode="fts")), 1)
+
+        self.paper_db.update_paper(paper.url, "read_papers", {"summary": "tensor networks"})
+        self.assertEqual(len(self.paper_db.search_papers("read_papers", "tensor", mode="fts")), 1)
+        self.paper_db.delete_paper(paper.url, "read_papers")
+        self.assertEqual(self.paper_db.search_papers("read_papers", "tensor", mode="fts"), [])
+
+    def test_existing_database_is_upgraded(self):
+        with tempfile.TemporaryDirectory() as project_dir:
+            conn = sqlite3.connect(os.path.join(project_dir, "papers.db"))
+            conn.execute("CREATE TABLE read_abstracts (url TEXT PRIMARY KEY, title TEXT, authors TEXT, published_date TEXT, last_updated_date TEXT, source TEXT)")
+            conn.execute("INSERT INTO read_abstracts VALUES ('u1', 'Legacy polymer paper', 'A', '', '', 'arxiv')")
+            conn.commit()
+            conn.close()
+
+            paper_db = PaperDatabase(project_dir)
+            results = paper_db.search_papers("read_abstracts", "legacy", mode="fts")
+            self.assertEqual([r["url"] for r in results], ["u1"])
+            self.assertIsNone(results[0]["abstract"])
+            self.assertEqual(paper_db.papers_by_author("a", "read_abstracts")[0]["url"], "u1")
+            version = paper_db.pool.connection().execute("PRAGMA user_version").fetchone()[0]
+            self.assertEqual(version, SCHEMA_VERSION)
+            paper_db.close()
+
+            # Reopening an up-to-date database is a no-op.
+            paper_db = PaperDatabase(project_dir)
+            self.assertEqual(paper_db.count_papers("read_abstracts"), 1)
+            paper_db.close()
+
+    def test_papers_by_author(self):
+        papers = [make_paper(i) for i in range(3)]
+        papers[0].authors = ["Jane Doe", "John Smith"]
+        papers[1].authors = ["john  SMITH"]
+        papers[1].published_date = datetime(2024, 6, 1)
+        papers[2].authors = ["Jane Doe"]
+        self.paper_db.add_papers("read_papers", papers)
+
+        self.assertEqual([p["url"] for p in self.paper_db.papers_by_author("John Smith")], [papers[1].url, papers[0].url])
+        self.assertEqual(self.paper_db.papers_by_author("John Smith", "read_abstracts"), [])
+
+        self.paper_db.update_paper(papers[2].url, "read_papers", {"authors": "John Smith"})
+        self.assertEqual(len(self.paper_db.papers_by_author("john smith")), 3)
+        self.assertEqual(self.paper_db.papers_by_author("Jane Doe")[0]["url"], papers[0].url)
+
+        self.paper_db.delete_paper(papers[0].url, "read_papers")
+        self.assertEqual(self.paper_db.papers_by_author("Jane Doe"), [])
+
+    def test_papers_between(self):
+        papers = [make_paper(i) for i in range(4)]
+        papers[0].published_date = datetime(2023, 12, 31, 23, 0)
+        papers[1].published_date = datetime(2024, 1, 31, 12, 0)
+        papers[2].published_date = datetime(2024, 2, 1)
+        papers[3].published_date = None
+        self.paper_db.add_papers("read_papers", papers)
+
+        urls = [p["url"] for p in self.paper_db.papers_between("2024-01-01", "2024-01-31")]
+        self.assertEqual(urls, [papers[1].url])
+        urls = [p["url"] for p in self.paper_db.papers_between(date_to=datetime(2024, 1, 31))]
+        self.assertEqual(urls, [papers[0].url])
+        self.assertEqual(len(self.paper_db.papers_between()), 3)
+
+    def test_lookups_use_indexes(self):
+        conn = self.paper_db.pool.connection()
+
+        def plan(query, params):
+            return ' '.join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params))
+
+        self.assertIn("idx_read_papers_local_path", plan("SELECT local_path FROM read_papers WHERE local_path = ?", ("x",)))
+        self.assertIn("idx_read_papers_published_date", plan("SELECT * FROM read_papers WHERE published_date >= ?", ("2024",)))
+        self.assertIn("idx_paper_authors_author_key", plan("SELECT url FROM paper_authors WHERE author_key = ? AND table_name = ?", ("x", "read_papers")))
+
+    def test_reader_connection_is_per_thread(self):
+        main_conn = self.paper_db.pool.connection()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.paper_db.pool.connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(main_conn, other[0])
+        self.assertIs(main_conn, self.paper_db.pool.connection())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from autosearch.path_registry import PathRegistry
+
+
+class TestPathRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.built = []
+        self.registry = PathRegistry(self.build)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def build(self, path, *args, **kwargs):
+        item = (path, args, kwargs)
+        self.built.append(item)
+        return item
+
+    def test_spellings_of_a_path_share_one_object(self):
+        item = self.registry.get(self.temp_dir.name, 1, option=True)
+        self.assertEqual(item, (self.temp_dir.name, (1,), {'option': True}))
+        # The arguments of later lookups are ignored.
+        self.assertIs(self.registry.get(os.path.join(self.temp_dir.name, '.'), 2), item)
+        self.assertEqual(len(self.built), 1)
+
+    def test_concurrent_lookups_build_once(self):
+        threads = [threading.Thread(target=self.registry.get, args=(self.temp_dir.name,)) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.built), 1)
+
+    def test_pop_removes_the_object(self):
+        item = self.registry.get(self.temp_dir.name)
+        self.assertIs(self.registry.pop(self.temp_dir.name), item)
+        self.assertIsNone(self.registry.pop(self.temp_dir.name))
+        self.assertIsNot(self.registry.get(self.temp_dir.name), item)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from autosearch.api.google_scholar_api import GoogleScholarAPI
+from autosearch.api.provider_scheduler import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ProviderScheduler,
+    RateLimiter,
+)
+
+
+class PagedSource:
+    """A stand-in for a paged provider generator that records whether it was closed."""
+
+    def __init__(self, n_items=100, delay=0.0, error_at=None):
+        self.n_items = n_items
+        self.delay = delay
+        self.error_at = error_at
+        self.fetched = 0
+        self.closed = False
+
+    def __call__(self):
+        try:
+            for i in range(self.n_items):
+                time.sleep(self.delay)
+                if i == self.error_at:
+                    raise RuntimeError("blocked")
+                self.fetched += 1
+                yield {"bib": {"title": f"Paper {i}", "author": ["A"]}, "pub_url": f"http://scholar/{i}"}
+        finally:
+            self.closed = True
+
+
+class TestRateLimiterAndBreaker(unittest.TestCase):
+
+    def test_rate_limiter_allows_a_burst_then_paces(self):
+        limiter = RateLimiter(rate=20.0, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            self.assertTrue(limiter.acquire())
+        self.assertGreater(time.monotonic() - start, 0.08)
+
+    def test_rate_limiter_wait_ends_on_cancel_and_deadline(self):
+        limiter = RateLimiter(rate=0.1, capacity=1)
+        limiter.acquire()
+        cancel = threading.Event()
+        threading.Timer(0.05, cancel.set).start()
+        self.assertFalse(limiter.acquire(cancel_event=cancel))
+        self.assertFalse(limiter.acquire(deadline=time.monotonic() + 0.05))
+
+    def test_breaker_opens_and_lets_one_trial_through(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        time.sleep(0.12)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestProviderScheduler(unittest.TestCase):
+
+    def test_cancel_stops_the_fetch_and_closes_the_generator(self):
+        scheduler = ProviderScheduler("test", rate=100.0)
+        source = PagedSource(delay=0.01)
+        cancel = threading.Event()
+
+        items = []
+        for item in scheduler.iterate(source, 100, cancel_event=cancel):
+            items.append(item)
+            if len(items) == 3:
+                cancel.set()
+
+        self.assertEqual(len(items), 3)
+        self.assertTrue(source.closed)
+        self.assertEqual(source.fetched, 3)
+        self.assertEqual(scheduler.metrics()['cancelled'], 1)
+        self.assertEqual(scheduler.metrics()['in_flight'], 0)
+
+    def test_timeouts_and_errors_open_the_breaker(self):
+        scheduler = ProviderScheduler("test", rate=100.0, failure_threshold=2, reset_timeout=60)
+        source = PagedSource(delay=0.05)
+        items = list(scheduler.iterate(source, 100, deadline=time.monotonic() + 0.12))
+        self.assertLess(len(items), 100)
+        self.assertTrue(source.closed)
+
+        with self.assertRaises(RuntimeError):
+            list(scheduler.iterate(PagedSource(error_at=0), 10))
+        start = time.monotonic()
+        with self.assertRaises(CircuitOpenError):
+            list(scheduler.iterate(PagedSource(), 10))
+        self.assertLess(time.monotonic() - start, 0.05)
+
+        metrics = scheduler.metrics()
+        self.assertEqual((metrics['timeouts'], metrics['failures'], metrics['short_circuited']), (1, 1, 1))
+        self.assertEqual(metrics['state'], CircuitBreaker.OPEN)
+
+    def test_calls_are_serialized(self):
+        scheduler = ProviderScheduler("test", rate=100.0, capacity=10, max_concurrency=1)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def request():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+        threads = [threading.Thread(target=scheduler.call, args=(request,)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(peak[0], 1)
+        self.assertEqual(scheduler.metrics()['successes'], 5)
+
+
+class TestGoogleScholarScheduling(unittest.TestCase):
+
+    def test_search_returns_partial_results_at_the_timeout_and_stops_fetching(self):
+        source = PagedSource(delay=0.1)
+        api = GoogleScholarAPI(timeout=0.35, scheduler=ProviderScheduler("google_scholar", rate=100.0))
+        with patch('autosearch.api.google_scholar_api.scholarly') as scholarly:
+            scholarly.search_pubs.side_effect = lambda query: source()
+            papers = api.search("polymers", 10)
+            fetched = source.fetched
+            time.sleep(0.3)
+
+        self.assertTrue(0 < len(papers) < 10)
+        self.assertTrue(source.closed)
+        self.assertEqual(source.fetched, fetched)
+        self.assertEqual(api.scheduler.metrics()['timeouts'], 1)
+
+    def test_open_breaker_fails_fast(self):
+        scheduler = ProviderScheduler("google_scholar", rate=100.0, failure_threshold=1, reset_timeout=60)
+        api = GoogleScholarAPI(timeout=5, scheduler=scheduler)
+        with patch('autosearch.api.google_scholar_api.scholarly') as scholarly:
+            scholarly.search_pubs.side_effect = lambda query: PagedSource(error_at=0)()
+            with self.assertRaises(RuntimeError):
+                api.search("polymers", 5)
+            with self.assertRaises(CircuitOpenError):
+                api.get_paper_metadata("Some title")
+        self.assertEqual(scholarly.search_pubs.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
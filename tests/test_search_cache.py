@@ -0,0 +1,103 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+
+from autosearch.api.search_cache import SearchCache, normalize_query
+from autosearch.data.paper import Paper
+
+
+def make_paper(i: int) -> Paper:
+    return Paper(title=f"Paper {i}", authors=["Doe, J.", "Roe, R."], url=f"http://arxiv.org/abs/{i}", source="arxiv",
+                 published_date=datetime(2024, 1, 2, tzinfo=timezone.utc))
+
+
+class TestSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "search_cache.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_normalize_query_keeps_boolean_operators(self):
+        self.assertEqual(normalize_query("  Polymer   Informatics\n"), "polymer informatics")
+        self.assertEqual(normalize_query("ti:Graph AND abs:Polymer"), "ti:graph AND abs:polymer")
+
+    def test_round_trip_and_counters(self):
+        cache = SearchCache(self.db_path)
+        self.assertIsNone(cache.get('search', 'arxiv', "polymer informatics", 5))
+        cache.put('search', 'arxiv', "polymer informatics", [make_paper(1), make_paper(2)], 5)
+
+        papers, fresh = cache.get('search', 'arxiv', "Polymer  INFORMATICS ", 5)
+        self.assertTrue(fresh)
+        self.assertEqual(papers, [make_paper(1), make_paper(2)])
+        self.assertIsNone(cache.get('search', 'arxiv', "polymer informatics", 10))
+        self.assertIsNone(cache.get('search', 'google_scholar', "polymer informatics", 5))
+
+        cache.put('metadata', 'arxiv', "1234", make_paper(3))
+        self.assertEqual(cache.get('metadata', 'arxiv', " 1234"), (make_paper(3), True))
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 3)
+        cache.close()
+
+    def test_entries_persist_across_instances(self):
+        cache = SearchCache(self.db_path)
+        cache.put('search', 'arxiv', "q", [make_paper(1)], 5)
+        cache.close()
+        cache = SearchCache(self.db_path)
+        self.assertEqual(cache.get('search', 'arxiv', "q", 5)[0], [make_paper(1)])
+        cache.close()
+
+    def test_stale_entries_are_served_then_expire(self):
+        cache = SearchCache(self.db_path, ttls={'search': 0.0}, stale_ttl=0.5)
+        cache.put('search', 'arxiv', "q", [make_paper(1)], 5)
+        time.sleep(0.01)
+        papers, fresh = cache.get('search', 'arxiv', "q", 5)
+        self.assertFalse(fresh)
+        self.assertEqual(papers, [make_paper(1)])
+        time.sleep(0.6)
+        self.assertIsNone(cache.get('search', 'arxiv', "q", 5))
+        cache.close()
+
+    def test_refresh_replaces_the_entry_once(self):
+        cache = SearchCache(self.db_path)
+        cache.put('search', 'arxiv', "q", [make_paper(1)], 5)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return [make_paper(2)]
+
+        cache.refresh('search', 'arxiv', "q", fetch, 5)
+        cache.refresh('search', 'arxiv', "q", fetch, 5)
+        deadline = time.monotonic() + 2
+        while cache.get('search', 'arxiv', "q", 5)[0] != [make_paper(2)] and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(cache.get('search', 'arxiv', "q", 5)[0], [make_paper(2)])
+        self.assertEqual(len(calls), 1)
+        cache.close()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = SearchCache(self.db_path, max_entries=3)
+        for i in range(5):
+            cache.put('search', 'arxiv', f"query {i}", [make_paper(i)], 5)
+        self.assertEqual([cache.get('search', 'arxiv', f"query {i}", 5) is not None for i in range(5)],
+                         [False, False, True, True, True])
+        self.assertEqual(cache.stats()['evictions'], 2)
+        cache.close()
+
+    def test_empty_and_unserializable_results_are_not_stored(self):
+        cache = SearchCache(self.db_path)
+        cache.put('search', 'arxiv', "q", [], 5)
+        cache.put('metadata', 'arxiv', "x", object())
+        self.assertIsNone(cache.get('search', 'arxiv', "q", 5))
+        self.assertIsNone(cache.get('metadata', 'arxiv', "x"))
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,16 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import tempfile
+import threading
+import time
 import sys
 import os
 # sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 from autosearch.api.search_manager import SearchManager
+from contextlib import contextmanager
+from autosearch.api.search_api_base import SearchAPIBase
+from autosearch.api.google_scholar_api import GoogleScholarAPI
+from autosearch.api.provider_scheduler import ProviderScheduler
 from autosearch.data.paper import Paper
 
 class TestSearchManager(unittest.TestCase):
@@ -72,5 +78,204 @@ class TestSearchManager(unittest.TestCase):
         self.assertEqual(results['arxiv'][0].local_path, "/fake/dir/1234.pdf")
         self.assertEqual(results['google_scholar'][0].local_path, "/fake/dir/5678.pdf")
 
+class FakeSearchAPI(SearchAPIBase):
+    """A provider that yields `n_papers` papers `delay` seconds apart, then hangs if asked to."""
+
+    def __init__(self, name, n_papers=2, delay=0.0, hang=False, error=None):
+        self.name = name
+        self.n_papers = n_papers
+        self.delay = delay
+        self.hang = hang
+        self.error = error
+        self.cancelled = threading.Event()
+        self.calls = 0
+
+    def search(self, query, n_results=10):
+        return list(self.iter_search(query, n_results))
+
+    def iter_search(self, query, n_results=10, cancel_event=None):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        for i in range(min(self.n_papers, n_results)):
+            time.sleep(self.delay)
+            yield Paper(title=f"{self.name} {i}", url=f"http://{self.name}/{i}", source=self.name, authors=[])
+        while self.hang:
+            if cancel_event is not None and cancel_event.wait(0.01):
+                self.cancelled.set()
+                return
+
+    def get_paper_metadata(self, identifier):
+        raise NotImplementedError
+
+    def download_pdf(self, identifier, output_path):
+        raise NotImplementedError
+
+
+class QueuedSearchAPI(FakeSearchAPI):
+    """A provider whose search waits `queued` seconds for its turn, as arXiv searches do behind each other."""
+
+    def __init__(self, name, queued, **kwargs):
+        super().__init__(name, **kwargs)
+        self.queued = queued
+
+    @contextmanager
+    def count_queue_wait(self, queue_wait):
+        with queue_wait.waiting():
+            time.sleep(self.queued)
+        yield
+
+
+class TestConcurrentSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.search_manager = SearchManager(self.temp_dir.name, timeouts={'fast': 5, 'slow': 5, 'hung': 0.3})
+
+    def tearDown(self):
+        self.search_manager.paper_db.close()
+        self.search_manager.search_cache.close()
+        self.temp_dir.cleanup()
+
+    def test_providers_run_concurrently(self):
+        self.search_manager.apis = {'fast': FakeSearchAPI('fast', delay=0.15), 'slow': FakeSearchAPI('slow', delay=0.15)}
+
+        start = time.monotonic()
+        results = self.search_manager.search_all("polymers", 5)
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual([p.title for p in results['fast']], ["fast 0", "fast 1"])
+        self.assertEqual([p.title for p in results['slow']], ["slow 0", "slow 1"])
+
+    def test_deadline_returns_partial_results_and_cancels(self):
+        hung = FakeSearchAPI('hung', hang=True)
+        self.search_manager.apis = {'fast': FakeSearchAPI('fast'), 'hung': hung}
+
+        start = time.monotonic()
+        results = self.search_manager.search_all("polymers", 5)
+
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(len(results['fast']), 2)
+        self.assertEqual([p.title for p in results['hung']], ["hung 0", "hung 1"])
+        self.assertTrue(hung.cancelled.wait(1.0))
+
+    def test_time_queued_for_a_provider_does_not_count_towards_its_deadline(self):
+        self.search_manager.apis = {'hung': QueuedSearchAPI('hung', queued=0.5)}
+
+        results = self.search_manager.search_all("polymers", 5)
+
+        self.assertEqual([p.title for p in results['hung']], ["hung 0", "hung 1"])
+
+    def test_errors_leave_other_providers_intact(self):
+        self.search_manager.apis = {'fast': FakeSearchAPI('fast'), 'slow': FakeSearchAPI('slow', error=RuntimeError("boom"))}
+
+        results = self.search_manager.search_all("polymers", 5)
+
+        self.assertEqual(len(results['fast']), 2)
+        self.assertEqual(results['slow'], [])
+
+    def test_search_all_iter_yields_before_slow_providers_finish(self):
+        slow = FakeSearchAPI('slow', n_papers=1, delay=0.0, hang=True)
+        self.search_manager.timeouts['slow'] = 5
+        self.search_manager.apis = {'fast': FakeSearchAPI('fast', n_papers=1), 'slow': slow}
+
+        start = time.monotonic()
+        stream = self.search_manager.search_all_iter("polymers", 5)
+        first_two = {next(stream)[0], next(stream)[0]}
+        stream.close()
+
+        self.assertEqual(first_two, {'fast', 'slow'})
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertTrue(slow.cancelled.wait(1.0))
+
+    def test_search_all_batches_groups_results_that_arrived_together(self):
+        self.search_manager.apis = {'fast': FakeSearchAPI('fast', n_papers=3), 'slow': FakeSearchAPI('slow', n_papers=3)}
+
+        batches = list(self.search_manager.search_all_batches("polymers", 5))
+        self.assertEqual(sorted(paper.title for batch in batches for _, paper in batch),
+                         ["fast 0", "fast 1", "fast 2", "slow 0", "slow 1", "slow 2"])
+
+        # Cached results are all available at once.
+        cached = list(self.search_manager.search_all_batches("polymers", 5))
+        self.assertEqual(len(cached), 1)
+        self.assertEqual(len(cached[0]), 6)
+
+    def test_repeated_searches_are_served_from_the_cache(self):
+        fast = FakeSearchAPI('fast')
+        self.search_manager.apis = {'fast': fast}
+
+        first = self.search_manager.search_all("Polymer informatics", 5)
+        second = self.search_manager.search_all("polymer  informatics", 5)
+        # A new manager of the same project shares the cache.
+        third_manager = SearchManager(self.temp_dir.name)
+        third_manager.apis = {'fast': fast}
+        third = third_manager.search_all("polymer informatics", 5)
+        third_manager.search_all("polymer informatics", 3)
+        third_manager.paper_db.close()
+        third_manager.search_cache.close()
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, third)
+        self.assertEqual(fast.calls, 2)
+        self.assertEqual(self.search_manager.cache_stats()['hits'], 1)
+
+    def test_partial_results_are_not_cached(self):
+        hung = FakeSearchAPI('hung', hang=True)
+        self.search_manager.apis = {'hung': hung}
+
+        self.search_manager.search_all("polymers", 5)
+        self.search_manager.search_all("polymers", 5)
+
+        self.assertEqual(hung.calls, 2)
+
+    def test_metadata_is_cached(self):
+        class MetadataAPI(FakeSearchAPI):
+            def get_paper_metadata(self, identifier):
+                self.calls += 1
+                return Paper(title="Cached", url=identifier, source="fast", authors=["A"])
+
+        api = MetadataAPI('fast')
+        self.search_manager.apis = {'fast': api}
+        self.assertEqual(self.search_manager.get_paper_metadata("http://x/1", 'fast').title, "Cached")
+        self.assertEqual(self.search_manager.get_paper_metadata("http://x/1", 'fast').title, "Cached")
+        self.assertEqual(api.calls, 1)
+
+    def test_papers_metadata_batches_misses_and_falls_back_per_identifier(self):
+        class BatchAPI(FakeSearchAPI):
+            def get_papers_metadata(self, identifiers):
+                self.calls += 1
+                return {i: Paper(title=i, url=i, source="batch", authors=[]) if i != "bad" else ValueError(i)
+                        for i in identifiers}
+
+        class SingleAPI(FakeSearchAPI):
+            def get_paper_metadata(self, identifier):
+                self.calls += 1
+                return Paper(title=identifier, url=identifier, source="single", authors=[])
+
+        batch, single = BatchAPI('batch'), SingleAPI('single')
+        self.search_manager.apis = {'batch': batch, 'single': single}
+
+        first = self.search_manager.get_papers_metadata(["a", "b", "bad"], 'batch')
+        second = self.search_manager.get_papers_metadata(["a", "b", "c", "bad"], 'batch')
+        self.search_manager.get_papers_metadata(["x", "y"], 'single')
+
+        self.assertEqual(first["a"].title, "a")
+        self.assertIsInstance(first["bad"], ValueError)
+        self.assertEqual(sorted(p.title for k, p in second.items() if k != "bad"), ["a", "b", "c"])
+        self.assertEqual(batch.calls, 2)
+        self.assertEqual(single.calls, 2)
+
+    def test_provider_metrics_report_scheduled_providers(self):
+        scheduler = ProviderScheduler('google_scholar', rate=100.0)
+        self.search_manager.apis = {'fast': FakeSearchAPI('fast'), 'google_scholar': GoogleScholarAPI(scheduler=scheduler)}
+        scheduler.call(lambda: None)
+
+        metrics = self.search_manager.provider_metrics()
+
+        self.assertEqual(list(metrics), ['google_scholar'])
+        self.assertEqual(metrics['google_scholar']['successes'], 1)
+        self.assertEqual(metrics['google_scholar']['state'], 'closed')
+
+
 if __name__ == '__main__':
     unittest.main()
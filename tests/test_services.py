@@ -0,0 +1,61 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from autosearch.api.search_manager import SearchManager
+from autosearch.config_types import ProjectConfig
+from autosearch.services import close_project_services, get_project_services
+
+
+class TestProjectServices(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_dir = self.temp_dir.name
+
+    def tearDown(self):
+        close_project_services(self.project_dir)
+        self.temp_dir.cleanup()
+
+    def test_registry_is_keyed_by_directory(self):
+        services = get_project_services(self.project_dir)
+        self.assertIs(get_project_services(os.path.join(self.project_dir, '.')), services)
+
+        with tempfile.TemporaryDirectory() as other_dir:
+            self.assertIsNot(get_project_services(other_dir), services)
+            close_project_services(other_dir)
+
+    def test_services_are_built_lazily_and_once(self):
+        services = get_project_services(self.project_dir)
+        self.assertEqual(services._services, {})
+
+        with patch('autosearch.services.SearchManager', wraps=SearchManager) as manager_cls:
+            search_managers = []
+            threads = [threading.Thread(target=lambda: search_managers.append(services.search_manager)) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(manager_cls.call_count, 1)
+        self.assertTrue(all(manager is search_managers[0] for manager in search_managers))
+        self.assertIs(search_managers[0].paper_db, services.paper_db)
+
+    def test_project_config_reaches_the_registry(self):
+        config = ProjectConfig(paper_db=None, doc_analyzer=None, project_dir=self.project_dir,
+                               db_dir=os.path.join(self.project_dir, 'db'), config_list=[], initiate_db=False)
+        self.assertIs(config.services, get_project_services(self.project_dir))
+        self.assertIs(config.services.search_manager, get_project_services(self.project_dir).search_manager)
+
+    def test_close_removes_the_services(self):
+        services = get_project_services(self.project_dir)
+        services.search_manager
+        close_project_services(self.project_dir)
+        self.assertEqual(services._services, {})
+        self.assertIsNot(get_project_services(self.project_dir), services)
+
+
+if __name__ == '__main__':
+    unittest.main()
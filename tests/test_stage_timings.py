@@ -0,0 +1,51 @@
+import threading
+import time
+import unittest
+
+from autosearch.stage_timings import StageTimings
+
+
+class TestStageTimings(unittest.TestCase):
+
+    def test_records_count_total_mean_and_max(self):
+        timings = StageTimings()
+        timings.record("query", 0.1)
+        timings.record("query", 0.3)
+        stats = timings.stats()["query"]
+        self.assertEqual(stats["count"], 2)
+        self.assertAlmostEqual(stats["total_seconds"], 0.4)
+        self.assertAlmostEqual(stats["mean_seconds"], 0.2)
+        self.assertAlmostEqual(stats["max_seconds"], 0.3)
+
+    def test_items_and_throughput(self):
+        timings = StageTimings()
+        timings.record("insert", 0.5, items=10)
+        timings.record("insert", 1.5, items=30)
+        stats = timings.stats()["insert"]
+        self.assertEqual(stats["items"], 40)
+        self.assertAlmostEqual(stats["items_per_second"], 20.0)
+
+    def test_time_records_failed_runs(self):
+        timings = StageTimings()
+        with self.assertRaises(ValueError):
+            with timings.time("analysis"):
+                time.sleep(0.01)
+                raise ValueError("boom")
+        self.assertEqual(timings.stats()["analysis"]["count"], 1)
+        self.assertGreaterEqual(timings.stats()["analysis"]["total_seconds"], 0.01)
+
+        timings.reset()
+        self.assertEqual(timings.stats(), {})
+
+    def test_concurrent_records(self):
+        timings = StageTimings()
+        threads = [threading.Thread(target=lambda: [timings.record("write", 0.001) for _ in range(500)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(timings.stats()["write"]["count"], 4000)
+
+
+if __name__ == '__main__':
+    unittest.main()
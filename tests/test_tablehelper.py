@@ -0,0 +1,64 @@
+import csv
+import io
+import unittest
+
+from autosearch.analysis import tablehelper as tb
+
+
+def cell(row, col, content, row_span=1, column_span=1):
+    return {"row_index": row, "column_index": col, "content": content, "row_span": row_span, "column_span": column_span}
+
+
+def table(rows, cols, cells, page=1):
+    return {"row_count": rows, "column_count": cols, "cells": cells, "bounding_regions": [{"page_number": page}]}
+
+
+class TestTableHelper(unittest.TestCase):
+
+    def test_markdown_matches_legacy_layout(self):
+        t = table(3, 2, [cell(0, 0, "Name"), cell(0, 1, "Tg"), cell(1, 0, "PS"), cell(1, 1, "100"), cell(2, 0, "PMMA")])
+        self.assertEqual(tb.tabletomd(t), "|Name|Tg|\n|---|---|\n|PS|100|\n|PMMA||\n")
+
+    def test_merged_cells_fill_every_covered_position(self):
+        t = table(3, 3, [
+            cell(0, 0, "Polymer", row_span=2), cell(0, 1, "Tg (K)", column_span=2),
+            cell(1, 1, "DSC"), cell(1, 2, "MD"),
+            cell(2, 0, "PS"), cell(2, 1, "373"), cell(2, 2, "380"),
+        ])
+        self.assertEqual(tb.tablerows(t), [
+            ["Polymer", "Tg (K)", "Tg (K)"],
+            ["Polymer", "DSC", "MD"],
+            ["PS", "373", "380"],
+        ])
+        grid = tb.tabletogrid(t)
+        self.assertEqual(grid.shape, (3, 3))
+        self.assertEqual(list(grid[:, 0]), ["Polymer", "Polymer", "PS"])
+
+    def test_markdown_escapes_pipes_and_line_breaks(self):
+        t = table(2, 2, [cell(0, 0, "a|b"), cell(0, 1, "c\nd"), cell(1, 0, "1"), cell(1, 1, "2")])
+        self.assertEqual(tb.tabletomd(t), "|a\\|b|c d|\n|---|---|\n|1|2|\n")
+
+    def test_csv_and_tsv(self):
+        t = table(2, 2, [cell(0, 0, "x, y"), cell(0, 1, 'say "hi"'), cell(1, 0, "tab\there"), cell(1, 1, "3")])
+        self.assertEqual(list(csv.reader(io.StringIO(tb.tabletocsv(t)))), [["x, y", 'say "hi"'], ["tab\there", "3"]])
+        self.assertEqual(tb.tabletotsv(t), 'x, y\tsay "hi"\ntab here\t3\n')
+
+    def test_empty_table(self):
+        self.assertEqual(tb.tabletomd(table(0, 0, [])), "")
+        self.assertEqual(tb.tabletogrid(table(0, 3, [])).shape, (0, 3))
+
+    def test_gettablesfrompage_uses_page_index(self):
+        tables = [table(1, 1, [cell(0, 0, str(i))], page=1 + i // 2) for i in range(6)]
+        page_index = tb.indextablesbypage(tables)
+        self.assertEqual(page_index, {1: [0, 1], 2: [2, 3], 3: [4, 5]})
+        self.assertEqual(tb.gettablesfrompage(tables, 2, page_index), ["|2|\n|---|\n", "|3|\n|---|\n"])
+        self.assertEqual(tb.gettablesfrompage(tables, 4, page_index), [])
+
+        # Without an index the tables are scanned, so changes to the list are always seen.
+        tables.append(table(1, 1, [cell(0, 0, "late")], page=4))
+        self.assertEqual(tb.gettablesfrompage(tables, 4), ["|late|\n|---|\n"])
+        self.assertEqual(tb.gettablesfrompage(tables, 2), tb.gettablesfrompage(tables, 2, page_index))
+
+
+if __name__ == '__main__':
+    unittest.main()
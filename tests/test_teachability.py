@@ -0,0 +1,176 @@
+import json
+import tempfile
+import unittest
+
+from autosearch.agents.chroma_registry import close_chroma_store, get_chroma_store
+from autosearch.agents.memo_classifier import KeywordPreClassifier
+from fake_chroma import FakeClient, fake_embedding_function
+
+try:
+    from autosearch.agents.teachability import Teachability
+except ImportError:  # autogen is not installed
+    Teachability = None
+
+TASK = "Please find papers on the glass transition of polymers."
+GENERAL_TASK = "Literature search on a material property"
+
+
+def make_teachability_class():
+    class FakeAnalyzerTeachability(Teachability):
+        """Answers the TextAnalyzerAgent instructions from canned replies and counts the calls."""
+
+        structured_reply = None
+        advice_reply = "none"
+
+        def _ask_analyzer(self, text_to_analyze, analysis_instructions):
+            self.analyzer_calls.append(analysis_instructions)
+            if analysis_instructions.startswith("Analyze the TEXT and answer with a single JSON object"):
+                return self.structured_reply
+            if analysis_instructions.startswith("Does any part of the TEXT ask"):
+                return "yes" if text_to_analyze == TASK else "no"
+            if analysis_instructions.startswith("Summarize very briefly"):
+                return GENERAL_TASK
+            if analysis_instructions.startswith(("Copy just the task", "Briefly copy just the task")):
+                return text_to_analyze
+            if analysis_instructions.startswith("Briefly copy any advice"):
+                return self.advice_reply
+            if analysis_instructions.startswith("Does the TEXT contain information"):
+                return "no"
+            raise AssertionError(f"Unexpected instruction: {analysis_instructions}")
+
+    return FakeAnalyzerTeachability
+
+
+@unittest.skipIf(Teachability is None, "autogen is not installed")
+class TestTeachability(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_dir = self.temp_dir.name
+        self.chroma = get_chroma_store(self.db_dir, client_factory=FakeClient, embedding_function_factory=fake_embedding_function)
+        self.collection = self.chroma.collection("memos")
+
+    def tearDown(self):
+        close_chroma_store(self.db_dir)
+        self.temp_dir.cleanup()
+
+    def make_teachability(self, **kwargs):
+        kwargs.setdefault("recall_threshold", 0.9)
+        kwargs.setdefault("learnable", False)
+        teachability = make_teachability_class()(path_to_db_dir=self.db_dir, llm_config=False, **kwargs)
+        teachability.analyzer_calls = []
+        return teachability
+
+    def test_recall_looks_all_keys_up_in_one_query(self):
+        teachability = self.make_teachability(cache_analysis=False)
+        teachability.memo_store.add_many([
+            ("papers on the glass transition of polymers", "Search arXiv for Tg prediction."),
+            ("literature search on a material property", "Start from review articles."),
+            ("find papers on polymers", "Search arXiv for Tg prediction."),
+            ("unrelated cooking recipe", "Add salt."),
+        ])
+
+        expanded = teachability.process_last_received_message(TASK)
+
+        self.assertEqual(self.collection.queries, [[TASK, GENERAL_TASK]])
+        # The memos of the message come first, nearest first, then those of the task; duplicates are dropped.
+        self.assertEqual(expanded, TASK + "\n\n# Memories that might help\n"
+                                          "- Search arXiv for Tg prediction.\n- Start from review articles.\n")
+
+    def test_memos_added_elsewhere_are_reconciled_from_the_query(self):
+        teachability = self.make_teachability(cache_analysis=False)
+        self.collection.add(ids=["7"], documents=["glass transition of polymers"],
+                            metadatas=[{"answer": "Tg marks the glassy state."}])
+
+        teachability.process_last_received_message("What is the glass transition of polymers?")
+
+        self.assertEqual(teachability.memo_store.uid_text_dict["7"], ("glass transition of polymers", "Tg marks the glassy state."))
+
+    def test_empty_store_skips_recall_after_reset(self):
+        teachability = self.make_teachability(cache_analysis=False)
+        teachability.memo_store.add_many([("a question", "an answer")])
+        teachability.memo_store.reset_db()
+        self.assertGreater(teachability.memo_store.get_last_memo_id(), 0)
+
+        self.assertEqual(teachability.process_last_received_message(TASK), TASK)
+        self.assertEqual(teachability.analyzer_calls, [])
+        self.assertEqual(self.chroma.collection("memos").queries, [])
+
+    def test_retrieval_and_storage_extract_the_task_with_their_own_instructions(self):
+        teachability = self.make_teachability(learnable=True, cache_analysis=False)
+        teachability.advice_reply = "Start from review articles."
+        teachability.memo_store.add_many([("unrelated cooking recipe", "Add salt.")])
+
+        teachability.process_last_received_message(TASK)
+
+        extractions = [call for call in teachability.analyzer_calls if "just the task" in call]
+        self.assertEqual(len(extractions), 2)
+        self.assertTrue(extractions[0].startswith("Copy just the task"))
+        self.assertTrue(extractions[1].startswith("Briefly copy just the task"))
+        # The decision whether the message is a task is shared.
+        self.assertEqual(sum(call.startswith("Does any part of the TEXT ask") for call in teachability.analyzer_calls), 1)
+        self.assertIn((GENERAL_TASK, "Start from review articles."), teachability.memo_store.uid_text_dict.values())
+
+    def test_pre_classifier_rules_out_analysis_rounds(self):
+        teachability = self.make_teachability(learnable=True, cache_analysis=False, pre_classifier=KeywordPreClassifier())
+        teachability.process_last_received_message("ok thanks")
+        self.assertEqual(teachability.analyzer_calls, [])
+
+    def test_structured_analysis_makes_one_call(self):
+        teachability = self.make_teachability(learnable=True, cache_analysis=False, structured_analysis=True)
+        teachability.structured_reply = json.dumps({
+            "is_task": True, "task": TASK, "general_task": GENERAL_TASK, "advice": "Start from review articles.",
+            "has_information": False, "question": "", "answer": "",
+        })
+
+        teachability.process_last_received_message(TASK)
+
+        self.assertEqual(len(teachability.analyzer_calls), 1)
+        self.assertEqual(list(teachability.memo_store.uid_text_dict.values()), [(GENERAL_TASK, "Start from review articles.")])
+
+    def test_unparsable_structured_analysis_falls_back_to_separate_calls(self):
+        teachability = self.make_teachability(learnable=True, cache_analysis=False, structured_analysis=True)
+        teachability.structured_reply = "yes"
+
+        teachability.process_last_received_message(TASK)
+
+        self.assertEqual(len(teachability.analyzer_calls), 4)  # structured, then is_task, advice and has_information
+        self.assertTrue(teachability.analyzer_calls[1].startswith("Does any part of the TEXT ask"))
+
+    def test_repeated_analysis_is_served_from_the_cache(self):
+        teachability = self.make_teachability(learnable=True)
+        teachability.memo_store.add_many([("a question", "an answer")])
+
+        teachability.process_last_received_message(TASK)
+        calls = len(teachability.analyzer_calls)
+        teachability.process_last_received_message(TASK)
+
+        self.assertGreater(calls, 0)
+        self.assertEqual(len(teachability.analyzer_calls), calls)
+        self.assertEqual(teachability.cache_stats()["hits"], calls)
+        # The fake analyzer reports no usage, so the tokens saved are estimated without a tokenizer.
+        self.assertGreater(teachability.cache_stats()["saved_tokens"], 0)
+
+    def test_saved_tokens_come_from_the_analyzer_usage(self):
+        teachability = self.make_teachability(learnable=True)
+        usage = {}
+
+        class FakeAnalyzer:
+            def get_actual_usage(self):
+                return dict(usage) or None
+
+        def ask_analyzer(text_to_analyze, analysis_instructions):
+            total = usage.get("gpt-4o", {}).get("total_tokens", 0)
+            usage.update(total_cost=0.0, **{"gpt-4o": {"total_tokens": total + 100}})
+            return "no"
+
+        teachability.analyzer = FakeAnalyzer()
+        teachability._ask_analyzer = ask_analyzer
+        teachability._analyze("some text", "Does the TEXT contain information?")
+        teachability._analyze("some text", "Does the TEXT contain information?")
+
+        self.assertEqual(teachability.cache_stats()["saved_tokens"], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()